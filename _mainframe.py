@@ -21,7 +21,10 @@
 #Boa:Frame:MainFrame
 
 
+from multiprocessing.pool import ThreadPool
+import os
 import platform
+import re
 import thread
 import traceback
 
@@ -29,7 +32,9 @@ import wx
 
 import code_manager
 import const
+import properties
 import proxy
+import titles
 import tools
 
 #Avoid limit of wx.ListCtrl in 512 symbols
@@ -84,6 +89,12 @@ class Frame1(wx.Frame):
               self.ObjectsBrowserSelChanged, id=wxID_FRAME1TREECTRL_OBJECTSBROWSER)
               
         self.treeCtrl_ObjectsBrowser.Bind(wx.EVT_TREE_ITEM_RIGHT_CLICK, self.ObjectsBrowserRightClick)
+
+        self.treeCtrl_ObjectsBrowser.Bind(wx.EVT_TREE_ITEM_EXPANDING,
+              self.ObjectsBrowserItemExpanding)
+
+        self.treeCtrl_ObjectsBrowser.Bind(wx.EVT_TREE_ITEM_ACTIVATED,
+              self.ObjectsBrowserItemActivated)
         #----------
         
         #-----Editor-----
@@ -133,16 +144,35 @@ class Frame1(wx.Frame):
         #----------
 
     def __init__(self, parent):
+        if const.SCHEMAS_FILE:
+            # warm start
+            proxy.NativeObject.schemas.load(self._schemas_path())
         self._init_ctrls(parent)
+        self.Bind(wx.EVT_CLOSE, self.OnClose)
+        self.prop_updater = prop_viewer_updater(self.listCtrl_Properties)
+        self.tree_updater = tree_updater(self.treeCtrl_ObjectsBrowser)
         self._init_windows_tree()
         self.textCtrl_Editor.SetForegroundColour(wx.LIGHT_GREY)
         self.textCtrl_Editor.AppendText('#Perform an action - right click on item in the object browser.')
-        self.prop_updater = prop_viewer_updater(self.listCtrl_Properties)
-        self.tree_updater = tree_updater(self.treeCtrl_ObjectsBrowser)
         
+    def _schemas_path(self):
+        return os.path.join(os.path.expanduser('~'), const.SCHEMAS_FILE)
+
+    def OnClose(self, event):
+        if const.SCHEMAS_FILE:
+            try:
+                proxy.NativeObject.schemas.save(self._schemas_path())
+            except (IOError, OSError):
+                pass  # the schemas are not kept
+        event.Skip()
+
     def ObjectsBrowserSelChanged(self, event):
         tree_item = event.GetItem()
         obj = self.treeCtrl_ObjectsBrowser.GetItemData(tree_item).GetData()
+        if isinstance(obj, subitems_page):
+            # "Show next" node
+            self.tree_updater.page_update(tree_item, obj)
+            return
         if not obj._check_existence():
           self._init_windows_tree()
           tree_item = self.treeCtrl_ObjectsBrowser.GetRootItem()
@@ -150,33 +180,58 @@ class Frame1(wx.Frame):
         self.prop_updater.props_update(obj)
         self.tree_updater.tree_update(tree_item, obj)
         obj.highlight_control()
+
+    def ObjectsBrowserItemActivated(self, event):
+        tree_item = event.GetItem()
+        obj = self.treeCtrl_ObjectsBrowser.GetItemData(tree_item).GetData()
+        if isinstance(obj, subitems_page):
+            # the "Show next" node stays selected after a page is loaded,
+            # the next page is loaded by the activation
+            self.tree_updater.page_update(tree_item, obj)
+        else:
+            event.Skip()
                     
+    def ObjectsBrowserItemExpanding(self, event):
+        tree_item = event.GetItem()
+        if self.treeCtrl_ObjectsBrowser.GetChildrenCount(tree_item, False):
+            return  # already expanded
+        obj = self.treeCtrl_ObjectsBrowser.GetItemData(tree_item).GetData()
+        if isinstance(obj, subitems_page):
+            return
+        # only the requested level is read
+        self.tree_updater.tree_update(tree_item, obj)
+
     def ObjectsBrowserRightClick(self, event):
         menu = wx.Menu()
         #tree_item = self.treeCtrl_ObjectsBrowser.GetSelection()
         tree_item = event.GetItem()
         obj = self.treeCtrl_ObjectsBrowser.GetItemData(tree_item).GetData()
+        if isinstance(obj, subitems_page):
+            return
         self.GLOB_last_rclick_tree_obj = obj
         #self.treeCtrl_ObjectsBrowser.SelectItem(tree_item)
         if obj._check_existence():       
-            actions = obj.get_actions()
-            extended_actions = obj.get_extended_actions()
+            extended_actions, actions = obj.get_menu_actions()
             if not actions and not extended_actions:
                 menu.Append(0, 'No actions')
                 menu.Enable(0, False)
             else:
                 if extended_actions:
-                    for _id, extended_action_name in extended_actions:
+                    for _id, extended_action_name, enabled in \
+                            extended_actions:
                         menu.Append(_id, extended_action_name)
-                        if not obj._check_actionable():
+                        if not enabled:
                             menu.Enable(_id, False)
                     menu.AppendSeparator()
 
-                for _id, action_name in actions:
+                for _id, action_name, enabled in actions:
                     menu.Append(_id, action_name)
-                    if not obj._check_actionable():
+                    if not enabled:
                         menu.Enable(_id, False)
 
+            menu.AppendSeparator()
+            menu.AppendMenu(wx.NewId(), 'Filter children',
+                            self._filter_menu(obj))
             self.PopupMenu(menu)
             menu.Destroy()
         else:
@@ -186,6 +241,30 @@ class Frame1(wx.Frame):
             self.prop_updater.props_update(obj)
             self.tree_updater.tree_update(tree_item, obj)
     
+    def _filter_menu(self, obj):
+        options = proxy.NativeObject.children_filter.options()
+        menu = wx.Menu()
+        for _id, option_name in sorted(const.FILTER_ACTIONS.items()):
+            if option_name is None:
+                menu.AppendSeparator()
+            elif option_name in ('Visible only', 'Enabled only',
+                                 'This process only'):
+                menu.AppendCheckItem(_id, option_name)
+            else:
+                menu.Append(_id, option_name)
+        menu.Check(501, options.get('visible_only', False))
+        menu.Check(502, options.get('enabled_only', False))
+        menu.Check(503, 'process' in options)
+        if 'process' not in options and self._get_process(obj) is None:
+            menu.Enable(503, False)  # 503: 'This process only'
+        return menu
+
+    def _get_process(self, obj):
+        try:
+            return obj.pwa_obj.ProcessID()
+        except Exception:
+            return None  # no process, e.g. PC
+
     def PropertiesRightClick(self, event):
         self.GLOB_prop_item_index = event.GetIndex()
         menu = wx.Menu()
@@ -230,10 +309,71 @@ class Frame1(wx.Frame):
             # editor menu
             self.editor_action(menu_id)
 
+        elif menu_id in const.FILTER_ACTIONS:
+            # object browser filter menu
+            self.filter_action(menu_id)
+
         else:
             raise RuntimeError("Unknown menu_id=%s for properties "
                                "menu" % menu_id)
     
+    def filter_action(self, menu_id):
+        options = proxy.NativeObject.children_filter.options()
+
+        if 'Visible only' == const.FILTER_ACTIONS[menu_id]:
+            if not options.pop('visible_only', False):
+                options['visible_only'] = True
+
+        elif 'Enabled only' == const.FILTER_ACTIONS[menu_id]:
+            if not options.pop('enabled_only', False):
+                options['enabled_only'] = True
+
+        elif 'This process only' == const.FILTER_ACTIONS[menu_id]:
+            if options.pop('process', None) is None:
+                options['process'] = self._get_process(
+                    self.GLOB_last_rclick_tree_obj)
+
+        elif 'Class name filter...' == const.FILTER_ACTIONS[menu_id]:
+            value = self._ask_filter('Class name regular expression',
+                                     options.get('class_name_re', ''))
+            if value is None:
+                return
+            options['class_name_re'] = value
+
+        elif 'Title filter...' == const.FILTER_ACTIONS[menu_id]:
+            value = self._ask_filter('Title regular expression',
+                                     options.get('title_re', ''))
+            if value is None:
+                return
+            options['title_re'] = value
+
+        elif 'Reset filters' == const.FILTER_ACTIONS[menu_id]:
+            options = {}
+
+        try:
+            proxy.set_children_filter(**options)
+        except re.error:
+            traceback_info = traceback.format_exc(5)
+            tools.show_error_message('WARNING', traceback_info)
+            return
+
+        # show the filtered tree
+        self._init_windows_tree()
+        tree_item = self.treeCtrl_ObjectsBrowser.GetRootItem()
+        obj = self.treeCtrl_ObjectsBrowser.GetItemData(tree_item).GetData()
+        self.prop_updater.props_update(obj)
+        self.tree_updater.tree_update(tree_item, obj)
+
+    def _ask_filter(self, message, value):
+        dlg = wx.TextEntryDialog(self, message + ', empty - no filter',
+                                 'Filter children', value)
+        try:
+            if dlg.ShowModal() != wx.ID_OK:
+                return None
+            return dlg.GetValue()
+        finally:
+            dlg.Destroy()
+
     def properties_action(self, menu_id):
         item = self.GLOB_prop_item_index
         clipdata = wx.TextDataObject()
@@ -282,6 +422,8 @@ class Frame1(wx.Frame):
             try:
                 code = obj.Get_code(action)
                 obj.execute_action(action)
+                # the action may open or close windows
+                proxy.NativeObject.liveness.expire()
             except:
                 code = None
                 traceback_info = traceback.format_exc(5)
@@ -331,7 +473,6 @@ class Frame1(wx.Frame):
             self.textCtrl_Editor.SelectAll()
 
         elif 'Save code to file' == const.EDITOR_ACTIONS[menu_id]:
-            import os
             dlg = wx.FileDialog(self, "Choose a file", '', '', "*.py",
                                 wx.SAVE | wx.OVERWRITE_PROMPT)
             if dlg.ShowModal() == wx.ID_OK:
@@ -346,7 +487,12 @@ class Frame1(wx.Frame):
                                "menu" % menu_id)
 
     def _init_windows_tree(self):
+        self.tree_updater.expire_titles()
         self.treeCtrl_ObjectsBrowser.DeleteAllItems()
+        proxy.NativeObject.liveness.expire()
+        proxy.NativeObject.properties_cache.bump()
+        proxy.NativeObject.subitems_cache.bump()
+        proxy.Pwa_window.menus.invalidate()
         item_data = wx.TreeItemData()
         root_obj = proxy.PC_system(None)
         item_data.SetData(root_obj)
@@ -362,6 +508,8 @@ class prop_viewer_updater(object):
         self.listctrl = listctrl
         self.updating = False
         self.queue = []
+        # fetches the expensive properties groups concurrently
+        self.pool = ThreadPool(const.PROPERTIES_THREADS)
         
     def props_update(self, obj):
         self.queue.append(obj)
@@ -376,26 +524,26 @@ class prop_viewer_updater(object):
         self.listctrl.DeleteAllItems()
         index = self.listctrl.InsertStringItem(0, 'Updating...')
         self.listctrl.SetStringItem(index, 1, '')
-        global PROPERTIES
+
         try:
-            PROPERTIES = obj.get_properties()
+            properties_groups = obj.get_properties_groups()
+            # the keys known for the control class are shown at once
+            expected = obj.get_expected_properties()
         except:
-            PROPERTIES = {}
-            dlg = wx.MessageDialog(self.listctrl, traceback.format_exc(5),
-                                   'Warning!', wx.OK | wx.ICON_WARNING)
-            dlg.ShowModal()
-            dlg.Destroy()
+            properties_groups, expected = [], []
+            self._warning(traceback.format_exc(5))
+
+        # show the cheap groups at once, then stream the expensive groups
+        # as they complete
+        for props, updating, errors in properties.stream_properties(
+                properties_groups, expected, self.pool.imap_unordered):
+            if obj != self.queue[-1]:
+                break  # a newer object is queued, do not show
+            for error in errors:
+                self._warning(error)
+            self._show(props, updating)
 
-        param_names = PROPERTIES.keys()
-        param_names.sort(key=lambda name: name.lower(), reverse=True)
-        
         if obj == self.queue[-1]:
-            self.listctrl.DeleteAllItems()
-            for p_name in param_names:
-                p_name_str = str(p_name)
-                param_text = tools.object_to_text(PROPERTIES[p_name])
-                index = self.listctrl.InsertStringItem(0, p_name_str)
-                self.listctrl.SetStringItem(index, 1, param_text)
             self.queue = []
             self.updating = False
         
@@ -405,26 +553,186 @@ class prop_viewer_updater(object):
             #Do not update listctrl
             #run _update again
 
+    def _show(self, props, updating):
+        """Show the merged properties of the fetched groups."""
+        global PROPERTIES
+        PROPERTIES = props
+
+        param_names = PROPERTIES.keys()
+        param_names.sort(key=lambda name: name.lower(), reverse=True)
+
+        self.listctrl.DeleteAllItems()
+        for p_name in param_names:
+            p_name_str = str(p_name)
+            param_text = tools.object_to_text(PROPERTIES[p_name])
+            index = self.listctrl.InsertStringItem(0, p_name_str)
+            self.listctrl.SetStringItem(index, 1, param_text)
+        if updating:
+            index = self.listctrl.InsertStringItem(0, 'Updating...')
+            self.listctrl.SetStringItem(index, 1, '')
+
+    def _warning(self, text):
+        dlg = wx.MessageDialog(self.listctrl, text,
+                               'Warning!', wx.OK | wx.ICON_WARNING)
+        dlg.ShowModal()
+        dlg.Destroy()
+
+
+class subitems_page(object):
+    """
+    Data of the "Show next" node of a paged tree item.
+
+    Selecting or activating the node loads the children of `obj` from
+    `start`. `total` is the children count read with the first page.
+    """
+    def __init__(self, obj, start, total):
+        self.obj = obj
+        self.start = start
+        self.total = total
+        self.loading = False  # the repeated triggers are ignored
+
 
 class tree_updater(object):
     def __init__(self, treectrl):
         self.treectrl = treectrl
         self.updating = False
         self.queue = []
+        # resolves the children titles shown by the placeholders
+        self.pool = ThreadPool(const.TITLES_THREADS)
+        self.listing = 0  # the titles of an older listing are dropped
         
+    def expire_titles(self):
+        """Drop the titles not shown yet, the node is not current."""
+        self.listing += 1
+
     def tree_update(self, tree_item, obj):
+        self.expire_titles()
         self.queue.append((tree_item, obj))
         if self.updating:
             return 0 
         else:
             thread.start_new_thread(self._update,())
+
+    def page_update(self, page_item, page):
+        """Load the next page of the children in place of the node."""
+        if page.loading or page.start >= page.total:
+            return
+        page.loading = True
+        self.treectrl.SetItemText(page_item, 'Loading...')
+        thread.start_new_thread(self._load_page, (page_item, page))
             
     def _update(self):
         self.updating = True
         tree_item, obj = self.queue[-1]
+        listing = self.listing
         self.treectrl.DeleteChildren(tree_item)
-        subitems = obj.get_subitems()
-        for i_name, i_obj in subitems:
+        resolvers = []
+        if obj.paged_subitems:
+            page_size = const.SUBITEMS_PAGE_SIZE
+            self._append_subitems(tree_item, obj,
+                                  obj.get_subitems_page(0, page_size))
+            total = obj.get_subitems_count()
+            if total > page_size:
+                item_data = wx.TreeItemData()
+                item_data.SetData(subitems_page(obj, page_size, total))
+                self.treectrl.AppendItem(tree_item,
+                                         'Show next %s...' % page_size,
+                                         data=item_data)
+        else:
+            subitems, resolvers = obj.get_subitems_deferred()
+            item_ids = self._append_subitems(tree_item, obj, subitems)
+        self.treectrl.Expand(self.treectrl.GetRootItem())
+        if resolvers:
+            # the children are shown, the titles come later
+            self._resolve_titles(listing, tree_item, obj, subitems,
+                                 item_ids, resolvers)
+        
+        if (tree_item, obj) == self.queue[-1]:
+          self.queue = []
+          self.updating = False
+        
+        else:
+            self._update()
+            #there is the newer object for tree view.
+            #Do not update treeCtrl
+            #run _update again
+
+    def _load_page(self, page_item, page):
+        obj = page.obj
+        total = page.total  # not counted again per page
+        stop = page.start + const.SUBITEMS_PAGE_SIZE
+        # keep the node, insert the page before it
+        try:
+            self._append_subitems(self.treectrl.GetItemParent(page_item), obj,
+                                  obj.get_subitems_page(page.start, stop),
+                                  before_item=page_item)
+            page.start = stop
+            if stop < total:
+                self.treectrl.SetItemText(page_item, 'Show next %s...' %
+                                          const.SUBITEMS_PAGE_SIZE)
+            else:
+                self.treectrl.SetItemText(page_item,
+                                          'All %s items shown' % total)
+        except wx._core.PyAssertionError:
+            pass
+            #Ignore tree item creation error when parent is not exists
+        finally:
+            page.loading = False
+
+    def _resolve_titles(self, listing, tree_item, obj, subitems, item_ids,
+                        resolvers):
+        """Show the real titles as they are resolved, do not wait."""
+        order = titles.TitleOrder(
+            subitems, key=lambda title: obj._subitems_sort_key((title, None)))
+
+        def arrived(result):
+            # in a thread of the pool, shown in the GUI thread
+            wx.CallAfter(self._show_title, listing, tree_item, order,
+                         item_ids, result)
+
+        titles.resolve_titles(self.pool, resolvers, arrived)
+
+    def _show_title(self, listing, tree_item, order, item_ids, result):
+        """Show the resolved title, keep the order."""
+        if listing != self.listing:
+            return  # the node is not current, its items may be deleted
+        i_obj, title, error = result
+        item_id = item_ids.get(id(i_obj))
+        if error is not None or item_id is None:
+            return  # keep the placeholder
+        try:
+            # do not move the expanded or selected item
+            movable = not self.treectrl.ItemHasChildren(item_id) and \
+                not self.treectrl.IsSelected(item_id)
+            old_index, new_index = order.update(i_obj, title, move=movable)
+            if old_index == new_index:
+                self.treectrl.SetItemText(item_id, title)
+            else:
+                item_ids[id(i_obj)] = self._move_subitem(
+                    tree_item, item_id, new_index, title, i_obj)
+        except wx._core.PyAssertionError:
+            pass
+            #Ignore tree item errors when parent is not exists
+
+    def _move_subitem(self, tree_item, item_id, index, name, obj):
+        colour = self.treectrl.GetItemTextColour(item_id)
+        self.treectrl.Delete(item_id)
+        item_data = wx.TreeItemData()
+        item_data.SetData(obj)
+        new_item_id = self.treectrl.InsertItemBefore(tree_item, index, name,
+                                                     data=item_data)
+        self.treectrl.SetItemTextColour(new_item_id, colour)
+        return new_item_id
+
+    def _append_subitems(self, tree_item, obj, subitems, before_item=None):
+        """Append the children of obj, return {id(swapy_obj): item_id}."""
+        item_ids = {}
+        if before_item is not None:
+            prev_item = self.treectrl.GetPrevSibling(before_item)
+        # the children states are read in one sweep, kept with the listing
+        states = obj.get_subitems_states(subitems)
+        for (i_name, i_obj), (i_grayed, has_subitems) in zip(subitems,
+                                                              states):
           item_data = wx.TreeItemData()
           item_data.SetData(i_obj)
           # try:
@@ -434,22 +742,22 @@ class tree_updater(object):
           i_name_str = i_name
 
           try:
-            item_id = self.treectrl.AppendItem(tree_item, i_name_str, data=item_data)
-            if (not i_obj._check_visibility()) or (not i_obj._check_actionable()):
+            if before_item is None:
+                item_id = self.treectrl.AppendItem(tree_item, i_name_str, data=item_data)
+            elif prev_item.IsOk():
+                item_id = self.treectrl.InsertItem(tree_item, prev_item, i_name_str, data=item_data)
+            else:
+                item_id = self.treectrl.InsertItemBefore(tree_item, 0, i_name_str, data=item_data)
+            prev_item = item_id
+            item_ids[id(i_obj)] = item_id
+            if has_subitems is not None:
+                # the expand button without reading the children
+                self.treectrl.SetItemHasChildren(item_id, has_subitems)
+            if i_grayed:
                 self.treectrl.SetItemTextColour(item_id,'gray')
           except wx._core.PyAssertionError:
               pass
               #Ignore tree item creation error when parent is not exists
           finally:
               del item_data
-        self.treectrl.Expand(self.treectrl.GetRootItem())
-        
-        if (tree_item, obj) == self.queue[-1]:
-          self.queue = []
-          self.updating = False
-        
-        else:
-            self._update()
-            #there is the newer object for tree view.
-            #Do not update treeCtrl
-            #run _update again
\ No newline at end of file
+        return item_ids
@@ -0,0 +1,421 @@
+# Access names of the controls.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+"""
+Access names of the controls.
+
+Mirrors pywinauto's `findbestmatch.build_unique_dict` over a snapshot of
+the control attributes, so the names of a window can be updated for the
+added or removed controls only.
+"""
+
+from collections import namedtuple
+import multiprocessing
+import threading
+
+
+DISTANCE_CUTOFF = 999  # findbestmatch.distance_cuttoff
+
+ControlInfo = namedtuple('ControlInfo', ['handle', 'friendly_class', 'text',
+                                         'texts', 'has_title', 'can_be_label',
+                                         'visible', 'rect'])
+
+
+def control_info(handle, control):
+    """Collect the control attributes the access names are based on."""
+    friendly_class = control.FriendlyClassName()
+    text = control.WindowText()
+    has_title = control.has_title
+
+    texts = ()
+    if has_title and not text and friendly_class != 'TreeView':
+        try:
+            texts = tuple(control.Texts()[1:])
+        except Exception:
+            pass
+
+    rect = control.Rectangle()
+    return ControlInfo(handle, friendly_class, text, texts, has_title,
+                       control.can_be_label, control.IsVisible(),
+                       (rect.left, rect.top, rect.right, rect.bottom))
+
+
+def is_text_control(info):
+    """Return True if the control may be a label for other controls."""
+    return bool(info.visible and info.text and info.can_be_label)
+
+
+def _is_above_or_to_left(ctrl_rect, text_rect):
+    """Mirror of findbestmatch.IsAboveOrToLeft."""
+    text_left, text_top = text_rect[:2]
+    ctrl_left, ctrl_top, ctrl_right, ctrl_bottom = ctrl_rect
+
+    if text_left >= ctrl_right:
+        return False
+
+    if text_top >= ctrl_bottom:
+        return False
+
+    if text_top >= ctrl_top and text_left >= ctrl_left:
+        return False
+
+    return True
+
+
+def _non_text_names(index, infos, text_infos):
+    """Mirror of findbestmatch.GetNonTextControlName."""
+    names = []
+    info = infos[index]
+    ctrl_left, ctrl_top, ctrl_right, ctrl_bottom = info.rect
+
+    if index != 0:
+        prev_info = infos[index - 1]
+        if prev_info.friendly_class == "Static" and prev_info.visible and \
+                prev_info.text and \
+                _is_above_or_to_left(info.rect, prev_info.rect):
+            names.append(prev_info.text + info.friendly_class)
+
+    best_name = ''
+    closest = DISTANCE_CUTOFF
+    for text_info in text_infos:
+        text_left, text_top, text_right, text_bottom = text_info.rect
+
+        if text_left >= ctrl_right:
+            continue
+
+        if text_top >= ctrl_bottom:
+            continue
+
+        distance = min(
+            abs(text_left - ctrl_left) + abs(text_bottom - ctrl_top),
+            abs(text_right - ctrl_left) + abs(text_top - ctrl_top))
+
+        if info.friendly_class == "UpDown":
+            # UpDown uses Static text only
+            if text_info.friendly_class == "Static" and distance < closest:
+                closest = distance
+                best_name = text_info.text + info.friendly_class
+
+        elif distance < closest:
+            closest = distance
+            best_name = text_info.text + info.friendly_class
+
+    names.append(best_name)
+    return names
+
+
+def uses_neighbours(info):
+    """Return True if the control names depend on the other controls."""
+    return not (info.text and info.has_title)
+
+
+def control_names(index, infos, text_infos):
+    """
+    Mirror of findbestmatch.get_control_names.
+
+    Return the list of the candidate names in the order
+    build_unique_dict iterates them.
+    """
+    info = infos[index]
+    names = [info.friendly_class]
+
+    if info.text and info.has_title:
+        names.append(info.text)
+        names.append(info.text + info.friendly_class)
+    elif info.has_title and info.friendly_class != 'TreeView':
+        for text in info.texts:
+            names.append(info.friendly_class + text)
+        names.extend(_non_text_names(index, infos, text_infos))
+    else:
+        names.extend(_non_text_names(index, infos, text_infos))
+
+    return list(set(names))
+
+
+def assemble_unique_names(handles, candidates):
+    """
+    Mirror of findbestmatch.UniqueDict.
+
+    `candidates` are the candidate names lists of the `handles`.
+    Return {uniq_name: handle}.
+    """
+    unique_names = {}
+    for handle, names in zip(handles, candidates):
+        for name in names:
+            if name in unique_names:
+                unique_name = name
+                counter = 2
+                while unique_name in unique_names:
+                    unique_name = name + str(counter)
+                    counter += 1
+
+                if name + '0' not in unique_names:
+                    unique_names[name + '0'] = unique_names[name]
+                    unique_names[name + '1'] = unique_names[name]
+
+                name = unique_name
+
+            unique_names[name] = handle
+    return unique_names
+
+
+def candidate_names(infos):
+    """Return the candidate names lists of all the controls."""
+    text_infos = [info for info in infos if is_text_control(info)]
+    return [control_names(index, infos, text_infos)
+            for index in range(len(infos))]
+
+
+def build_unique_names(infos):
+    """Build {uniq_name: handle} like build_unique_dict does."""
+    return assemble_unique_names([info.handle for info in infos],
+                                 candidate_names(infos))
+
+
+def sorted_names(unique_names):
+    """Return [(uniq_name, handle), ...] the shortest first, no empty."""
+    return sorted([(uniq_name, handle) for uniq_name, handle
+                   in unique_names.items() if uniq_name != ''],
+                  key=lambda name_handle: len(name_handle[0]))
+
+
+def compute_names(infos):
+    """
+    Compute the names of one window snapshot.
+
+    Return (candidates, names). Runs in a pool worker, so the names are
+    returned as a sorted list, a dict may change its order on pickling.
+    """
+    candidates = candidate_names(infos)
+    unique_names = assemble_unique_names([info.handle for info in infos],
+                                         candidates)
+    return candidates, sorted_names(unique_names)
+
+
+class AccessNamesEngine(object):
+    """
+    Access names of all the controls of one top level window.
+
+    Keeps the controls snapshot and their candidate names. On update
+    only the added controls are inspected and the candidate names are
+    recomputed only for the controls that depend on changed neighbours.
+    The final disambiguation is replayed over the cached candidates, since
+    UniqueDict suffixes may spill over from one collision group into
+    another.
+    """
+
+    def __init__(self):
+        """Init empty engine."""
+        self.handles = frozenset()
+        self.names = []  # [(uniq_name, handle), ...] the shortest first
+        self._order = []
+        self._infos = {}  # handle -> ControlInfo
+        self._candidates = {}  # handle -> [name, ...]
+        self._prev_handles = {}  # handle -> previous handle in the order
+        self._text_handles = []  # the label controls in the order
+        self._names_by_handle = {}
+
+    def update(self, handles, info_factory, text_of=None):
+        """
+        Apply the current child handles of the window.
+
+        `info_factory` makes a ControlInfo for an added handle.
+        `text_of(handle)` reads the current window text, a control with
+        another text than in the snapshot is inspected again.
+        Return True if the names have been changed.
+        """
+        handles = list(handles)
+        retitled = set()
+        if text_of is not None:
+            for handle in handles:
+                info = self._infos.get(handle)
+                if info is not None and text_of(handle) != info.text:
+                    retitled.add(handle)
+        if handles == self._order and not retitled:
+            return False
+
+        current = set(handles)
+        for handle in self._order:
+            if handle not in current or handle in retitled:
+                del self._infos[handle]
+                del self._candidates[handle]
+                del self._prev_handles[handle]
+
+        for handle in handles:
+            if handle not in self._infos:
+                self._infos[handle] = info_factory(handle)
+
+        infos = [self._infos[handle] for handle in handles]
+        text_infos = [info for info in infos if is_text_control(info)]
+        text_handles = [info.handle for info in text_infos]
+        # the neighbours names are based on the label texts
+        text_set_changed = text_handles != self._text_handles or \
+            bool(retitled)
+
+        for index, handle in enumerate(handles):
+            prev_handle = handles[index - 1] if index else None
+            if handle not in self._candidates or \
+                    (uses_neighbours(self._infos[handle]) and
+                     (text_set_changed or
+                      self._prev_handles[handle] != prev_handle)):
+                self._candidates[handle] = control_names(index, infos,
+                                                         text_infos)
+            self._prev_handles[handle] = prev_handle
+
+        self._text_handles = text_handles
+        self._order = handles
+        self.handles = frozenset(handles)
+        self._assemble()
+        return True
+
+    def load(self, infos, candidates, names):
+        """Set the state computed by compute_names for the snapshot."""
+        handles = [info.handle for info in infos]
+        self._infos = dict(zip(handles, infos))
+        self._candidates = dict(zip(handles, candidates))
+        self._prev_handles = dict(zip(handles, [None] + handles[:-1]))
+        self._text_handles = [info.handle for info in infos
+                              if is_text_control(info)]
+        self._order = handles
+        self.handles = frozenset(handles)
+        self._set_names(names)
+
+    def _assemble(self):
+        """Disambiguate the candidate names."""
+        unique_names = assemble_unique_names(
+            self._order, [self._candidates[handle] for handle in self._order])
+        self._set_names(sorted_names(unique_names))
+
+    def _set_names(self, names):
+        """Set [(uniq_name, handle), ...] and rebuild the reverse map."""
+        self.names = names
+
+        # reverse map, handle -> [uniq_name, ...]
+        self._names_by_handle = {}
+        for uniq_name, handle in self.names:
+            self._names_by_handle.setdefault(handle, []).append(uniq_name)
+
+    def names_of(self, handle):
+        """Return the control names, the shortest first."""
+        return list(self._names_by_handle.get(handle, []))
+
+
+class UniqueNamesTables(object):
+    """
+    Access names engines of the top level windows.
+
+    Keeps an engine per a top level window handle. The engine is updated
+    only if the window's child handles or their texts have been changed,
+    by `get_checked` once per a generation of the caller. Thread safe, the
+    tree and the properties are updated in separate threads.
+    """
+
+    def __init__(self):
+        """Init empty tables."""
+        self.tables = {}
+        self.checked = {}  # top handle -> generation the engine is checked
+        self.checks = 0
+        self.lock = threading.RLock()
+
+    def get(self, top_handle, handles, info_factory, text_of=None):
+        """
+        Return the up to date engine of the top level window.
+
+        `handles` are the current child handles of the window,
+        `info_factory` makes a ControlInfo for a new handle,
+        `text_of(handle)` reads the current window text.
+        """
+        with self.lock:
+            engine = self.tables.get(top_handle)
+            if engine is None:
+                engine = AccessNamesEngine()
+                self.tables[top_handle] = engine
+            engine.update(handles, info_factory, text_of)
+        return engine
+
+    def get_checked(self, top_handle, generation, read_handles, info_factory,
+                    text_of=None):
+        """
+        Return the engine of the top level window checked in the generation.
+
+        The child handles and their texts are read and the engine is
+        updated only once per a `generation` (e.g. changed by an action or
+        a refresh), `read_handles()` returns the current child handles.
+        """
+        with self.lock:
+            engine = self.tables.get(top_handle)
+            if engine is not None and \
+                    self.checked.get(top_handle) == generation:
+                return engine
+        engine = self.get(top_handle, read_handles(), info_factory, text_of)
+        with self.lock:
+            self.checked[top_handle] = generation
+            self.checks += 1
+        return engine
+
+    def prefetch(self, windows, info_factory, processes=0):
+        """
+        Compute the names of many top level windows at once.
+
+        `windows` is {top_handle: [child handle, ...]}, the windows already
+        known are skipped. The control attributes are collected once in
+        this process, then the names of each window are computed in a pool
+        of `processes` worker processes, or serially if `processes` is 0.
+        The result is the same as for the serial path.
+        """
+        snapshots = []
+        for top_handle in sorted(windows):
+            if top_handle not in self.tables:
+                try:
+                    infos = [info_factory(handle)
+                             for handle in windows[top_handle]]
+                except Exception:
+                    # e.g. the window has been closed,
+                    # leave it for the regular update
+                    continue
+                snapshots.append((top_handle, infos))
+
+        if processes and len(snapshots) > 1:
+            pool = multiprocessing.Pool(min(processes, len(snapshots)))
+            try:
+                results = pool.map(compute_names,
+                                   [infos for top_handle, infos in snapshots])
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [compute_names(infos) for top_handle, infos in snapshots]
+
+        for (top_handle, infos), (candidates, names) in zip(snapshots,
+                                                             results):
+            engine = AccessNamesEngine()
+            engine.load(infos, candidates, names)
+            with self.lock:
+                self.tables.setdefault(top_handle, engine)
+
+    def invalidate(self, top_handle=None):
+        """Drop the engine of the window or all the engines."""
+        with self.lock:
+            if top_handle is None:
+                self.tables.clear()
+                self.checked.clear()
+            else:
+                self.tables.pop(top_handle, None)
+                self.checked.pop(top_handle, None)
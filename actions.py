@@ -0,0 +1,85 @@
+# Sequences of the actions.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+"""
+Sequences of the actions.
+
+Runs the actions steps against the wrappers one by one and reports the
+duration and the outcome of each step.
+"""
+
+from collections import namedtuple
+import timeit
+
+
+OK = 'ok'
+ERROR = 'error'
+SKIPPED = 'skipped'
+
+StepResult = namedtuple('StepResult', ['wrapper', 'action', 'outcome',
+                                       'duration', 'result', 'error'])
+
+
+def normalize_step(step):
+    """
+    Return (wrapper, action, args, kwargs) of the step.
+
+    A step is (wrapper, action), (wrapper, action, args) or
+    (wrapper, action, args, kwargs).
+    """
+    if len(step) == 2:
+        wrapper, action = step
+        return wrapper, action, (), {}
+    elif len(step) == 3:
+        wrapper, action, args = step
+        return wrapper, action, tuple(args), {}
+    elif len(step) == 4:
+        wrapper, action, args, kwargs = step
+        return wrapper, action, tuple(args), dict(kwargs)
+    raise ValueError('Wrong action step: %r' % (step,))
+
+
+def run_steps(steps, stop_on_error=False, clock=timeit.default_timer):
+    """
+    Execute the steps by wrapper.execute_action, return [StepResult,...].
+
+    An error does not stop the sequence unless `stop_on_error`, then the
+    rest of the steps are reported as skipped.
+    """
+    steps = [normalize_step(step) for step in steps]
+    results = []
+    failed = False
+    for wrapper, action, args, kwargs in steps:
+        if failed:
+            results.append(StepResult(wrapper, action, SKIPPED, 0, None,
+                                      None))
+            continue
+
+        start = clock()
+        try:
+            result = wrapper.execute_action(action, *args, **kwargs)
+        except Exception as error:
+            results.append(StepResult(wrapper, action, ERROR,
+                                      clock() - start, None, error))
+            failed = stop_on_error
+        else:
+            results.append(StepResult(wrapper, action, OK, clock() - start,
+                                      result, None))
+    return results
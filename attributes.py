@@ -0,0 +1,248 @@
+# Bulk reading of the control attributes.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+"""
+Bulk reading of the control attributes.
+
+The attributes of many windows are read by the handles in one sweep
+into a compact table, instead of the calls through a pywinauto wrapper
+made per window and per attribute. The reading is done by a backend,
+the table serves the same interface to the consumers.
+
+The sweep reads the cheap attributes only. The text (WM_GETTEXT, may
+wait for a hung window) and the rectangle of a window are read on the
+first ask, i.e. only for the windows passed the children filter and
+only if they are needed at all. The states of the listed children are
+checked once per listing.
+"""
+
+from collections import namedtuple
+
+
+# text and rect are None until read
+ControlAttributes = namedtuple('ControlAttributes', [
+    'handle', 'text', 'class_name', 'control_id', 'rect', 'visible',
+    'enabled', 'pid'])
+
+
+class AttributesBackend(object):
+    """
+    Reader of the window attributes by a handle.
+
+    The methods are named like pywinauto's handleprops functions.
+    A method raises if the window is closed.
+    """
+
+    def text(self, handle):
+        raise NotImplementedError()
+
+    def classname(self, handle):
+        raise NotImplementedError()
+
+    def controlid(self, handle):
+        raise NotImplementedError()
+
+    def rectangle(self, handle):
+        raise NotImplementedError()
+
+    def isvisible(self, handle):
+        raise NotImplementedError()
+
+    def isenabled(self, handle):
+        raise NotImplementedError()
+
+    def processid(self, handle):
+        raise NotImplementedError()
+
+
+class ModuleBackend(AttributesBackend):
+    """Backend delegating to a module of functions, like handleprops."""
+
+    def __init__(self, module):
+        self.text = module.text
+        self.classname = module.classname
+        self.controlid = module.controlid
+        self.rectangle = module.rectangle
+        self.isvisible = module.isvisible
+        self.isenabled = module.isenabled
+        self.processid = module.processid
+
+
+class AttributesTable(object):
+    """
+    Attributes of the windows read in one sweep.
+
+    Serves the backend interface for the windows read, so a consumer of
+    a backend (e.g. the children filter) does no more calls for the
+    cheap attributes. The text and the rectangle of a window are read
+    by the `backend` on the first ask and kept in the row.
+    """
+
+    def __init__(self, rows, backend=None):
+        """Init by [ControlAttributes,...]."""
+        self.backend = backend
+        self.order = [row.handle for row in rows]
+        self.by_handle = dict((row.handle, row) for row in rows)
+        self.detailed = set()  # the handles with the text and rect read
+
+    def __len__(self):
+        return len(self.order)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    @property
+    def rows(self):
+        by_handle = self.by_handle
+        return [by_handle[handle] for handle in self.order]
+
+    @property
+    def handles(self):
+        return list(self.order)
+
+    def row(self, handle):
+        """Return the attributes of the window or None if not read."""
+        return self.by_handle.get(handle)
+
+    def select(self, handles):
+        """Return the table of the rows of the handles, in their order."""
+        table = AttributesTable([self.by_handle[handle] for handle in handles
+                                 if handle in self.by_handle], self.backend)
+        table.detailed = self.detailed.intersection(table.by_handle)
+        return table
+
+    def details(self, handle):
+        """Return the row with the text and the rectangle read."""
+        row = self.by_handle[handle]
+        if handle not in self.detailed:
+            row = row._replace(text=self.backend.text(handle),
+                               rect=self.backend.rectangle(handle))
+            self.by_handle[handle] = row
+            self.detailed.add(handle)
+        return row
+
+    def text(self, handle):
+        return self.details(handle).text
+
+    def classname(self, handle):
+        return self.by_handle[handle].class_name
+
+    def controlid(self, handle):
+        return self.by_handle[handle].control_id
+
+    def rectangle(self, handle):
+        return self.details(handle).rect
+
+    def isvisible(self, handle):
+        return self.by_handle[handle].visible
+
+    def isenabled(self, handle):
+        return self.by_handle[handle].enabled
+
+    def processid(self, handle):
+        return self.by_handle[handle].pid
+
+
+def read_attributes(handles, backend):
+    """
+    Read the cheap attributes of the windows into a table.
+
+    The windows failed to be read (e.g. closed meanwhile) are skipped.
+    """
+    classname = backend.classname
+    controlid = backend.controlid
+    isvisible = backend.isvisible
+    isenabled = backend.isenabled
+    processid = backend.processid
+
+    rows = []
+    append = rows.append
+    for handle in handles:
+        try:
+            append(ControlAttributes(handle, None, classname(handle),
+                                     controlid(handle), None,
+                                     bool(isvisible(handle)),
+                                     bool(isenabled(handle)),
+                                     processid(handle)))
+        except Exception:
+            continue
+    return AttributesTable(rows, backend)
+
+
+class SubitemsStates(object):
+    """
+    Grayed and has-children flags of a listing of the children.
+
+    Kept with the listing in the subitems cache, a child is checked once
+    per listing, so a re-selection of the node reads nothing.
+    """
+
+    def __init__(self):
+        """Init with no child checked."""
+        self.states = {}  # id(child) -> (grayed, has_subitems)
+        self.sweeps = 0
+
+    def get(self, subitems, window_of, read_table, parent_actionable,
+            grayed_of):
+        """
+        Return [(grayed, has_subitems),...] of the subitems.
+
+        `window_of(child)` returns (row, handle): the attributes row read
+        with the listing, else the handle of the window to read, (None,
+        None) if the child is grayed by `grayed_of(child)`. The handles
+        are read by `read_table(handles)` in one sweep. A window child is
+        grayed if it or the parent is not visible or enabled,
+        `parent_actionable()` is called once.
+        """
+        children = [child for name, child in subitems
+                    if id(child) not in self.states]
+        if children:
+            self._check(children, window_of, read_table, parent_actionable,
+                        grayed_of)
+        return [self.states[id(child)] for name, child in subitems]
+
+    def _check(self, children, window_of, read_table, parent_actionable,
+               grayed_of):
+        """Check the children not checked yet."""
+        rows = {}
+        handles = {}
+        for child in children:
+            row, handle = window_of(child)
+            if row is not None:
+                rows[id(child)] = row
+            elif handle is not None:
+                handles[id(child)] = handle
+        if handles:
+            table = read_table(list(handles.values()))
+            self.sweeps += 1
+            for key, handle in handles.items():
+                rows[key] = table.row(handle)
+
+        parent_checked = []
+        for child in children:
+            row = rows.get(id(child))
+            if row is None:
+                grayed = grayed_of(child)
+            else:
+                if not parent_checked:
+                    parent_checked.append(parent_actionable())
+                grayed = not (parent_checked[0] and row.visible and
+                              row.enabled)
+            self.states[id(child)] = (grayed, child.has_subitems())
@@ -219,6 +219,7 @@ class CodeGenerator(object):
     """
 
     __metaclass__ = ABCMeta
+    __slots__ = ()
 
     code_manager = CodeManager()
     code_var_name = None  # Default value, will be rewrote with composed
@@ -62,5 +62,62 @@ EDITOR_ACTIONS = {401: 'Clear last command',
                   405: 'Select all',
                   406: None,
                   407: 'Save code to file'}
+
+# Children filters of the object browser menu.
+FILTER_ACTIONS = {501: 'Visible only',
+                  502: 'Enabled only',
+                  503: 'This process only',
+                  504: 'Class name filter...',
+                  505: 'Title filter...',
+                  506: None,
+                  507: 'Reset filters'}
+
+# Worker processes to compute the access names of the top level windows.
+# 0 - compute in the main process on demand.
+ACCESS_NAMES_PROCESSES = 0
+
+# Threads to fetch the expensive properties groups concurrently.
+PROPERTIES_THREADS = 4
+
+# Seconds the properties of a control are served from the cache,
+# None - until an action or a tree refresh.
+PROPERTIES_CACHE_TTL = 5
+
+# Seconds the children of a node are served from the cache,
+# None - until an action on the node or its ancestors or a tree refresh.
+SUBITEMS_CACHE_TTL = 5
+
+# File in the home directory to keep the control classes schemas
+# between the sessions, '' - not kept.
+SCHEMAS_FILE = '.swapy_schemas.json'
+
+# Failures in a row to fetch a property before it is not fetched for
+# the controls of the class any more.
+INAPPLICABLE_FAILURES = 3
+
+# Threads to resolve the children titles shown by the placeholders.
+TITLES_THREADS = 8
+
+# Children of the item controls (lists, trees...) are shown by pages.
+SUBITEMS_PAGE_SIZE = 500
+
+# Seconds one enumeration of the live windows answers the existence checks.
+LIVENESS_INTERVAL = 0.5
+
+# Recently used windows and processes wrappers held by the registries,
+# the older ones are kept only while referenced (e.g. by the tree).
+WRAPPERS_REGISTRY_SIZE = 200
+
+# Seconds between the sweeps of the dead handles and processes.
+REGISTRY_SWEEP_INTERVAL = 30
+
+# Distinct class names and titles shared by the controls.
+INTERNED_TEXTS_LIMIT = 100000
+
+# Retries of the top level windows enumeration, the delay is doubled
+# from the first one up to the max, in seconds.
+ROOT_WINDOWS_ATTEMPTS = 5
+ROOT_WINDOWS_FIRST_DELAY = 0.05
+ROOT_WINDOWS_MAX_DELAY = 1
             
 VERSION = '0.4.8'
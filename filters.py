@@ -0,0 +1,117 @@
+# Filters of the children windows.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+"""
+Filters of the children windows.
+
+The windows are filtered by the handle attributes, the cheapest first,
+before any texts or properties of a window are fetched.
+"""
+
+import re
+
+
+class ChildrenFilter(object):
+    """
+    Filter of the window handles.
+
+    `props` passed to `apply` provides the handle attributes like
+    pywinauto's handleprops: isvisible, isenabled, processid, classname
+    and text. The regular expressions are matched from the start.
+    """
+
+    def __init__(self, visible_only=False, enabled_only=False,
+                 process=None, class_name_re=None, title_re=None):
+        """Init the filter, the defaults pass all the windows."""
+        self.visible_only = visible_only
+        self.enabled_only = enabled_only
+        self.process = process
+        self.class_name_re = class_name_re
+        self.title_re = title_re
+        self.__class_name_regex = None
+        self.__title_regex = None
+        if class_name_re:
+            self.__class_name_regex = re.compile(class_name_re)
+        if title_re:
+            self.__title_regex = re.compile(title_re)
+        self.rejected = 0  # windows filtered out
+
+    def __repr__(self):
+        return '<ChildrenFilter %s>' % ', '.join(
+            '%s=%r' % (name, value) for name, value
+            in sorted(self.options().items()))
+
+    def options(self):
+        """Return the set options as a dict."""
+        options = {'visible_only': self.visible_only,
+                   'enabled_only': self.enabled_only,
+                   'process': self.process,
+                   'class_name_re': self.class_name_re,
+                   'title_re': self.title_re}
+        return dict((name, value) for name, value in options.items()
+                    if value)
+
+    @property
+    def active(self):
+        """True if some windows may be filtered out."""
+        return bool(self.options())
+
+    def _predicates(self, props):
+        """The checks of the set options, the cheapest first."""
+        predicates = []
+        if self.visible_only:
+            predicates.append(props.isvisible)
+        if self.enabled_only:
+            predicates.append(props.isenabled)
+        if self.process is not None:
+            process = self.process
+            predicates.append(
+                lambda handle: props.processid(handle) == process)
+        if self.__class_name_regex is not None:
+            class_name_match = self.__class_name_regex.match
+            predicates.append(
+                lambda handle: class_name_match(props.classname(handle)))
+        if self.__title_regex is not None:
+            title_match = self.__title_regex.match
+            predicates.append(
+                lambda handle: title_match(props.text(handle) or ''))
+        return predicates
+
+    def apply(self, handles, props):
+        """
+        Return the handles passed the filter, in the same order.
+
+        A handle failed to be checked (e.g. the window is closed) is
+        filtered out.
+        """
+        predicates = self._predicates(props)
+        if not predicates:
+            return list(handles)
+
+        passed = []
+        for handle in handles:
+            try:
+                if all(predicate(handle) for predicate in predicates):
+                    passed.append(handle)
+                    continue
+            except Exception:
+                pass
+            self.rejected += 1
+        return passed
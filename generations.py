@@ -0,0 +1,116 @@
+# Generation based caches.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+"""
+Generation based caches.
+
+A cached value is valid until the generation of its cache is bumped,
+e.g. by an action or a tree refresh, or its time to live is passed.
+A value may also depend on keys, e.g. the node and its ancestors, then
+it is invalidated by touching one of the keys.
+The values are stored by the owners, the cache validates them.
+"""
+
+from collections import namedtuple
+import threading
+import time
+
+
+CacheEntry = namedtuple('CacheEntry', ['generation', 'time', 'stamp',
+                                       'value'])
+
+
+class GenerationCache(object):
+    """
+    Validity of the cached values.
+
+    `ttl` is the time to live of a value in seconds, None - no limit.
+    Up to `touched_limit` touched keys are remembered, then the next
+    generation is started instead.
+    """
+
+    def __init__(self, ttl=None, clock=time.time, touched_limit=1000):
+        """Init the first generation."""
+        self.ttl = ttl
+        self.clock = clock
+        self.touched_limit = touched_limit
+        self.lock = threading.RLock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._stamp = 0
+        self._touched = {}  # key -> stamp of the last touch
+
+    def _next_stamp(self):
+        with self.lock:
+            self._stamp += 1
+            return self._stamp
+
+    def bump(self):
+        """Start the next generation, all the values are invalidated."""
+        with self.lock:
+            self.generation += 1
+            self._touched.clear()
+
+    def touch(self, key):
+        """Invalidate the values depending on the key."""
+        with self.lock:
+            if len(self._touched) >= self.touched_limit:
+                self.bump()
+            self._touched[key] = self._next_stamp()
+
+    def entry(self, value):
+        """Return the entry of the value of the current generation."""
+        return CacheEntry(self.generation, self.clock(), self._next_stamp(),
+                          value)
+
+    def valid(self, entry, keys=()):
+        """
+        True if the entry is of the current generation and alive.
+
+        And none of the `keys` the value depends on is touched after
+        the entry is made.
+        """
+        if entry is None or entry.generation != self.generation:
+            return False
+        if self.ttl is not None and self.clock() - entry.time >= self.ttl:
+            return False
+        with self.lock:
+            for key in keys:
+                if self._touched.get(key, 0) > entry.stamp:
+                    return False
+        return True
+
+    def lookup(self, entry, keys=()):
+        """Same as `valid`, counts the hits and the misses."""
+        valid = self.valid(entry, keys)
+        with self.lock:
+            if valid:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return valid
+
+    def stats(self):
+        """Return the counters as a dict."""
+        with self.lock:
+            return {'generation': self.generation,
+                    'hits': self.hits,
+                    'misses': self.misses}
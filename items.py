@@ -0,0 +1,156 @@
+# Item texts of the combobox and listbox controls.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+"""
+Item texts of the combobox and listbox controls.
+
+The texts are read by the ranges of the items, the wrapper of an item
+control keeps one snapshot of the texts read, with a text -> index map,
+so the virtual items resolve their index and text without reading all
+the items again. A generation counter invalidates the snapshot on
+a tree refresh or an action.
+
+The children of an item control are shown by pages, the page helpers
+split a page between the main and the additional children and map
+the list view cells in the order of pywinauto's Items().
+"""
+
+import ctypes
+import locale
+
+
+def get_item_texts(wrapper, start, stop, item_len_msg, item_get_msg):
+    """
+    Return the texts of the items [start, stop) of a combobox or listbox.
+
+    Same as pywinauto's ItemTexts but for the range of the items only.
+    """
+    texts = []
+    for i in range(start, stop):
+        text_len = wrapper.SendMessage(item_len_msg, i, 0)
+        text = ctypes.create_string_buffer(text_len + 1)
+        wrapper.SendMessage(item_get_msg, i, ctypes.byref(text))
+        texts.append(text.value.decode(locale.getpreferredencoding(),
+                                       'ignore').replace('?', ''))
+    return texts
+
+
+class ItemTexts(object):
+
+    """
+    Snapshot of the item texts of a combobox or listbox.
+
+    Filled by pages from the first item. The text -> index map keeps the
+    first index of a text, like a linear search over ItemTexts() does.
+    """
+
+    def __init__(self, generation):
+        self.generation = generation
+        self.texts = []  # texts of the first items
+        self.indexes = {}
+
+    def extend(self, start, texts):
+        """Add the texts of the items from start, if they follow."""
+        if start != len(self.texts):
+            return
+        for i, text in enumerate(texts, start):
+            self.indexes.setdefault(text, i)
+        self.texts.extend(texts)
+
+
+class ItemsSnapshot(object):
+
+    """
+    The item texts snapshot of an item control.
+
+    `read_texts(start, stop)` reads the texts of the items [start, stop),
+    `count()` returns the items count.
+    """
+
+    def __init__(self, read_texts, count):
+        self.read_texts = read_texts
+        self.count = count
+        self.generation = 0
+        self.__item_texts = None
+
+    def refresh(self):
+        """Invalidate the snapshot."""
+        self.generation += 1
+
+    @property
+    def item_texts(self):
+        """Return the up to date snapshot."""
+        if self.__item_texts is None or \
+                self.__item_texts.generation != self.generation:
+            self.__item_texts = ItemTexts(self.generation)
+        return self.__item_texts
+
+    def read(self, start, stop):
+        """Read the texts of the items [start, stop) into the snapshot."""
+        texts = self.read_texts(start, stop)
+        self.item_texts.extend(start, texts)
+        return texts
+
+    def text(self, index):
+        """Return the text of the item."""
+        item_texts = self.item_texts
+        if index < len(item_texts.texts):
+            return item_texts.texts[index]
+        return self.read_texts(index, index + 1)[0]
+
+    def index(self, text):
+        """Return the first index of the item text, None if not found."""
+        item_texts = self.item_texts
+        if text not in item_texts.indexes:
+            loaded = len(item_texts.texts)
+            count = self.count()
+            if loaded < count:
+                self.read(loaded, count)
+        return item_texts.indexes.get(text)
+
+
+def split_page(start, stop, main_count, additional_count):
+    """
+    Split the children page [start, stop) into the main and the additional
+    children ranges.
+
+    The main children go first, returns
+    ((main_start, main_stop), (additional_start, additional_stop)),
+    an empty range has start >= stop.
+    """
+    main = (min(start, main_count), min(stop, main_count))
+    additional = (max(0, start - main_count),
+                  min(max(0, stop - main_count), additional_count))
+    return main, additional
+
+
+def cells_count(item_count, column_count):
+    """Return the cells count of a list view, a cell per a column."""
+    return item_count * max(1, column_count)
+
+
+def cells(start, stop, column_count):
+    """
+    Return the (row, column) of the cells [start, stop) of a list view.
+
+    The rows go first, then the columns, like pywinauto's Items().
+    """
+    column_count = max(1, column_count)
+    return [divmod(i, column_count) for i in range(start, stop)]
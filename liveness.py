@@ -0,0 +1,105 @@
+# Liveness of the window handles.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+"""
+Liveness of the window handles.
+
+One enumeration of the live handles of the desktop answers the existence
+checks of all the objects for a short interval.
+"""
+
+import threading
+import time
+
+
+class LivenessOracle(object):
+    """
+    Answers whether a window handle is alive.
+
+    `enumerate_handles` returns all the live handles of the desktop,
+    `probe` checks a single handle. The enumeration is taken at most once
+    per `interval` seconds, or once per user operation if `expire` is
+    called when the operation starts. A handle found in the snapshot is
+    alive. A handle missing in the snapshot may be created after the
+    enumeration, so it is probed directly.
+    """
+
+    def __init__(self, enumerate_handles, probe, interval=0.5,
+                 clock=time.time):
+        """Init with no snapshot taken."""
+        self.enumerate_handles = enumerate_handles
+        self.probe = probe
+        self.interval = interval
+        self.clock = clock
+        self.lock = threading.RLock()
+        self.checks = 0
+        self.probes = 0
+        self.enumerations = 0
+        self._handles = frozenset()
+        self._snapshot_time = None
+
+    @property
+    def probes_saved(self):
+        """Number of the checks answered from the snapshot."""
+        return self.checks - self.probes
+
+    def stats(self):
+        """Return the counters as a dict."""
+        with self.lock:
+            return {'checks': self.checks,
+                    'probes': self.probes,
+                    'probes_saved': self.probes_saved,
+                    'enumerations': self.enumerations}
+
+    def expire(self):
+        """Drop the snapshot, the next check enumerates the handles again."""
+        with self.lock:
+            self._snapshot_time = None
+
+    def _live_handles(self):
+        """Return the snapshot, enumerate the handles if it is stale."""
+        now = self.clock()
+        if self._snapshot_time is None or \
+                not 0 <= now - self._snapshot_time < self.interval:
+            try:
+                self._handles = frozenset(self.enumerate_handles())
+            except Exception:
+                # unsure about every handle, probe them directly
+                self._handles = frozenset()
+            self._snapshot_time = now
+            self.enumerations += 1
+        return self._handles
+
+    def exists(self, handle):
+        """Return True if the window handle is alive."""
+        with self.lock:
+            self.checks += 1
+            if handle in self._live_handles():
+                return True
+            self.probes += 1
+
+        try:
+            is_exist = bool(self.probe(handle))
+        except Exception:
+            is_exist = False
+        if is_exist:
+            with self.lock:
+                self._handles = self._handles.union([handle])
+        return is_exist
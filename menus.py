@@ -0,0 +1,225 @@
+# Menu structures of the windows.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+"""
+Menu structures of the windows.
+
+The items of a menu are read in one pass, one GetMenuItemInfo per item,
+and the menu wrappers are served from the captured structure until the
+window menu is changed. A submenu is not opened while capturing, the
+app may rebuild it on the popup notification, it is captured when its
+item is expanded. The state of an item (enabled, grayed, checked) is
+changed by the app at any time, it is read live. A submenu filled by
+the app on the popup is captured again if its items count is changed.
+"""
+
+from collections import namedtuple
+import threading
+
+
+MF_SEPARATOR = 2048
+
+# the values read by one GetMenuItemInfo, the submenu handle is 0 if none
+MenuItemInfo = namedtuple('MenuItemInfo', ['text', 'type', 'id',
+                                           'submenu_handle'])
+
+
+class MenuEntry(object):
+    """Captured menu item."""
+
+    __slots__ = ('item', 'index', 'text', 'type', 'id', 'submenu_handle',
+                 'path_items', 'submenu', 'submenu_entries')
+
+    def __init__(self, item, info, path_items):
+        """Init from pywinauto's MenuItem and its MenuItemInfo."""
+        self.item = item  # pywinauto's MenuItem
+        self.index = item.Index()
+        self.text = info.text
+        self.type = info.type
+        self.id = info.id
+        self.submenu_handle = info.submenu_handle
+        self.path_items = path_items  # ["File", "#0", "Save As"]
+        self.submenu = None  # pywinauto's Menu, once the item is expanded
+        self.submenu_entries = None  # None if the submenu is not captured
+
+    @property
+    def path(self):
+        """Path of the item, "File->#0->Save As"."""
+        return '->'.join(self.path_items)
+
+    @property
+    def has_submenu(self):
+        """True if the item has a submenu, it is not opened."""
+        return bool(self.submenu_handle)
+
+    @property
+    def label(self):
+        """Text of the item in the object browser."""
+        if self.text:
+            return self.text
+        elif self.type == MF_SEPARATOR:
+            return '-----Separator-----'
+        else:
+            return 'Index: %d' % self.index
+
+    @property
+    def state(self):
+        """The item state, read live."""
+        return self.item.State()
+
+    def properties(self):
+        """
+        Same as MenuItem.GetProperties().
+
+        The items of the submenus captured so far only.
+        """
+        props = {'Index': self.index,
+                 'State': self.state,
+                 'Type': self.type,
+                 'ID': self.id,
+                 'Text': self.text}
+        if self.submenu_entries is not None:
+            props['MenuItems'] = [entry.properties() for entry
+                                  in self.submenu_entries]
+        return props
+
+
+class MenuStructure(object):
+    """
+    Captured menu tree of a window.
+
+    `menu` is pywinauto's Menu of the window, `read_item(item)` returns
+    the MenuItemInfo of pywinauto's MenuItem. The top level is captured
+    at once, a submenu level when it is opened.
+    """
+
+    def __init__(self, menu, read_item, signature=None):
+        """Capture the top level of the menu."""
+        self.menu = menu
+        self.read_item = read_item
+        self.signature = signature
+        self.entries = {}  # (menu handle, index) -> MenuEntry
+        self.menus = {}  # menu handle -> [MenuEntry, ...]
+        self.submenus = {}  # menu handle -> (pywinauto's Menu, path, owner)
+        self._capture(menu, [])
+
+    def _capture(self, menu, path, owner=None):
+        """Capture the items of the menu, `owner` is the MenuEntry."""
+        if not menu.accessible:
+            return None
+
+        self.submenus[menu.handle] = (menu, path, owner)
+        entries = []
+        for item in menu.Items():
+            info = self.read_item(item)
+            text = info.text or '#%d' % item.Index()
+            entry = MenuEntry(item, info, path + [text])
+            self.entries[(menu.handle, entry.index)] = entry
+            entries.append(entry)
+        self.menus[menu.handle] = entries
+        return entries
+
+    def entry(self, menu_handle, index):
+        """Return the captured item or None."""
+        return self.entries.get((menu_handle, index))
+
+    def open(self, entry):
+        """
+        Return the submenu of the item or None, capture it once.
+
+        The app is notified of the popup (SubMenu() sends
+        WM_INITMENUPOPUP) and may fill the submenu.
+        """
+        if entry.submenu_entries is None and entry.has_submenu:
+            entry.submenu = entry.item.SubMenu()
+            if entry.submenu is not None:
+                entry.submenu_entries = self._capture(
+                    entry.submenu, entry.path_items, entry)
+        return entry.submenu
+
+    def items(self, menu_handle):
+        """
+        Return the captured items of the menu or None.
+
+        The menu is captured again if its items count is changed.
+        """
+        entries = self.menus.get(menu_handle)
+        if entries is None:
+            return None
+        menu, path, owner = self.submenus[menu_handle]
+        try:
+            count = menu.ItemCount()
+        except Exception:
+            return entries
+        if count != len(entries):
+            for entry in entries:
+                self.entries.pop((menu_handle, entry.index), None)
+            entries = self._capture(menu, path, owner)
+            if owner is not None:
+                owner.submenu_entries = entries
+        return entries
+
+
+class MenuStructures(object):
+    """
+    Menu structures of the windows.
+
+    `get_signature(window_handle)` returns a cheap value changed with
+    the window menu (e.g. the menu handle and the items count), None if
+    the window has no menu. `get_menu(window_handle)` returns pywinauto's
+    Menu of the window to capture, `read_item(item)` the MenuItemInfo of
+    its MenuItem.
+    """
+
+    def __init__(self, get_signature, get_menu, read_item):
+        """Init with no structures captured."""
+        self.get_signature = get_signature
+        self.get_menu = get_menu
+        self.read_item = read_item
+        self.lock = threading.RLock()
+        self.structures = {}  # window handle -> MenuStructure
+        self.captures = 0
+
+    def get(self, window_handle):
+        """Return the up to date menu structure or None if no menu."""
+        signature = self.get_signature(window_handle)
+        with self.lock:
+            structure = self.structures.get(window_handle)
+            if structure is not None and structure.signature == signature:
+                return structure
+
+            self.structures.pop(window_handle, None)
+            if signature is None:
+                return None
+            menu = self.get_menu(window_handle)
+            if menu is None:
+                return None
+            structure = MenuStructure(menu, self.read_item, signature)
+            self.structures[window_handle] = structure
+            self.captures += 1
+            return structure
+
+    def invalidate(self, window_handle=None):
+        """Drop the structure of the window or all the structures."""
+        with self.lock:
+            if window_handle is None:
+                self.structures.clear()
+            else:
+                self.structures.pop(window_handle, None)
@@ -0,0 +1,186 @@
+# Command lines of the processes.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+"""
+Command lines of the processes.
+
+The command line of a PID is resolved once and cached while the process
+with the same start time runs, a recycled PID has another start time.
+The registries of the processes are keyed by (PID, start time) for the
+same reason.
+"""
+
+import os
+import threading
+
+
+class ProcessInfoProvider(object):
+    """Process info source, the base class of the providers."""
+
+    def start_time(self, pid):
+        """
+        Return the process start time.
+
+        The value is opaque, it is only compared with the previous one.
+        None if there is no such process or the time is not available.
+        """
+        raise NotImplementedError
+
+    def command_line(self, pid):
+        """Return the process command line or None if not available."""
+        raise NotImplementedError
+
+    def process_key(self, pid):
+        """Return the (pid, start time) key of the process."""
+        return pid, self.start_time(pid)
+
+    def is_alive(self, key):
+        """
+        Return True if the process of the (pid, start time) key is running.
+
+        False for a recycled PID or if the start time is not available.
+        """
+        pid, start_time = key
+        return start_time is not None and self.start_time(pid) == start_time
+
+
+class WmiProcessInfoProvider(ProcessInfoProvider):
+    """Windows processes, the command line is queried by WMI."""
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+    def start_time(self, pid):
+        import win32api
+        import win32process
+        try:
+            handle = win32api.OpenProcess(
+                self.PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        except Exception:
+            return None
+        try:
+            return win32process.GetProcessTimes(handle)['CreationTime']
+        except Exception:
+            return None
+        finally:
+            win32api.CloseHandle(handle)
+
+    def command_line(self, pid):
+        from win32com.client import GetObject
+        wmi = GetObject('winmgmts:')
+        # the PID only, not a sweep over all the processes
+        processes = wmi.ExecQuery('Select CommandLine from Win32_Process '
+                                  'where ProcessId = %d' % pid)
+        for process in processes:
+            return process.CommandLine
+        return None
+
+
+class ProcProcessInfoProvider(ProcessInfoProvider):
+    """Linux processes, the info is read from /proc."""
+
+    def __init__(self, root='/proc'):
+        self.root = root
+
+    def start_time(self, pid):
+        try:
+            with open(os.path.join(self.root, str(pid), 'stat')) as stat:
+                data = stat.read()
+        except (IOError, OSError):
+            return None
+        # the process name may contain spaces and parentheses
+        fields = data[data.rfind(')') + 2:].split()
+        try:
+            return int(fields[19])  # starttime, the 22nd field
+        except (IndexError, ValueError):
+            return None
+
+    def command_line(self, pid):
+        try:
+            with open(os.path.join(self.root, str(pid), 'cmdline')) as cmdline:
+                data = cmdline.read()
+        except (IOError, OSError):
+            return None
+        args = [arg for arg in data.split('\0') if arg]
+        if not args:
+            return None  # a kernel thread or a zombie
+        return ' '.join(args)
+
+
+def default_provider():
+    """Return the provider of the current platform."""
+    if os.name == 'nt':
+        return WmiProcessInfoProvider()
+    return ProcProcessInfoProvider()
+
+
+class CommandLineResolver(object):
+    """
+    Cached PID to command line resolver.
+
+    The command line is asked from the `provider` once per a PID and
+    the process start time. The unavailable command line is cached too.
+    If the start time is unknown the cache is bypassed.
+    """
+
+    def __init__(self, provider=None):
+        """Init with an empty cache."""
+        if provider is None:
+            provider = default_provider()
+        self.provider = provider
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._cache = {}  # pid -> (start_time, command line or None)
+
+    def command_line(self, pid):
+        """Return the process command line or None if not available."""
+        start_time = self.provider.start_time(pid)
+        if start_time is None:
+            with self.lock:
+                self._cache.pop(pid, None)
+                self.misses += 1
+            return self._query(pid)
+
+        with self.lock:
+            cached = self._cache.get(pid)
+            if cached is not None and cached[0] == start_time:
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        cmd_line = self._query(pid)
+        with self.lock:
+            self._cache[pid] = (start_time, cmd_line)
+        return cmd_line
+
+    def _query(self, pid):
+        """Ask the provider, None if it fails."""
+        try:
+            return self.provider.command_line(pid)
+        except Exception:
+            return None
+
+    def invalidate(self, pid=None):
+        """Drop the cached command line of the PID or all of them."""
+        with self.lock:
+            if pid is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(pid, None)
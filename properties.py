@@ -0,0 +1,90 @@
+# Properties groups of the properties viewer.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+"""
+Properties groups of the properties viewer.
+
+A wrapper returns its properties as groups - [(cheap, getter),...].
+The cheap groups are shown at once, the expensive ones are fetched
+concurrently and the properties are shown again as each one arrives.
+Merged in the order of the groups, a later group overrides the earlier
+ones whatever order they arrive in.
+"""
+
+import traceback
+
+
+EXPECTED_INDEX = -1  # the expected keys go before all the groups
+
+
+def fetch_group(group):
+    """
+    Fetch the (index, getter) group - (index, properties, error).
+
+    `error` is the traceback text if the getter failed, else None.
+    """
+    index, getter = group
+    try:
+        return index, getter(), None
+    except:
+        return index, {}, traceback.format_exc(5)
+
+
+def merge_groups(groups, updating):
+    """
+    Merge the fetched [(index, properties),...] groups in the index order.
+
+    The expected keys are kept only while updating.
+    """
+    properties = {}
+    for index, group_properties in sorted(groups, key=lambda group: group[0]):
+        if index != EXPECTED_INDEX or updating:
+            properties.update(group_properties)
+    return properties
+
+
+def stream_properties(properties_groups, expected, imap):
+    """
+    Fetch the properties groups, yield (properties, updating, errors).
+
+    Yields once the cheap groups are fetched, then as each expensive group
+    arrives. `expected` are the keys shown before they are fetched,
+    `imap(func, iterable)` fetches the expensive groups, in any order.
+    The caller may stop the iteration to drop the rest.
+    """
+    groups = [(EXPECTED_INDEX, dict.fromkeys(expected, ''))]
+    expensive_groups = []
+    errors = []
+    for index, (cheap, getter) in enumerate(properties_groups):
+        if cheap:
+            index, properties, error = fetch_group((index, getter))
+            if error:
+                errors.append(error)
+            groups.append((index, properties))
+        else:
+            expensive_groups.append((index, getter))
+    remaining = len(expensive_groups)
+    yield merge_groups(groups, bool(remaining)), bool(remaining), errors
+
+    for index, properties, error in imap(fetch_group, expensive_groups):
+        remaining -= 1
+        groups.append((index, properties))
+        yield (merge_groups(groups, bool(remaining)), bool(remaining),
+               [error] if error else [])
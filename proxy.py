@@ -21,27 +21,293 @@
 """proxy module for pywinauto."""
 
 from abc import ABCMeta, abstractproperty, abstractmethod
+import ctypes
 import exceptions
+import functools
+import inspect
 import os
 import platform
 import string
 import thread
+import threading
 import time
+import timeit
 import warnings
 
 import pywinauto
 
+from access_names import UniqueNamesTables, build_unique_names, control_info
+from actions import run_steps
+from attributes import ModuleBackend, SubitemsStates, read_attributes
 from code_manager import CodeGenerator, check_valid_identifier
 from const import *
+from filters import ChildrenFilter
+from generations import GenerationCache
+from items import ItemsSnapshot, cells, cells_count, get_item_texts, \
+    split_page
+from liveness import LivenessOracle
+from menus import MenuItemInfo, MenuStructures
+from processes import CommandLineResolver, WmiProcessInfoProvider
+from registry import WrapperRegistry
+from root_windows import RootWindowsEngine
+from schemas import SchemaCache, schema_version
+from stubs import WrapperStub
+from titles import placeholder_title
+from toolbars import ToolbarButtonInfo, ToolbarTables, button_properties
+from treeviews import TreeLevels
 
 
 pywinauto.timings.Timings.window_find_timeout = 1
 
+ACTIONS_NAMES = frozenset(ACTIONS.values())  # the methods allowed to execute
+ACTIONS_IDS = dict((action, _id) for _id, action in ACTIONS.items())
+
+
+attributes_backend = ModuleBackend(pywinauto.handleprops)
+
+
+def read_control_attributes(handles, backend=None):
+    """
+    Read the cheap attributes of the windows in one sweep.
+
+    Return the AttributesTable: class name, control id, visibility,
+    enabled state and process id by the handle, the text and the
+    rectangle are read on ask.
+    """
+    return read_attributes(handles, backend or attributes_backend)
+
+
+def _window_of(child):
+    """
+    Return (row, handle) the child is grayed by, see SubitemsStates.
+
+    The stubs have the row read with the listing, the other children with
+    the default window checks are read by the handle.
+    """
+    if isinstance(child, WrapperStub):
+        return child.row, None
+    child_type = type(child)
+    if (getattr(child_type._check_visibility, '__func__', None),
+            getattr(child_type._check_actionable, '__func__', None)) != \
+            (NativeObject._check_visibility.__func__,
+             NativeObject._check_actionable.__func__):
+        return None, None
+    try:
+        return None, child.pwa_obj.handle
+    except Exception:
+        return None, None
+
+
+def _subitems_states(parent, subitems, states):
+    """Return [(grayed, has_subitems),...] of the subitems by the states."""
+    return states.get(
+        subitems, _window_of, read_control_attributes,
+        lambda: parent._check_visibility() and parent._check_actionable(),
+        lambda child: not child._check_visibility() or
+        not child._check_actionable())
+
+
+def get_control_info(handle):
+    """Collect the control attributes the access names are based on."""
+    return control_info(handle, pywinauto.controls.WrapHandle(handle))
+
+
+def enum_live_handles():
+    """Return the handles of all the windows of the desktop."""
+    return pywinauto.findwindows.find_windows(top_level_only=False,
+                                              visible_only=False,
+                                              enabled_only=False)
+
+
+_texts = {}  # the shared copies of the texts
+
+
+def intern_text(text):
+    """
+    Return the shared copy of the text.
+
+    The class names and titles repeat over thousands of the controls.
+    Builtin intern() accepts str only, the texts are mostly unicode.
+    """
+    if len(_texts) >= INTERNED_TEXTS_LIMIT:
+        _texts.clear()
+    return _texts.setdefault(text, text)
+
+
+def get_taskbar_handle():
+    """Return the taskbar handle."""
+    # ignore future warning in taskbar module
+    warnings.filterwarnings("ignore", category=FutureWarning)
+    from pywinauto import taskbar
+    return taskbar.TaskBarHandle()
+
+
+def get_window_texts(handle):
+    """Return the texts of the window."""
+    return pywinauto.controls.WrapHandle(handle).Texts()
+
+
+def get_menu_signature(handle):
+    """
+    Return (menu handle, items count) of the window, None if no menu.
+
+    The items states are not in the signature, they are read live, the
+    submenus are checked by their items count (see menus.py).
+    """
+    menu_handle = pywinauto.win32functions.GetMenu(handle)
+    if not menu_handle:
+        # a popup menu window
+        menu_handle = pywinauto.win32functions.SendMessage(
+            handle, pywinauto.win32defines.MN_GETHMENU, 0, 0)
+    if not menu_handle:
+        return None
+    return (menu_handle,
+            pywinauto.win32functions.GetMenuItemCount(menu_handle))
+
+
+def get_menu(handle):
+    """Return the menu of the window."""
+    return pywinauto.controls.WrapHandle(handle).Menu()
+
+
+def read_menu_item(item):
+    """
+    Return the MenuItemInfo of pywinauto's MenuItem.
+
+    One GetMenuItemInfo, the MenuItem methods read it per a value and
+    SubMenu() notifies the app of the popup.
+    """
+    info = item._read_item()
+    return MenuItemInfo(info.text, info.fType, info.wID, info.hSubMenu)
+
+
+def read_toolbar_buttons(toolbar):
+    """
+    Read all the buttons of the toolbar in one sweep.
+
+    Same as pywinauto's GetButton per a button, but a single remote memory
+    block is used for all the buttons and the state and the style come
+    with the button info. The buttons failed to read are skipped.
+    """
+    structures = pywinauto.win32structures
+    defines = pywinauto.win32defines
+    text_len = 2000
+
+    remote_mem = pywinauto.controls.common_controls.RemoteMemoryBlock(
+        toolbar, size=8192)
+    button = structures.TBBUTTON()
+    rect = structures.RECT()
+    info = structures.TBBUTTONINFOW()
+    button_address = remote_mem.Address()
+    rect_address = button_address + ctypes.sizeof(button)
+    info_address = rect_address + ctypes.sizeof(rect)
+    text_address = info_address + ctypes.sizeof(info)
+
+    rows = []
+    try:
+        for index in range(toolbar.ButtonCount()):
+            button = structures.TBBUTTON()
+            remote_mem.Write(button, button_address)
+            if not toolbar.SendMessage(defines.TB_GETBUTTON, index,
+                                       button_address):
+                continue
+            remote_mem.Read(button, button_address)
+
+            info = structures.TBBUTTONINFOW()
+            info.cbSize = ctypes.sizeof(info)
+            info.dwMask = defines.TBIF_COMMAND | defines.TBIF_STYLE | \
+                defines.TBIF_STATE | defines.TBIF_TEXT
+            info.cchText = text_len
+            info.pszText = text_address
+            remote_mem.Write(info, info_address)
+            if toolbar.SendMessage(defines.TB_GETBUTTONINFOW,
+                                   button.idCommand, info_address) == -1:
+                continue
+            remote_mem.Read(info, info_address)
+            text = ctypes.create_unicode_buffer(text_len - 1)
+            remote_mem.Read(text, text_address)
+
+            rect = structures.RECT()
+            remote_mem.Write(rect, rect_address)
+            toolbar.SendMessage(defines.TB_GETRECT, info.idCommand,
+                                rect_address)
+            remote_mem.Read(rect, rect_address)
+            if rect == structures.RECT(0, 0, 0, 0):
+                toolbar.SendMessage(defines.TB_GETITEMRECT, index,
+                                    rect_address)
+                remote_mem.Read(rect, rect_address)
+
+            rows.append(ToolbarButtonInfo(index, info.idCommand, text.value,
+                                          info.fsState, info.fsStyle, rect))
+    finally:
+        del remote_mem
+    return rows
+
+
+def make_toolbar_button(toolbar, row):
+    """
+    Return pywinauto's toolbar button for the table row.
+
+    The row is used as the button info, the button is not read again.
+    """
+    button_class = pywinauto.controls.common_controls._toolbar_button
+    button = button_class.__new__(button_class)
+    button.toolbar_ctrl = toolbar
+    button.index = row.index
+    button.info = row
+    return button
+
+
+def get_tree_first_child(tree, item):
+    """Return the handle of the first child, the first root if no item."""
+    if item is None:
+        return tree.SendMessage(pywinauto.win32defines.TVM_GETNEXTITEM,
+                                pywinauto.win32defines.TVGN_ROOT)
+    return tree.SendMessage(pywinauto.win32defines.TVM_GETNEXTITEM,
+                            pywinauto.win32defines.TVGN_CHILD, item)
+
+
+def get_tree_next_sibling(tree, item):
+    """Return the handle of the next item of the same level."""
+    return tree.SendMessage(pywinauto.win32defines.TVM_GETNEXTITEM,
+                            pywinauto.win32defines.TVGN_NEXT, item)
+
+
+def execute_actions(steps, stop_on_error=False):
+    """
+    Execute the sequence of the actions against one or many wrappers.
+
+    A step is (wrapper, action), (wrapper, action, args) or
+    (wrapper, action, args, kwargs). Returns [StepResult,...] with the
+    duration and the outcome of each step.
+    """
+    try:
+        return run_steps(steps, stop_on_error)
+    finally:
+        # the actions may open or close windows
+        NativeObject.liveness.expire()
+
+
+def set_children_filter(**options):
+    """
+    Filter the children windows in the object browser.
+
+    The options are of the ChildrenFilter: visible_only, enabled_only,
+    process, class_name_re, title_re. No options - no filter.
+    """
+    NativeObject.children_filter = ChildrenFilter(**options)
+    return NativeObject.children_filter
+
+
+# the start times and the command lines of the processes
+process_info = WmiProcessInfoProvider()
+
 
 class MetaWrapper(ABCMeta):
     """Meta class with storing list of target subclasses."""
 
     wrappers = {}  # List of the registered wrappers
+    dispatch_cache = {}  # target type -> wrapper, resolved by the MRO
 
     def __init__(cls, name, bases, attrs):
         """Register the wrapper."""
@@ -49,24 +315,45 @@ class MetaWrapper(ABCMeta):
                 and 'target_class' in attrs \
                 and attrs['target_class'] is not None:
             cls.wrappers[attrs['target_class']] = cls
+            cls.dispatch_cache.clear()
 
         super(MetaWrapper, cls).__init__(name, bases, attrs)
 
+    @classmethod
+    def wrapper_for(mcs, target_type):
+        """
+        Return the wrapper of the nearest registered base of the type.
+
+        The MRO is walked once per a type, then the wrapper is cached.
+        The default wrapper if no base is registered.
+        """
+        try:
+            return mcs.dispatch_cache[target_type]
+        except KeyError:
+            pass
+
+        wrapper = mcs.wrappers['default']
+        for base in inspect.getmro(target_type):
+            if base in mcs.wrappers:
+                wrapper = mcs.wrappers[base]
+                break
+        mcs.dispatch_cache[target_type] = wrapper
+        return wrapper
+
 
 class SWAPYWrapper(object):
     """Base proxy class(interface) for pywinauto objects."""
 
     __metaclass__ = MetaWrapper
+    __slots__ = ()
+
+    paged_subitems = False  # True if the children should be shown by pages
 
     def __new__(cls, *args, **kwargs):
         """Wrap with registered wrappers."""
         if cls is SWAPYWrapper:
             # Direct call, wrap target class
-            try:
-                wrap_class = cls.__metaclass__.wrappers[args[0].__class__]
-            except KeyError:
-                # unknown class, use the default wrapper
-                wrap_class = cls.__metaclass__.wrappers['default']
+            wrap_class = cls.__metaclass__.wrapper_for(args[0].__class__)
             instance = wrap_class(*args, **kwargs)
         else:
             # Call from a sub class
@@ -81,10 +368,21 @@ class SWAPYWrapper(object):
     def get_properties(self):
         """Return dict of original + additional properties."""
         properties = {}
-        properties.update(self._properties)
-        properties.update(self._additional_properties)
+        for cheap, getter in self.get_properties_groups():
+            properties.update(getter())
         return properties
 
+    def get_properties_groups(self):
+        """
+        Return the properties groups - [(cheap, getter),...].
+
+        A getter returns a dict of the group properties. The cheap groups
+        may be shown at once, the expensive ones may be fetched
+        concurrently. Merged in the order, a later group overrides
+        the earlier ones.
+        """
+        return self._properties_groups
+
     def get_subitems(self):
         """Return list of children - [(control_text, swapy_obj),...]."""
         subitems = []
@@ -93,17 +391,89 @@ class SWAPYWrapper(object):
         subitems += self._additional_children
 
         subitems.sort(key=self._subitems_sort_key)
-        # encode names
-        subitems_encoded = []
-        for (name, obj) in subitems:
-            # name = name.encode('cp1251', 'replace')
-            subitems_encoded.append((name, obj))
-        return subitems_encoded
-
-    def execute_action(self, action):
-        """Execute action on the control."""
-        exec('self.pwa_obj.'+action+'()')
-        return 0
+        return subitems
+
+    def get_expected_properties(self):
+        """Return the property keys expected before they are fetched."""
+        return []
+
+    def get_subitems_deferred(self):
+        """
+        Return the children at once, the slow titles are deferred.
+
+        ([(control_text, swapy_obj),...], [(swapy_obj, resolve_title),...])
+        The deferred children have placeholder titles, `resolve_title()`
+        returns the real one and may be slow.
+        """
+        return self.get_subitems(), []
+
+    def get_subitems_count(self):
+        """Return the number of children."""
+        return len(self._children) + self._additional_children_count
+
+    def has_subitems(self):
+        """
+        Return True if there are children, None if it is not known cheaply.
+
+        The children themselves are not fetched.
+        """
+        return None
+
+    def get_subitems_states(self, subitems):
+        """
+        Return [(grayed, has_subitems),...] of the listed children.
+
+        Grayed if the child is not visible or not actionable.
+        """
+        return _subitems_states(self, subitems, SubitemsStates())
+
+    def get_subitems_page(self, start, stop):
+        """
+        Return the children [start, stop) - [(control_text, swapy_obj),...].
+
+        The main children go first, then the additional ones in their
+        order. Only the requested additional children are fetched.
+        """
+        children = self._children
+        main, additional = split_page(start, stop, len(children),
+                                      self._additional_children_count)
+        subitems = children[main[0]:main[1]]
+        if additional[1] > additional[0]:
+            subitems += self._get_additional_children(*additional)
+        return subitems
+
+    def execute_action(self, action, *args, **kwargs):
+        """
+        Execute action on the control, the arguments are passed.
+
+        Returns the result of the pywinauto method.
+        """
+        return self.get_action_method(action)(*args, **kwargs)
+
+    def get_action_method(self, action):
+        """Return the bound method of the pywinauto object for the action."""
+        if action not in ACTIONS_NAMES:
+            raise ValueError("Unknown action %r" % (action,))
+        method = getattr(self.pwa_obj, action, None)
+        if not callable(method):
+            raise AttributeError("%s has no action %r" % (
+                self.pwa_obj.__class__.__name__, action))
+        return method
+
+    def execute_actions(self, actions, stop_on_error=False):
+        """
+        Execute the actions one by one.
+
+        `actions` is [action, ...] or [(action, args),...], returns
+        [StepResult,...] with the duration and the outcome of each step.
+        """
+        steps = []
+        for action in actions:
+            if isinstance(action, basestring):
+                steps.append((self, action))
+            else:
+                steps.append((self,) + tuple(action))
+        return execute_actions(steps, stop_on_error)
 
     def get_actions(self):
         """Return list of the regular actions."""
@@ -113,6 +483,22 @@ class SWAPYWrapper(object):
         """Return list of the extended actions."""
         return self._extended_actions
 
+    def get_menu_actions(self):
+        """
+        Return the context menu entries - (extended, regular).
+
+        [(id, action_name, enabled),...] each. The control is checked
+        actionable once for all the entries.
+        """
+        actions = self.get_actions()
+        extended_actions = self.get_extended_actions()
+        if not actions and not extended_actions:
+            return [], []
+        is_actionable = self._check_actionable()
+        return ([(_id, action, is_actionable)
+                 for _id, action in extended_actions],
+                [(_id, action, is_actionable) for _id, action in actions])
+
     def highlight_control(self):
         """Highlight the control."""
         self._highlight_control()
@@ -137,6 +523,16 @@ class SWAPYWrapper(object):
         """List of the additional children."""
         pass
 
+    @abstractproperty
+    def _additional_children_count(self):
+        """Number of the additional children."""
+        pass
+
+    @abstractmethod
+    def _get_additional_children(self, start, stop):
+        """List of the additional children [start, stop)."""
+        pass
+
     @abstractproperty
     def _additional_properties(self):
         """Dict with additional actions."""
@@ -167,6 +563,11 @@ class SWAPYWrapper(object):
         """Dict with regular actions."""
         pass
 
+    @abstractproperty
+    def _properties_groups(self):
+        """List of the properties groups."""
+        pass
+
     @abstractproperty
     def _subitems_sort_key(self):
         """Sub items sort key."""
@@ -182,27 +583,225 @@ class NativeObject(SWAPYWrapper, CodeGenerator):
     code_action_pattern = "{var}.{action}()"
     main_parent_type = None
     short_name = 'control'
-    __code_var_pattern = None  # cached value, to access even if the pwa
-    # object was closed
+    uniq_names_tables = UniqueNamesTables()  # shared by all the wrappers
+    actions_tables = {}  # (wrapper class, pywinauto class) -> actions
+    children_filter = ChildrenFilter()  # set by set_children_filter
+    properties_cache = GenerationCache(PROPERTIES_CACHE_TTL)
+    subitems_cache = GenerationCache(SUBITEMS_CACHE_TTL)
+    # by the wrapper class and the window class
+    schemas = SchemaCache(INAPPLICABLE_FAILURES, version=schema_version(
+        pywinauto.__version__, ACTIONS.values()))
+    liveness = LivenessOracle(enum_live_handles,
+                              pywinauto.handleprops.iswindow,
+                              interval=LIVENESS_INTERVAL)
+
+    # No __dict__, there may be thousands of the controls browsed.
+    # Subclasses with own instance attributes declare them in __slots__
+    # or omit __slots__ to get a __dict__.
+    __slots__ = ('_pwa_obj', 'parent', 'code_var_name',
+                 '__code_var_pattern', '__access_name', '__control_class',
+                 '__properties_entries', '__subitems_entry',
+                 '__subitems_states')
 
     def __init__(self, pwa_obj, parent=None):
         """NativeObject constructor."""
         self._pwa_obj = pwa_obj  # original pywinauto object
         self.parent = parent
+        self.code_var_name = None
+        self.__code_var_pattern = None  # cached value, to access even if
+        # the pwa object was closed
+        self.__access_name = None  # cached values for the code generator,
+        # the access name is kept with the properties cache generation
+        self.__control_class = None
+        self.__properties_entries = None  # {group index: CacheEntry}
+        self.__subitems_entry = None
+        self.__subitems_states = None  # SubitemsStates of the listing
         super(NativeObject, self).__init__(pwa_obj, parent=None)
 
+    def execute_action(self, action, *args, **kwargs):
+        """
+        Execute action.
+
+        The properties of any control may be changed, the children of
+        the control and its descendants may be changed.
+        """
+        try:
+            return super(NativeObject, self).execute_action(
+                action, *args, **kwargs)
+        finally:
+            self.properties_cache.bump()
+            self.subitems_cache.touch(id(self))
+
+    def __lineage(self):
+        """Keys of the control and its ancestors in the subitems cache."""
+        keys = []
+        node = self
+        while node is not None:
+            keys.append(id(node))
+            node = getattr(node, 'parent', None)
+        return keys
+
+    def __cached_subitems(self):
+        """Return the cached children or None."""
+        entry = self.__subitems_entry
+        if self.subitems_cache.lookup(entry, self.__lineage()):
+            subitems, self.__subitems_states = entry.value
+            return list(subitems)
+        return None
+
+    def __new_listing(self):
+        """Return the states of the new listing of the children."""
+        states = self.__subitems_states = SubitemsStates()
+        return states
+
+    def get_subitems(self):
+        """The children are served from the subitems cache."""
+        subitems = self.__cached_subitems()
+        if subitems is None:
+            entry = self.subitems_cache.entry(None)
+            subitems = super(NativeObject, self).get_subitems()
+            self.__subitems_entry = entry._replace(
+                value=(subitems, self.__new_listing()))
+            subitems = list(subitems)
+        return subitems
+
+    def get_subitems_states(self, subitems):
+        """
+        The states are kept with the listing in the subitems cache.
+
+        A re-selection of the node reads nothing from the application.
+        """
+        states = self.__subitems_states
+        if states is None or self.paged_subitems:
+            states = SubitemsStates()
+        return _subitems_states(self, subitems, states)
+
+    def get_subitems_deferred(self):
+        """
+        The children are served from the subitems cache.
+
+        The deferred children are cached when all their titles are
+        resolved.
+        """
+        subitems = self.__cached_subitems()
+        if subitems is not None:
+            return subitems, []
+
+        entry = self.subitems_cache.entry(None)
+        subitems, resolvers = self._get_subitems_deferred()
+        states = self.__new_listing()
+        if not resolvers:
+            self.__subitems_entry = entry._replace(
+                value=(list(subitems), states))
+            return subitems, resolvers
+
+        lock = threading.Lock()
+        titles = {}  # id(swapy_obj) -> resolved title
+
+        def resolve(obj, resolve_title):
+            title = resolve_title()
+            with lock:
+                titles[id(obj)] = title
+                if len(titles) == len(resolvers):
+                    resolved = [(titles.get(id(i_obj), name), i_obj)
+                                for name, i_obj in subitems]
+                    resolved.sort(key=self._subitems_sort_key)
+                    self.__subitems_entry = entry._replace(
+                        value=(resolved, states))
+            return title
+
+        return subitems, [(obj, functools.partial(resolve, obj,
+                                                  resolve_title))
+                          for obj, resolve_title in resolvers]
+
+    def get_properties_groups(self):
+        """
+        Return the properties groups.
+
+        A group is served from the properties cache while the cached
+        properties are of the current generation. An expensive group
+        fetched fast for the control class last time is fetched as cheap.
+        """
+        groups = super(NativeObject, self).get_properties_groups()
+        schema_key = self._schema_key
+        return [(cheap or self.schemas.is_cheap(schema_key, index),
+                 self.__cached_getter(index, getter))
+                for index, (cheap, getter) in enumerate(groups)]
+
+    def __cached_getter(self, index, getter):
+        """Wrap the group getter by the properties cache."""
+        def get_cached():
+            entries = self.__properties_entries
+            if entries is None:
+                entries = self.__properties_entries = {}
+            entry = entries.get(index)
+            if not self.properties_cache.lookup(entry):
+                start = timeit.default_timer()
+                properties = getter()
+                self.schemas.record_properties(
+                    self._schema_key, index, properties,
+                    timeit.default_timer() - start)
+                entry = self.properties_cache.entry(properties)
+                entries[index] = entry
+            return dict(entry.value)
+        return get_cached
+
+    @property
+    def _schema_key(self):
+        """Key of the control class in the schemas."""
+        return self.__class__.__name__, self.control_class
+
+    def get_expected_properties(self):
+        """The property keys seen for the controls of the same class."""
+        return self.schemas.expected_keys(self._schema_key)
+
     @property
     def _actions(self):
         """
         Rreturn allowed actions for this object.
 
         [(id,action_name),...]
+        The actions are the methods of the pywinauto class, so the list is
+        computed once per the wrapper class and the pywinauto class.
+        A window specification is resolved to the control wrapper only if
+        the actions are not known yet, the window controls take them from
+        the schema of the window class.
         """
+        key = (self.__class__, self.pwa_obj.__class__)
+        if key in self.actions_tables:
+            return list(self.actions_tables[key])
+
+        schema_key = self._schema_key if self.control_class else None
+        pwa_class_name = self.pwa_obj.__class__.__name__
+        if schema_key is not None:
+            actions = self.schemas.actions(schema_key, pwa_class_name)
+            if actions is not None:
+                return [(ACTIONS_IDS[action], action) for action in actions
+                        if action in ACTIONS_IDS]
+
+        resolve = getattr(self.pwa_obj, 'WrapperObject', None)
+        if resolve is None:
+            target_class = self.pwa_obj.__class__
+        else:
+            try:
+                target_class = resolve().__class__
+            except Exception:
+                # not resolved, the specification methods are not kept
+                return self.__actions_of(self.pwa_obj.__class__)
+
+        key = (self.__class__, target_class)
+        if key not in self.actions_tables:
+            self.actions_tables[key] = self.__actions_of(target_class)
+        if schema_key is not None:
+            self.schemas.set_actions(schema_key, pwa_class_name, [
+                action for _id, action in self.actions_tables[key]])
+        return list(self.actions_tables[key])
+
+    @staticmethod
+    def __actions_of(target_class):
+        """Return the allowed actions of the pywinauto class, sorted."""
         allowed_actions = []
-        try:
-            obj_actions = dir(self.pwa_obj.WrapperObject())
-        except:
-            obj_actions = dir(self.pwa_obj)
+        obj_actions = dir(target_class)
         for _id, action in ACTIONS.items():
             if action in obj_actions:
                 allowed_actions.append((_id, action))
@@ -243,10 +842,39 @@ class NativeObject(SWAPYWrapper, CodeGenerator):
             parent = parent.parent
         return code_parents
 
+    @property
+    def access_name(self):
+        """
+        Return the best (the shortest) access name.
+
+        Memoized until the properties cache generation is bumped by
+        an action or a tree refresh, the code generator does not need all
+        the properties.
+        """
+        generation = self.properties_cache.generation
+        if self.__access_name is None or \
+                self.__access_name[0] != generation:
+            self.__access_name = (generation, self._access_names[0])
+        return self.__access_name[1]
+
+    @property
+    def control_class(self):
+        """
+        Return the control's window class.
+
+        Memoized, empty string if the control is not a window.
+        """
+        if self.__control_class is None:
+            try:
+                self.__control_class = intern_text(self.pwa_obj.Class())
+            except:
+                self.__control_class = ''
+        return self.__control_class
+
     @property
     def _code_self(self):
         """Default _code_self."""
-        access_name = self.get_properties()['Access names'][0]
+        access_name = self.access_name
 
         if check_valid_identifier(access_name):
             # A valid identifier
@@ -284,9 +912,9 @@ class NativeObject(SWAPYWrapper, CodeGenerator):
         """
         if self.__code_var_pattern is None:
             var_prefix = self.short_name
-            if 'Class' in self.get_properties():
+            if self.control_class:
                 crtl_class = filter(lambda c: c in string.ascii_letters,
-                                    self.get_properties()['Class']).lower()
+                                    self.control_class).lower()
                 if crtl_class:
                     var_prefix = crtl_class
 
@@ -307,6 +935,66 @@ class NativeObject(SWAPYWrapper, CodeGenerator):
             properties = {}  # workaround
         return properties
 
+    @property
+    def _cheap_properties(self):
+        """
+        Get the properties fetched by a call per property.
+
+        Like a handle, class, rectangle. Can be overridden by derived class
+        """
+        cheap_properties = {'pwa_type': str(type(self.pwa_obj))}
+        if self.control_class:
+            cheap_properties['Class'] = self.control_class
+        schema_key = self._schema_key
+        for name, getter in (('handle', lambda obj: str(obj.handle)),
+                             ('Rectangle', lambda obj: obj.Rectangle())):
+            if not self.schemas.is_applicable(schema_key, name):
+                continue  # failed for the controls of this class
+            try:
+                cheap_properties[name] = getter(self.pwa_obj)
+            except:
+                if not self.control_class or self._check_existence():
+                    # not because the window is closed
+                    self.schemas.record_failure(schema_key, name)
+        return cheap_properties
+
+    @property
+    def _properties_groups(self):
+        """
+        Cheap properties first, then the original and additional ones.
+
+        Pywinauto's GetProperties (fonts, texts, menu items...) and
+        the access names are expensive.
+        """
+        return [(True, lambda: self._cheap_properties),
+                (False, self.__applicable_group(
+                    'GetProperties', lambda: self._properties)),
+                (False, self.__applicable_group(
+                    'Additional properties',
+                    lambda: self._additional_properties))]
+
+    def __applicable_group(self, name, getter):
+        """
+        Wrap the group getter by the inapplicable check of the schemas.
+
+        The group is not fetched for a control class it failed for
+        repeatedly, an earlier failure is still raised.
+        """
+        def get_applicable():
+            schema_key = self._schema_key
+            if not self.schemas.is_applicable(schema_key, name):
+                return {}  # failed for the controls of this class
+            try:
+                properties = getter()
+            except Exception:
+                if not self.control_class or self._check_existence():
+                    # not because the window is closed
+                    self.schemas.record_failure(schema_key, name)
+                raise
+            self.schemas.record_success(schema_key, name)
+            return properties
+        return get_applicable
+
     @property
     def _additional_properties(self):
         """
@@ -317,10 +1005,7 @@ class NativeObject(SWAPYWrapper, CodeGenerator):
         additional_properties = {}
 
         # -----Access names
-        access_names = [
-            name for name, obj
-            in self.__get_uniq_names(target_control=self.pwa_obj)
-            ]
+        access_names = self._access_names
         if access_names:
             additional_properties.update({'Access names': access_names})
         # -----
@@ -337,6 +1022,14 @@ class NativeObject(SWAPYWrapper, CodeGenerator):
         # ---
         return additional_properties
 
+    @property
+    def _access_names(self):
+        """Return the control access names, the shortest first."""
+        uniq_names = self.__get_uniq_names()
+        if uniq_names is None:
+            return []
+        return uniq_names.names_of(self.pwa_obj.handle)
+
     @property
     def _children(self):
         """
@@ -344,15 +1037,37 @@ class NativeObject(SWAPYWrapper, CodeGenerator):
 
         [(control_text, swapy_obj),...]
         """
-        if self.pwa_obj.Parent() and isinstance(self.parent, Pwa_window):
-            # Hide children of the non top level window control.
-            # Expect all the children are accessible from the top level window.
+        if self._hide_children():
             return []
 
-        u_names = None
+        get_title = self._children_title_getter()
         children = []
-        children_controls = self.pwa_obj.Children()
-        for child_control in children_controls:
+        for row, child_control in self._filtered_children():
+            children.append((get_title(child_control), WrapperStub(
+                row, functools.partial(SWAPYWrapper, child_control, self),
+                self.liveness.exists)))
+
+        return children
+
+    def _hide_children(self):
+        """
+        Hide children of the non top level window control.
+
+        Expect all the children are accessible from the top level window.
+        """
+        return bool(self.pwa_obj.Parent()) and \
+            isinstance(self.parent, Pwa_window)
+
+    def _children_title_getter(self):
+        """
+        Return the function returning the title of a child control.
+
+        The unique names table is read once for all the children and only
+        if a child has no texts.
+        """
+        u_names = []
+
+        def get_title(child_control):
             try:
                 texts = child_control.Texts()
             except exceptions.WindowsError:
@@ -369,25 +1084,89 @@ class NativeObject(SWAPYWrapper, CodeGenerator):
                 texts = filter(bool, texts)  # filter out '' and None items
 
             if texts:  # check again after the filtering
-                title = ', '.join(texts)
-            else:
-                # .Texts() does not have a useful title, trying get it
-                # from the uniqnames
-                if u_names is None:
-                    # init unames list
-                    u_names = self.__get_uniq_names()
+                return ', '.join(texts)
 
-                child_uniq_name = [u_name for u_name, obj in u_names
-                                   if obj.WrapperObject() == child_control]
+            # .Texts() does not have a useful title, trying get it
+            # from the uniqnames
+            if not u_names:
+                # init unames table
+                u_names.append(self.__get_uniq_names())
 
-                if child_uniq_name:
-                    title = child_uniq_name[-1]
-                else:
-                    # uniqnames has no useful title
-                    title = 'Unknown control name1!'
-            children.append((title, SWAPYWrapper(child_control, self)))
+            child_uniq_name = []
+            if u_names[0] is not None:
+                child_uniq_name = u_names[0].names_of(child_control.handle)
 
-        return children
+            if child_uniq_name:
+                return child_uniq_name[-1]
+            # uniqnames has no useful title
+            return 'Unknown control name1!'
+
+        return get_title
+
+    def _get_subitems_deferred(self):
+        """The titles of the main children are deferred, not cached."""
+        if self.paged_subitems or \
+                type(self)._children is not NativeObject._children or \
+                self._hide_children():
+            # own children of a subclass
+            return super(NativeObject, self).get_subitems(), []
+
+        get_title = self._children_title_getter()
+
+        def resolve_title(handle):
+            return get_title(
+                pywinauto.controls.HwndWrapper.HwndWrapper(handle))
+
+        subitems = []
+        resolvers = []
+        for row in self._children_table():
+            # no pywinauto object until the title or the wrapper is asked
+            obj = WrapperStub(row,
+                              functools.partial(self._wrap_child, row.handle),
+                              self.liveness.exists)
+            subitems.append((placeholder_title(row.handle, row.class_name),
+                             obj))
+            resolvers.append((obj, functools.partial(resolve_title,
+                                                     row.handle)))
+        subitems += self._additional_children
+        subitems.sort(key=self._subitems_sort_key)
+        return subitems, resolvers
+
+    def _wrap_child(self, handle):
+        """Return the wrapper of the child window."""
+        return SWAPYWrapper(pywinauto.controls.HwndWrapper.HwndWrapper(handle),
+                            self)
+
+    def _children_table(self):
+        """
+        Return the attributes table of the children passed the filter.
+
+        The cheap attributes are read in one sweep and the filter is
+        applied to the table, the texts are read only for the children
+        passed the cheaper checks if the filter is by the title.
+        """
+        table = read_control_attributes(
+            pywinauto.handleprops.children(self.pwa_obj.handle))
+        if self.children_filter.active:
+            table = table.select(self.children_filter.apply(table.handles,
+                                                            table))
+        return table
+
+    def _filtered_children(self):
+        """
+        Return [(attributes, control),...] of the children passed the filter.
+
+        The handles are filtered before the controls are wrapped.
+        """
+        children_controls = []
+        for row in self._children_table():
+            try:
+                children_controls.append(
+                    (row, pywinauto.controls.HwndWrapper.HwndWrapper(
+                        row.handle)))
+            except pywinauto.controls.HwndWrapper.InvalidWindowHandle:
+                pass  # closed meanwhile
+        return children_controls
 
     @property
     def _additional_children(self):
@@ -399,6 +1178,20 @@ class NativeObject(SWAPYWrapper, CodeGenerator):
         """
         return []
 
+    @property
+    def _additional_children_count(self):
+        """
+        Number of the additional children.
+
+        Should be overridden along with _get_additional_children in
+        derived classes with a lot of items.
+        """
+        return len(self._additional_children)
+
+    def _get_additional_children(self, start, stop):
+        """Get the additional children [start, stop)."""
+        return self._additional_children[start:stop]
+
     @property
     def _subitems_sort_key(self):
         """
@@ -462,27 +1255,21 @@ class NativeObject(SWAPYWrapper, CodeGenerator):
         """
         try:
             handle_ = self.pwa_obj.handle
-            obj = pywinauto.application.WindowSpecification(
-                    {'handle': handle_})
         except:
             is_exist = False
         else:
-            is_exist = obj.Exists()
+            is_exist = self.liveness.exists(handle_)
         return is_exist
 
-    def __get_uniq_names(self, target_control=None):
+    def __get_uniq_names(self):
         """
-        Return uniq_names of the control.
+        Return uniq_names table of the control's top level window.
 
-        [(uniq_name, obj), ]
-        If target_control specified, apply additional
-        filtering for obj == target_control
+        The table is shared by all the controls of the window and updated
+        only for the added, removed or retitled controls. They are checked
+        once per a properties cache generation (an action or a refresh).
+        None if the control is not a window.
         """
-        # TODO: cache this method
-
-        # TODO: do not call .Application() everywhere.
-        pwa_app = pywinauto.application.Application()
-
         try:
             parent_obj = self.pwa_obj.TopLevelParent()
         except pywinauto.controls.HwndWrapper.InvalidWindowHandle:
@@ -492,35 +1279,32 @@ class NativeObject(SWAPYWrapper, CodeGenerator):
             # window handle
             parent_obj = self.pwa_obj
         except AttributeError:
-            return []
-
-        visible_controls = [pwa_app.window_(handle=ch) for ch in
-                            pywinauto.findwindows.find_windows(
-                                    parent=parent_obj.handle,
-                                    top_level_only=False)]
+            return None
 
-        uniq_names_obj = [
-            (uniq_name, obj) for uniq_name, obj
-            in pywinauto.findbestmatch.build_unique_dict(
-                    visible_controls).items()
-            if uniq_name != '' and
-            (not target_control or obj.WrapperObject() == target_control)
-            ]
-
-        # sort by name
-        return sorted(uniq_names_obj, key=lambda name_obj: len(name_obj[0]))
+        top_handle = parent_obj.handle
+        return self.uniq_names_tables.get_checked(
+            top_handle, self.properties_cache.generation,
+            lambda: pywinauto.findwindows.find_windows(parent=top_handle,
+                                                       top_level_only=False),
+            get_control_info, pywinauto.handleprops.text)
 
 
 class VirtualNativeObject(NativeObject):
     target_class = None
+    __slots__ = ('index',)
+
     def __init__(self, parent, index):
-        # TODO: maybe use super here?
-        self.parent = parent
+        super(VirtualNativeObject, self).__init__(self, parent)
         self.index = index
-        self._pwa_obj = self
-        self._check_visibility = self.parent._check_visibility
-        self._check_actionable = self.parent._check_actionable
-        self._check_existence = self.parent._check_existence
+
+    def _check_visibility(self):
+        return self.parent._check_visibility()
+
+    def _check_actionable(self):
+        return self.parent._check_actionable()
+
+    def _check_existence(self):
+        return self.parent._check_existence()
 
     code_action_pattern = "{parent_var}.{action}({index})"
 
@@ -577,6 +1361,15 @@ class PC_system(NativeObject):
 
     single_object = None
     inited = False
+    root_windows = RootWindowsEngine(pywinauto.findwindows.find_windows,
+                                     get_taskbar_handle,
+                                     pywinauto.handleprops.text,
+                                     get_window_texts,
+                                     ROOT_WINDOWS_ATTEMPTS,
+                                     ROOT_WINDOWS_FIRST_DELAY,
+                                     ROOT_WINDOWS_MAX_DELAY,
+                                     read_attributes=read_control_attributes)
+    __system_info = None  # static, cached
 
     def __new__(cls, *args, **kwargs):
         if cls.single_object is None:
@@ -608,49 +1401,100 @@ class PC_system(NativeObject):
         '''
         #windows--------------------
         windows = []
-        try_count = 3
-        app = pywinauto.application.Application()
-        for i in range(try_count):
-          try:
-            handles = pywinauto.findwindows.find_windows()
-          except exceptions.OverflowError: # workaround for OverflowError: array too large
-            time.sleep(1)
-          except exceptions.MemoryError:# workaround for MemoryError
-            time.sleep(1)
-          else:
-            break
-        else:
-          #TODO: add swapy exception: Could not get windows list
-          handles = []
-        #we have to find taskbar in windows list
-        warnings.filterwarnings("ignore", category=FutureWarning) #ignore future warning in taskbar module
-        from pywinauto import taskbar
-        taskbar_handle = taskbar.TaskBarHandle()
-        for w_handle in handles:
-            wind = app.window_(handle=w_handle)
-            if w_handle == taskbar_handle:
-                title = 'TaskBar'
-            else:
-                texts = wind.Texts()
-                texts = filter(bool, texts)  # filter out '' and None items
-                if not texts:
-                    title = 'Window#%s' % w_handle
-                else:
-                    title = ', '.join(texts)
-            windows.append((title, SWAPYWrapper(wind, self)))
-        windows.sort(key=lambda name: name[0].lower())
+        engine = self.root_windows
+        stubs, taskbar_handle = self._window_stubs()
+        with engine.phase('titles'):
+            for w_handle, wind in stubs:
+                windows.append((engine.resolve_title(w_handle, taskbar_handle),
+                                wind))
+        with engine.phase('sort'):
+            windows.sort(key=lambda name: name[0].lower())
         #-----------------------
         
         #smt new----------------
         #------------------------
         return windows
 
+    def _window_stubs(self):
+        """
+        Enumerate the top level windows, no titles resolved.
+
+        Return ([(handle, stub),...], taskbar handle).
+        """
+        engine = self.root_windows
+        handles, taskbar_handle = engine.enumerate(self._select_handles())
+        if ACCESS_NAMES_PROCESSES:
+            with engine.phase('access_names'):
+                self.prefetch_access_names(handles)
+        with engine.phase('wrap'):
+            stubs = [(w_handle, self._window_stub(w_handle))
+                     for w_handle in handles]
+        return stubs, taskbar_handle
+
+    def _wrap_window(self, handle):
+        """Return the wrapper of the top level window."""
+        app = pywinauto.application.Application()
+        return SWAPYWrapper(app.window_(handle=handle), self)
+
+    def _window_stub(self, handle):
+        """
+        Return the stub of the top level window.
+
+        The window wrapper asks the process of the window, it is made
+        only when the window is used.
+        """
+        return WrapperStub(self.root_windows.attributes.row(handle),
+                           functools.partial(self._wrap_window, handle),
+                           self.liveness.exists)
+
+    def _select_handles(self):
+        """Return the children filter of the handles, None if no filter."""
+        children_filter = self.children_filter
+        if not children_filter.active:
+            return None
+        # the attributes are read by the engine before the selection
+        engine = self.root_windows
+        return lambda handles: children_filter.apply(handles,
+                                                     engine.attributes)
+
+    def _get_subitems_deferred(self):
+        """The windows titles are deferred, not cached."""
+        engine = self.root_windows
+        stubs, taskbar_handle = self._window_stubs()
+        windows = []
+        resolvers = []
+        for w_handle, wind in stubs:
+            # no text is read before the windows are shown
+            windows.append((placeholder_title(w_handle, wind.class_name),
+                            wind))
+            resolvers.append((wind, functools.partial(
+                engine.resolve_title, w_handle, taskbar_handle)))
+        windows += self._additional_children
+        with engine.phase('sort'):
+            windows.sort(key=lambda name: name[0].lower())
+        return windows, resolvers
+
+    def prefetch_access_names(self, handles,
+                              processes=ACCESS_NAMES_PROCESSES):
+        """
+        Compute the access names of the top level windows at once.
+
+        The controls are inspected once, the names of the windows are
+        computed in a pool of the `processes` worker processes.
+        """
+        windows = {}
+        for handle in handles:
+            windows[handle] = pywinauto.findwindows.find_windows(
+                parent=handle, top_level_only=False)
+        self.uniq_names_tables.prefetch(windows, get_control_info, processes)
+
     @property
     def _properties(self):
-        info = {'Platform': platform.platform(),
-                'Processor': platform.processor(),
-                'PC name': platform.node()}
-        return info
+        if self.__system_info is None:
+            self.__system_info = {'Platform': platform.platform(),
+                                  'Processor': platform.processor(),
+                                  'PC name': platform.node()}
+        return dict(self.__system_info)
         
     @property
     def _actions(self):
@@ -679,16 +1523,20 @@ class Process(CodeGenerator):
     It will never be shown in the object browser. Used to hold 'app' counter
     independent of 'window' counters.
     """
-    processes = {}
+    # keyed by (pid, start time), a recycled pid is another process
+    processes = WrapperRegistry(WRAPPERS_REGISTRY_SIZE, process_info.is_alive,
+                                REGISTRY_SWEEP_INTERVAL)
     inited = False
     main_window = None
 
     def __new__(cls, parent, pid):
-        if pid in cls.processes:
-            return cls.processes[pid]
+        key = process_info.process_key(pid)
+        process = cls.processes.get(key)
+        if process is not None:
+            return process
         else:
             new_process = super(Process, cls).__new__(cls, parent, pid)
-            cls.processes[pid] = new_process
+            cls.processes[key] = new_process
             return new_process
 
     def __init__(self, parent, pid):
@@ -737,13 +1585,21 @@ class Pwa_window(NativeObject):
     code_self_close = "{parent_var}.Kill_()"
     short_name = 'window'
 
-    handles = {}
+    handles = WrapperRegistry(WRAPPERS_REGISTRY_SIZE,
+                              NativeObject.liveness.exists,
+                              REGISTRY_SWEEP_INTERVAL)
     inited = False
+    command_lines = CommandLineResolver(process_info)
+    menus = MenuStructures(get_menu_signature, get_menu, read_menu_item)
+    __access_name = None  # cached value and the window title it is for
+    __access_name_title = None
 
     def __new__(cls, pwa_obj, parent=None):
-        if pwa_obj.handle in cls.handles:
-            return cls.handles[pwa_obj.handle]
+        window = cls.handles.get(pwa_obj.handle)
+        if window is not None and window.pid == pwa_obj.ProcessID():
+            return window
         else:
+            # new or recycled handle
             new_window = super(Pwa_window, cls).__new__(cls, pwa_obj,
                                                         parent=None)
             cls.handles[pwa_obj.handle] = new_window
@@ -751,9 +1607,11 @@ class Pwa_window(NativeObject):
 
     def __init__(self, *args, **kwargs):
 
-        process = Process(args[1], args[0].ProcessID())
+        pid = args[0].ProcessID()
+        process = Process(args[1], pid)
         args = (args[0], process)
         if not self.inited:
+            self.pid = pid
             # Set default style
             self.code_self_style = self.__code_self_start
             self.code_close_style = self.__code_close_start
@@ -763,7 +1621,7 @@ class Pwa_window(NativeObject):
 
     def __code_self_connect(self):
         title = self.pwa_obj.WindowText().encode('unicode-escape')
-        cls_name = self.pwa_obj.Class()
+        cls_name = self.control_class
         code = "\n{parent_var} = Application().Connect(title=u'{title}', " \
                "class_name='{cls_name}')\n".format(title=title,
                                                    cls_name=cls_name,
@@ -771,14 +1629,10 @@ class Pwa_window(NativeObject):
         return code
 
     def __code_self_start(self):
-        target_pid = self.pwa_obj.ProcessID()
-        cmd_line = None
-        process_modules = pywinauto.application._process_get_modules_wmi()
-        for pid, name, process_cmdline in process_modules:
-            if pid == target_pid:
-                cmd_line = os.path.normpath(process_cmdline)
-                cmd_line = cmd_line.encode('unicode-escape')
-                break
+        cmd_line = self.command_lines.command_line(self.pwa_obj.ProcessID())
+        if cmd_line is not None:
+            cmd_line = os.path.normpath(cmd_line)
+            cmd_line = cmd_line.encode('unicode-escape')
         code = "\n{parent_var} = Application().Start(cmd_line=u'{cmd_line}')\n"\
             .format(cmd_line=cmd_line, parent_var="{parent_var}")
         return code
@@ -792,7 +1646,9 @@ class Pwa_window(NativeObject):
     @property
     def _code_self(self):
         code = ""
-        if not self._additional_properties['Access names']:
+        try:
+            self.access_name
+        except IndexError:
             raise NotImplementedError
         else:
             is_main_window = bool(self.parent.main_window is None or
@@ -831,9 +1687,9 @@ class Pwa_window(NativeObject):
         Add menu object as children
         '''
         additional_children = []
-        menu = self.pwa_obj.Menu()
-        if menu:
-            menu_child = [('!Menu', SWAPYWrapper(menu, self))]
+        structure = self.menus.get(self.pwa_obj.handle)
+        if structure:
+            menu_child = [('!Menu', SWAPYWrapper(structure.menu, self))]
             additional_children += menu_child
         return additional_children
 
@@ -844,12 +1700,8 @@ class Pwa_window(NativeObject):
         Can be overridden by derived class
         '''
         additional_properties = {}
-        pwa_app = pywinauto.application.Application()
         #-----Access names
-
-        access_names = [name for name in pywinauto.findbestmatch.build_unique_dict([self.pwa_obj]).keys() if name != '']
-        access_names.sort(key=len)
-        additional_properties.update({'Access names': access_names})
+        additional_properties.update({'Access names': self._access_names})
         #-----
 
         #-----pwa_type
@@ -864,6 +1716,29 @@ class Pwa_window(NativeObject):
         #---
         return additional_properties
 
+    @property
+    def access_name(self):
+        """
+        Return the best (the shortest) access name.
+
+        Memoized until the window title changes.
+        """
+        title = self.pwa_obj.WindowText()
+        if self.__access_name is None or self.__access_name_title != title:
+            self.__access_name = self._access_names[0]
+            self.__access_name_title = title
+        return self.__access_name
+
+    @property
+    def _access_names(self):
+        """Return the window access names, the shortest first."""
+        wrapper = self.pwa_obj.WrapperObject()
+        info = control_info(wrapper.handle, wrapper)
+        access_names = [name for name in build_unique_names([info]).keys()
+                        if name != '']
+        access_names.sort(key=len)
+        return access_names
+
     @property
     def _extended_actions(self):
 
@@ -909,6 +1784,9 @@ class Pwa_window(NativeObject):
 class Pwa_menu(NativeObject):
     target_class = pywinauto.controls.menuwrapper.Menu
     short_name = 'menu'
+    __slots__ = ()
+
+    menus = Pwa_window.menus
 
     def _check_visibility(self):
         is_visible = False
@@ -954,6 +1832,11 @@ class Pwa_menu(NativeObject):
         if not self.pwa_obj.accessible:
             return []
 
+        entries = self._menu_items()
+        if entries is not None:
+            return [(entry.label, SWAPYWrapper(entry.item, self))
+                    for entry in entries]
+
         additional_children = []
         menu_items = self.pwa_obj.Items()
         for menu_item in menu_items:
@@ -978,10 +1861,46 @@ class Pwa_menu(NativeObject):
     def _highlight_control(self):
         pass
 
+    def execute_action(self, action, *args, **kwargs):
+        """Execute action, the menu may be changed by the app."""
+        try:
+            return super(Pwa_menu, self).execute_action(
+                action, *args, **kwargs)
+        finally:
+            self._invalidate_menu()
+
+    def _invalidate_menu(self):
+        """
+        Drop the captured menu tree of the window.
+
+        The action may close the window, the error of the action is not
+        hidden by the closed window.
+        """
+        try:
+            window_handle = self.pwa_obj.ctrl.handle
+        except Exception:
+            window_handle = None  # the window is unknown, drop all
+        self.menus.invalidate(window_handle)
+
+    def _menu_structure(self):
+        """Return the captured menu tree of the window or None."""
+        try:
+            return self.menus.get(self.pwa_obj.ctrl.handle)
+        except:
+            return None
+
+    def _menu_items(self):
+        """Return the captured items of the menu or None."""
+        structure = self._menu_structure()
+        if structure is None:
+            return None
+        return structure.items(self.pwa_obj.handle)
+
 
 class Pwa_menu_item(Pwa_menu):
     target_class = pywinauto.controls.menuwrapper.MenuItem
     short_name = 'menu_item'
+    __slots__ = ()
 
     main_parent_type = Pwa_window
     code_self_pattern = "{var} = {main_parent_var}.MenuItem(u'{menu_path}')"
@@ -994,8 +1913,17 @@ class Pwa_menu_item(Pwa_menu):
             var="{var}")
         return code
 
+    @property
+    def _properties(self):
+        entry = self._menu_entry()
+        if entry is not None:
+            return entry.properties()
+        return super(Pwa_menu_item, self)._properties
+
     def _check_actionable(self):
-        if self.pwa_obj.State() == 3: #grayed
+        # the state is changed by the app, read live
+        state = self.pwa_obj.State()
+        if state == 3: #grayed
             is_actionable = False
         else:
             is_actionable = True
@@ -1011,16 +1939,43 @@ class Pwa_menu_item(Pwa_menu):
         #print self.get_menuitems_path()
         
         additional_children = []
-        submenu = self.pwa_obj.SubMenu()
+        structure = self._menu_structure()
+        entry = None
+        if structure is not None:
+            entry = self._menu_entry(structure)
+        if entry is not None:
+            # the submenu is opened when the item is expanded
+            submenu, text = structure.open(entry), entry.text
+        else:
+            submenu, text = self.pwa_obj.SubMenu(), self.pwa_obj.Text()
         if submenu:
-            submenu_child = [(self.pwa_obj.Text()+' submenu', SWAPYWrapper(submenu, self))]
+            submenu_child = [(text+' submenu', SWAPYWrapper(submenu, self))]
             additional_children += submenu_child
         return additional_children
 
+    def has_subitems(self):
+        """The captured item tells if it has a submenu, it is not opened."""
+        entry = self._menu_entry()
+        if entry is None:
+            return None
+        return entry.has_submenu
+
+    def _menu_entry(self, structure=None):
+        """Return the captured menu item or None."""
+        if structure is None:
+            structure = self._menu_structure()
+        if structure is None:
+            return None
+        return structure.entry(self.pwa_obj.menu.handle, self.pwa_obj.index)
+
     def get_menuitems_path(self):
         '''
         Compose menuitems_path for GetMenuPath. Example "#0 -> Save As", "Tools -> #0 -> Configure"
         '''
+        entry = self._menu_entry()
+        if entry is not None:
+            return entry.path
+
         path = []
         owner_item = self.pwa_obj
         
@@ -1034,88 +1989,155 @@ class Pwa_menu_item(Pwa_menu):
         return '->'.join(path[::-1])
 
 
-class Pwa_combobox(NativeObject):
-    target_class = pywinauto.controls.win32_controls.ComboBoxWrapper
-    short_name = 'combobox'
+class ItemsNativeObject(NativeObject):
 
-    @property
-    def _additional_children(self):
-        '''
-        Add ComboBox items as children
-        '''
-        additional_children = []
-        for i, text in enumerate(self.pwa_obj.ItemTexts()):
-            if not text:
-                text = "option #%s" % i
-                additional_children.append((text,
-                                            virtual_combobox_item(self, i)))
-            else:
-                additional_children.append((text,
-                                            virtual_combobox_item(self, text)))
-        return additional_children
+    """
+    Base wrapper for the controls with text items, combobox and listbox.
 
+    Keeps one item texts snapshot, the generation counter invalidates it
+    on a tree refresh or an action.
+    """
 
-class virtual_combobox_item(VirtualNativeObject):
+    target_class = None
+    paged_subitems = True
+    item_len_msg = None
+    item_get_msg = None
+    virtual_item_class = None
+    __items_snapshot = None
 
     @property
-    def _properties(self):
-        index = None
-        text = self.index
-        for i, name in enumerate(self.parent.pwa_obj.ItemTexts()):
-            if name == text:
-                index = i
-                break
-        return {'Index': index, 'Text': text}
+    def items_snapshot(self):
+        """Return the item texts snapshot."""
+        if self.__items_snapshot is None:
+            self.__items_snapshot = ItemsSnapshot(
+                self.__read_item_texts,
+                lambda: self._additional_children_count)
+        return self.__items_snapshot
 
+    def __read_item_texts(self, start, stop):
+        return get_item_texts(self.pwa_obj, start, stop,
+                              self.item_len_msg, self.item_get_msg)
 
-class Pwa_listbox(NativeObject):
-    target_class = pywinauto.controls.win32_controls.ListBoxWrapper
-    short_name = 'listbox'
+    def refresh_items(self):
+        """Invalidate the item texts snapshot."""
+        self.items_snapshot.refresh()
+
+    def get_item_text(self, index):
+        """Return the text of the item."""
+        return self.items_snapshot.text(index)
+
+    def get_item_index(self, text):
+        """Return the first index of the item text, None if not found."""
+        return self.items_snapshot.index(text)
+
+    def execute_action(self, action, *args, **kwargs):
+        """Execute action, the items may be changed."""
+        result = super(ItemsNativeObject, self).execute_action(
+            action, *args, **kwargs)
+        self.refresh_items()
+        return result
 
     @property
     def _additional_children(self):
+        return self._get_additional_children(0,
+                                             self._additional_children_count)
 
-        """
-        Add ListBox items as children
-        """
+    @property
+    def _additional_children_count(self):
+        return self.pwa_obj.ItemCount()
+
+    def _get_additional_children(self, start, stop):
+        if start == 0:
+            # the tree is refreshed
+            self.refresh_items()
+        texts = self.items_snapshot.read(start, stop)
 
         additional_children = []
-        for i, text in enumerate(self.pwa_obj.ItemTexts()):
+        for i, text in enumerate(texts, start):
             if not text:
                 text = "option #%s" % i
                 additional_children.append((text,
-                                            virtual_listbox_item(self, i)))
+                                            self.virtual_item_class(self, i)))
             else:
                 additional_children.append((text,
-                                            virtual_listbox_item(self, text)))
+                                            self.virtual_item_class(self, text)))
         return additional_children
 
 
-class virtual_listbox_item(VirtualNativeObject):
+class VirtualItemNativeObject(VirtualNativeObject):
+
+    """Item of a combobox or listbox."""
+
+    __slots__ = ()
+
+    def execute_action(self, action, *args, **kwargs):
+        """Execute action, the parent's items may be changed."""
+        result = super(VirtualItemNativeObject, self).execute_action(
+            action, *args, **kwargs)
+        self.parent.refresh_items()
+        return result
 
     @property
     def _properties(self):
-        index = None
-        text = self.index
-        for i, name in enumerate(self.parent.pwa_obj.ItemTexts()):
-            if name == text:
-                index = i
-                break
+        if isinstance(self.index, basestring):
+            text = self.index
+            index = self.parent.get_item_index(text)
+        else:
+            index = self.index
+            text = self.parent.get_item_text(index)
         return {'Index': index, 'Text': text}
 
 
+class virtual_combobox_item(VirtualItemNativeObject):
+    __slots__ = ()
+
+
+class Pwa_combobox(ItemsNativeObject):
+    target_class = pywinauto.controls.win32_controls.ComboBoxWrapper
+    short_name = 'combobox'
+    item_len_msg = pywinauto.win32defines.CB_GETLBTEXTLEN
+    item_get_msg = pywinauto.win32defines.CB_GETLBTEXT
+    virtual_item_class = virtual_combobox_item
+
+
+class virtual_listbox_item(VirtualItemNativeObject):
+    __slots__ = ()
+
+
+class Pwa_listbox(ItemsNativeObject):
+    target_class = pywinauto.controls.win32_controls.ListBoxWrapper
+    short_name = 'listbox'
+    item_len_msg = pywinauto.win32defines.LB_GETTEXTLEN
+    item_get_msg = pywinauto.win32defines.LB_GETTEXT
+    virtual_item_class = virtual_listbox_item
+
+
 class Pwa_listview(NativeObject):
     target_class = pywinauto.controls.common_controls.ListViewWrapper
     short_name = 'listview'
+    paged_subitems = True
 
     @property
     def _additional_children(self):
         '''
         Add SysListView32 items as children
         '''
+        return self._get_additional_children(0,
+                                             self._additional_children_count)
+
+    @property
+    def _additional_children_count(self):
+        '''
+        An item per a cell, like pywinauto's Items()
+        '''
+        return cells_count(self.pwa_obj.ItemCount(),
+                           self.pwa_obj.ColumnCount())
+
+    def _get_additional_children(self, start, stop):
         additional_children = []
-        for item in self.pwa_obj.Items():
-            text = item.Text()
+        for row, column in cells(start, stop, self.pwa_obj.ColumnCount()):
+            item = self.pwa_obj.GetItem(row, column)
+            text = intern_text(item.Text())
             if not text:
                 index = item.item_index
                 column_index = item.subitem_index
@@ -1129,6 +2151,7 @@ class listview_item(NativeObject):
     code_self_patt_text = "{var} = {parent_var}.GetItem({text})"
     code_self_patt_index = "{var} = {parent_var}.GetItem({index}, {col_index})"
     short_name = 'listview_item'
+    __slots__ = ()
 
     @property
     def _code_self(self):
@@ -1201,6 +2224,7 @@ class Pwa_tab(NativeObject):
 
 
 class virtual_tab_item(VirtualNativeObject):
+    __slots__ = ()
 
     @property
     def _code_action(self):
@@ -1223,6 +2247,7 @@ class virtual_tab_item(VirtualNativeObject):
 class Pwa_toolbar(NativeObject):
     target_class = pywinauto.controls.common_controls.ToolbarWrapper
     short_name = 'toolbar'
+    button_tables = ToolbarTables(read_toolbar_buttons)
 
     @property
     def _additional_children(self):
@@ -1230,20 +2255,15 @@ class Pwa_toolbar(NativeObject):
         Add button objects as children
         '''
         additional_children = []
-        buttons_count = self.pwa_obj.ButtonCount()
-        for button_index in range(buttons_count):
-            try:
-                button = self.pwa_obj.Button(button_index)
-                button_text = button.info.text
-                if not button_text:
-                    button_text = "button #%s" % button_index
-                button_object = SWAPYWrapper(button, self)
-            except exceptions.RuntimeError:
-                #button_text = ['Unknown button name1!'] #workaround for RuntimeError: GetButtonInfo failed for button with index 0
-                pass #ignore the button
-            else:
-                button_item = [(button_text, button_object)]
-                additional_children += button_item
+        # the buttons failed to read are ignored
+        for row in self.button_tables.sweep(self.pwa_obj):
+            button_text = row.text
+            if not button_text:
+                button_text = "button #%s" % row.index
+            button_object = SWAPYWrapper(
+                make_toolbar_button(self.pwa_obj, row), self)
+            button_item = [(button_text, button_object)]
+            additional_children += button_item
         return additional_children
 
     @property
@@ -1259,6 +2279,7 @@ class Pwa_toolbar_button(NativeObject):
     target_class = pywinauto.controls.common_controls._toolbar_button
     code_self_pattern = "{var} = {parent_var}.Button({index})"
     short_name = 'toolbar_button'
+    __slots__ = ()
 
     @property
     def _code_self(self):
@@ -1299,19 +2320,32 @@ class Pwa_toolbar_button(NativeObject):
     def _check_existence(self):
         try:
             handle_ = self.pwa_obj.toolbar_ctrl.handle
-            obj = pywinauto.application.WindowSpecification({'handle': handle_})
         except:
             is_exist = False
         else:
-            is_exist = obj.Exists()
+            is_exist = self.liveness.exists(handle_)
         return is_exist
 
     @property
     def _children(self):
         return []
 
+    def execute_action(self, action, *args, **kwargs):
+        """Execute action, the buttons states may be changed."""
+        try:
+            return super(Pwa_toolbar_button, self).execute_action(
+                action, *args, **kwargs)
+        finally:
+            Pwa_toolbar.button_tables.invalidate(
+                self.pwa_obj.toolbar_ctrl.handle)
+
     @property
     def _properties(self):
+        row = Pwa_toolbar.button_tables.row(self.pwa_obj.toolbar_ctrl,
+                                            self.pwa_obj.index)
+        if row is not None:
+            return button_properties(row)
+
         o = self.pwa_obj
         props = {'IsCheckable': o.IsCheckable(),
                  'IsChecked': o.IsChecked(),
@@ -1329,35 +2363,114 @@ class Pwa_toolbar_button(NativeObject):
         pass
 
         
-class Pwa_tree(NativeObject):
-    target_class = pywinauto.controls.common_controls.TreeViewWrapper
-    short_name = 'tree'
+class TreeItemsNativeObject(NativeObject):
+
+    """
+    Base wrapper for a tree view and its items, children are tree items.
+
+    Only the expanded level is read, as the handles of the items, the
+    wrappers are made for the requested page only.
+    """
+
+    target_class = None
+    paged_subitems = True
+    levels = TreeLevels(get_tree_first_child, get_tree_next_sibling)
+    __slots__ = ()
+
+    @abstractproperty
+    def _tree_ctrl(self):
+        """Pywinauto's TreeViewWrapper."""
+        pass
+
+    @abstractproperty
+    def _tree_item_handle(self):
+        """Handle of the item whose children are shown, None for roots."""
+        pass
+
+    def get_subitems_page(self, start, stop):
+        """Read the level again if the first page is requested."""
+        if start == 0:
+            # the tree is refreshed
+            self.levels.invalidate(self._tree_ctrl.handle,
+                                   self._tree_item_handle)
+        return super(TreeItemsNativeObject, self).get_subitems_page(start,
+                                                                    stop)
+
+    def has_subitems(self):
+        """The first child is probed, the level is not read."""
+        return self.levels.has_children(self._tree_ctrl,
+                                        self._tree_item_handle)
 
     @property
     def _additional_children(self):
-        '''
-        Add roots object as children
-        '''
-        
+        return self._get_additional_children(0,
+                                             self._additional_children_count)
+
+    @property
+    def _additional_children_count(self):
+        return self.levels.count(self._tree_ctrl, self._tree_item_handle)
+
+    def _get_additional_children(self, start, stop):
         additional_children = []
-        roots = self.pwa_obj.Roots()
-        for root in roots:
-            root_text = root.Text()
-            obj = SWAPYWrapper(root, self)
-            obj.path = [root_text]
-            root_item = [(root_text, obj)]
-            additional_children += root_item
+        tree_ctrl = self._tree_ctrl
+        handles = self.levels.page(tree_ctrl, self._tree_item_handle,
+                                   start, stop)
+        for handle in handles:
+            item = pywinauto.controls.common_controls._treeview_element(
+                handle, tree_ctrl)
+            obj = SWAPYWrapper(item, self)
+            additional_children += [(obj.text, obj)]
         return additional_children
 
+
+class Pwa_tree(TreeItemsNativeObject):
+    target_class = pywinauto.controls.common_controls.TreeViewWrapper
+    short_name = 'tree'
+
+    @property
+    def _tree_ctrl(self):
+        return self.pwa_obj
+
+    @property
+    def _tree_item_handle(self):
+        return None
+
     def _highlight_control(self):
         pass
 
 
-class Pwa_tree_item(NativeObject):
+class Pwa_tree_item(TreeItemsNativeObject):
     target_class = pywinauto.controls.common_controls._treeview_element
     main_parent_type = Pwa_tree
     code_self_pattern = "{var} = {main_parent_var}.GetItem({path})"
     short_name = 'tree_item'
+    __slots__ = ('__text',)
+
+    def __init__(self, pwa_obj, parent=None):
+        super(Pwa_tree_item, self).__init__(pwa_obj, parent)
+        self.__text = None
+
+    @property
+    def text(self):
+        """Item text, interned."""
+        if self.__text is None:
+            self.__text = intern_text(self.pwa_obj.Text())
+        return self.__text
+
+    @property
+    def path(self):
+        """
+        Texts of the items from the root down to the item.
+
+        Composed by the parent pointers, not stored per item.
+        """
+        path = []
+        item = self
+        while isinstance(item, Pwa_tree_item):
+            path.append(item.text)
+            item = item.parent
+        path.reverse()
+        return path
 
     @property
     def _code_self(self):
@@ -1401,17 +2514,17 @@ class Pwa_tree_item(NativeObject):
         pass
 
     @property
-    def _additional_children(self):
-        '''
-        Add sub tree items object as children
-        '''
-        
-        additional_children = []
-        sub_items = self.pwa_obj.Children()
-        for item in sub_items:
-            item_text = item.Text()
-            obj = SWAPYWrapper(item, self)
-            obj.path = self.path + [item_text]
-            sub_item = [(item_text, obj)]
-            additional_children += sub_item
-        return additional_children
+    def _tree_ctrl(self):
+        return self.pwa_obj.tree_ctrl
+
+    @property
+    def _tree_item_handle(self):
+        return self.pwa_obj.elem
+
+    def execute_action(self, action, *args, **kwargs):
+        """Execute action, the items may be inserted on the expanding."""
+        try:
+            return super(Pwa_tree_item, self).execute_action(
+                action, *args, **kwargs)
+        finally:
+            self.levels.invalidate(self.pwa_obj.tree_ctrl.handle)
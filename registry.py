@@ -0,0 +1,137 @@
+# Registries of the wrappers.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+"""
+Registries of the wrappers.
+
+A registry keeps the recently used wrappers and the wrappers still
+referenced from elsewhere (e.g. by the object browser), the rest are
+collected. The entries of the dead handles are swept periodically.
+"""
+
+from collections import OrderedDict
+import threading
+import time
+import weakref
+
+
+class WrapperRegistry(object):
+    """
+    Bounded registry of the wrappers.
+
+    The last `capacity` used wrappers are held strongly, the older ones
+    are held by weak references only. Every `sweep_interval` seconds the
+    entries whose key is not alive by `is_alive(key)` are dropped.
+    """
+
+    def __init__(self, capacity, is_alive=None, sweep_interval=30,
+                 clock=time.time):
+        """Init empty registry."""
+        self.capacity = capacity
+        self.is_alive = is_alive
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        self.lock = threading.RLock()
+        self.evictions = 0  # moved from the LRU to the weak references
+        self.swept = 0  # dropped as dead
+        self._recent = OrderedDict()
+        self._weak = weakref.WeakValueDictionary()
+        self._last_sweep = clock()
+
+    def __len__(self):
+        with self.lock:
+            return len(self._recent) + len(self._weak)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        with self.lock:
+            self._weak.pop(key, None)
+            self._recent.pop(key, None)
+            self._recent[key] = value
+            self._trim()
+        self.maybe_sweep()
+
+    def get(self, key, default=None):
+        """Return the wrapper and mark it as recently used."""
+        with self.lock:
+            value = self._recent.pop(key, None)
+            if value is None:
+                value = self._weak.pop(key, None)
+                if value is None:
+                    return default
+            self._recent[key] = value
+            self._trim()
+            return value
+
+    def _trim(self):
+        """Move the least recently used wrappers to the weak references."""
+        while len(self._recent) > self.capacity:
+            old_key, old_value = self._recent.popitem(last=False)
+            self._weak[old_key] = old_value
+            self.evictions += 1
+
+    def pop(self, key, default=None):
+        """Remove the wrapper from the registry."""
+        with self.lock:
+            value = self._recent.pop(key, None)
+            if value is None:
+                value = self._weak.pop(key, default)
+            return value
+
+    def stats(self):
+        """Return the counters as a dict."""
+        with self.lock:
+            return {'size': len(self),
+                    'recent': len(self._recent),
+                    'evictions': self.evictions,
+                    'swept': self.swept}
+
+    def maybe_sweep(self):
+        """Sweep if the sweep interval has passed."""
+        if self.is_alive is None:
+            return
+        if self.clock() - self._last_sweep >= self.sweep_interval:
+            self.sweep()
+
+    def sweep(self):
+        """Drop the entries whose key is not alive."""
+        with self.lock:
+            self._last_sweep = self.clock()
+            keys = list(self._recent.keys()) + list(self._weak.keys())
+        dead = []
+        for key in keys:
+            try:
+                if not self.is_alive(key):
+                    dead.append(key)
+            except Exception:
+                dead.append(key)
+        with self.lock:
+            for key in dead:
+                if self.pop(key) is not None:
+                    self.swept += 1
+        return len(dead)
@@ -0,0 +1,169 @@
+# Top level windows of the desktop.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+"""
+Top level windows of the desktop.
+
+Enumerates the top level windows and resolves their titles for the root
+of the object browser, the most frequent refresh.
+"""
+
+from contextlib import contextmanager
+import time
+
+
+class RootWindowsEngine(object):
+    """
+    Enumeration of the top level windows.
+
+    `find_windows` returns the top level handles, it may fail with
+    OverflowError or MemoryError while the windows are changing, then it
+    is retried with a bounded exponential backoff. The taskbar handle
+    from `get_taskbar_handle` is cached while the taskbar is listed.
+    `get_text` returns the window text, `get_texts` all the texts of
+    a window, it is asked only for the windows without a text.
+    `read_attributes(handles)` reads the attributes of the windows in one
+    sweep into a table (see attributes.py), the last table is in
+    `attributes`, the texts are read through it once.
+    The duration of each phase of the last refresh is in `timings`.
+    """
+
+    def __init__(self, find_windows, get_taskbar_handle, get_text,
+                 get_texts, attempts=5, first_delay=0.05, max_delay=1.0,
+                 sleep=time.sleep, clock=time.time, read_attributes=None):
+        """Init with no taskbar handle cached."""
+        self.find_windows = find_windows
+        self.get_taskbar_handle = get_taskbar_handle
+        self.get_text = get_text
+        self.get_texts = get_texts
+        self.attempts = attempts
+        self.first_delay = first_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.clock = clock
+        self.read_attributes = read_attributes
+        self.timings = {}
+        self.attributes = None
+        self._taskbar_handle = None
+
+    @contextmanager
+    def phase(self, name):
+        """Measure the phase duration into `timings`."""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.clock() - start
+
+    def handles(self):
+        """Return the top level handles, empty list if it fails."""
+        delay = self.first_delay
+        for attempt in range(self.attempts):
+            try:
+                return self.find_windows()
+            except (OverflowError, MemoryError):
+                # workaround for OverflowError: array too large
+                # and MemoryError
+                if attempt < self.attempts - 1:
+                    self.sleep(delay)
+                    delay = min(delay * 2, self.max_delay)
+        # TODO: add swapy exception: Could not get windows list
+        return []
+
+    def taskbar_handle(self, handles):
+        """Return the taskbar handle, resolved again if it is not listed."""
+        if self._taskbar_handle is None or \
+                self._taskbar_handle not in handles:
+            try:
+                self._taskbar_handle = self.get_taskbar_handle()
+            except Exception:
+                self._taskbar_handle = None
+        return self._taskbar_handle
+
+    def text(self, handle):
+        """Return the window text, through the attributes table if read."""
+        attributes = self.attributes
+        if attributes is not None and attributes.row(handle) is not None:
+            return attributes.text(handle)
+        return self.get_text(handle)
+
+    def title(self, handle):
+        """Return the window title."""
+        try:
+            text = self.text(handle)
+        except Exception:
+            text = None
+        if text:
+            return text
+
+        try:
+            texts = [text for text in self.get_texts(handle) if text]
+        except Exception:
+            texts = []
+        if not texts:
+            return 'Window#%s' % handle
+        return ', '.join(texts)
+
+    def enumerate(self, select=None):
+        """
+        Enumerate the top level windows, no titles resolved.
+
+        `select(handles)` returns the handles to keep, the attributes of
+        the windows are read by then.
+        Return (handles, taskbar handle).
+        """
+        self.timings = {}
+        with self.phase('enumerate'):
+            handles = self.handles()
+
+        if self.read_attributes is not None:
+            with self.phase('attributes'):
+                self.attributes = self.read_attributes(handles)
+                handles = self.attributes.handles  # closed ones are skipped
+
+        if select is not None:
+            with self.phase('filter'):
+                handles = select(handles)
+
+        with self.phase('taskbar'):
+            taskbar_handle = self.taskbar_handle(handles)
+        return handles, taskbar_handle
+
+    def resolve_title(self, handle, taskbar_handle):
+        """Return the window title, may be slow for a hung window."""
+        if handle == taskbar_handle:
+            return 'TaskBar'
+        return self.title(handle)
+
+    def refresh(self, select=None):
+        """
+        Enumerate the top level windows.
+
+        `select(handles)` returns the handles to keep, it is applied
+        before the titles are resolved.
+        Return (handles, {handle: title}).
+        """
+        handles, taskbar_handle = self.enumerate(select)
+
+        with self.phase('titles'):
+            titles = {}
+            for handle in handles:
+                titles[handle] = self.resolve_title(handle, taskbar_handle)
+        return handles, titles
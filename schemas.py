@@ -0,0 +1,222 @@
+# Schemas of the control classes.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+"""
+Schemas of the control classes.
+
+The controls of the same wrapper class and window class have the same
+property keys, actions and inapplicable properties. A schema records
+them once per (wrapper class, window class) and is saved between the
+sessions. The file saved by another pywinauto or another set of
+actions is discarded.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+
+class ControlSchema(object):
+    """
+    What is known about the controls of a class.
+
+    `keys` - the property keys seen, `costs` - the seconds the last fetch
+    of a properties group took by the group index,
+    `inapplicable` - the properties failed to be fetched repeatedly,
+    `actions` - the available actions names by the pywinauto class name.
+    """
+
+    def __init__(self, keys=(), costs=None, inapplicable=(), actions=None):
+        self.keys = set(keys)
+        self.costs = dict(costs or {})
+        self.inapplicable = set(inapplicable)
+        self.actions = dict(actions or {})
+
+    def to_dict(self):
+        return {'keys': sorted(self.keys),
+                'costs': self.costs,
+                'inapplicable': sorted(self.inapplicable),
+                'actions': self.actions}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get('keys', ()), data.get('costs'),
+                   data.get('inapplicable', ()), data.get('actions'))
+
+
+def schema_version(library_version, actions):
+    """
+    Return the version of the schemas.
+
+    The pywinauto version and a digest of the actions names, the actions
+    saved for a class are valid for them only.
+    """
+    digest = hashlib.md5(repr(sorted(actions)).encode('utf-8')).hexdigest()
+    return '{0}-{1}'.format(library_version, digest[:12])
+
+
+class SchemaCache(object):
+    """
+    Schemas by (wrapper class name, window class name).
+
+    The names, not the classes, are the keys so the schemas may be saved
+    to a JSON file and loaded in the next session. A property is marked
+    inapplicable after `failures_limit` failures in a row, a transient
+    failure does not hide it. A group fetched faster than `cheap_limit`
+    seconds last time is cheap for the class. A file of another `version`
+    is not loaded.
+    """
+
+    separator = '|'
+
+    def __init__(self, failures_limit=3, cheap_limit=0.05, version=None):
+        """Init with no schemas."""
+        self.failures_limit = failures_limit
+        self.cheap_limit = cheap_limit
+        self.version = version
+        self.lock = threading.RLock()
+        self.schemas = {}  # (wrapper class name, window class) -> schema
+        self.failures = {}  # (key, property name) -> failures in a row
+        self.changed = False
+
+    def get(self, key):
+        """Return the schema, a new one if the class is not known."""
+        with self.lock:
+            schema = self.schemas.get(key)
+            if schema is None:
+                schema = self.schemas[key] = ControlSchema()
+            return schema
+
+    def record_properties(self, key, group, properties, duration):
+        """Record the properties of the group and the fetch duration."""
+        with self.lock:
+            schema = self.get(key)
+            new_keys = set(properties) - schema.keys
+            if new_keys:
+                schema.keys.update(new_keys)
+                self.changed = True
+            schema.costs[str(group)] = duration
+            for name in properties:
+                self.record_success(key, name)
+
+    def is_cheap(self, key, group):
+        """True if the group was fetched fast for the class last time."""
+        with self.lock:
+            schema = self.schemas.get(key)
+            if schema is None:
+                return False
+            cost = schema.costs.get(str(group))
+            return cost is not None and cost < self.cheap_limit
+
+    def is_applicable(self, key, name):
+        """False if the property failed to be fetched for the class."""
+        with self.lock:
+            schema = self.schemas.get(key)
+            return schema is None or name not in schema.inapplicable
+
+    def record_failure(self, key, name):
+        """
+        Record the property failed to be fetched for the class.
+
+        Returns True if the property is marked inapplicable, it is not
+        fetched for the class any more.
+        """
+        with self.lock:
+            failures = self.failures.get((key, name), 0) + 1
+            if failures < self.failures_limit:
+                self.failures[(key, name)] = failures
+                return False
+            self.failures.pop((key, name), None)
+            self.get(key).inapplicable.add(name)
+            self.changed = True
+            return True
+
+    def record_success(self, key, name):
+        """Record the property fetched, the failures in a row reset."""
+        with self.lock:
+            self.failures.pop((key, name), None)
+
+    def actions(self, key, pwa_class_name):
+        """
+        Return the actions names of the class or None if not known.
+
+        The controls of a window class may be wrapped by different
+        pywinauto classes, like a top level window, so the actions are
+        by the pywinauto class name too.
+        """
+        with self.lock:
+            schema = self.schemas.get(key)
+            if schema is None or pwa_class_name not in schema.actions:
+                return None
+            return list(schema.actions[pwa_class_name])
+
+    def set_actions(self, key, pwa_class_name, actions):
+        """Record the actions names of the class."""
+        with self.lock:
+            self.get(key).actions[pwa_class_name] = list(actions)
+            self.changed = True
+
+    def expected_keys(self, key):
+        """Return the property keys seen for the class, sorted."""
+        with self.lock:
+            schema = self.schemas.get(key)
+            if schema is None:
+                return []
+            return sorted(schema.keys)
+
+    def load(self, path):
+        """
+        Load the schemas saved.
+
+        Ignore a missed or broken file, or a file of another version.
+        """
+        try:
+            with open(path) as schemas_file:
+                data = json.load(schemas_file)
+        except (IOError, ValueError):
+            return False
+        if not isinstance(data, dict) or \
+                data.get('version') != self.version:
+            return False  # saved for another pywinauto or actions
+
+        with self.lock:
+            for key, schema_data in data.get('schemas', {}).items():
+                wrapper_name, _, class_name = key.partition(self.separator)
+                self.schemas[(wrapper_name, class_name)] = \
+                    ControlSchema.from_dict(schema_data)
+            self.changed = False
+        return True
+
+    def save(self, path):
+        """Save the schemas if changed."""
+        with self.lock:
+            if not self.changed:
+                return False
+            schemas = dict((self.separator.join(key), schema.to_dict())
+                           for key, schema in self.schemas.items())
+            data = {'version': self.version, 'schemas': schemas}
+            self.changed = False
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(path, 'w') as schemas_file:
+            json.dump(data, schemas_file, indent=1, sort_keys=True)
+        return True
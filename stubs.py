@@ -0,0 +1,103 @@
+# Lazy wrappers of the children windows.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+"""
+Lazy wrappers of the children windows.
+
+A child window is listed in the object browser by a stub with the
+attributes read in the sweep (the handle, the class name, the states).
+The full wrapper - its type resolved, the pywinauto object and for a top
+level window the process created - is made on the first use of the stub,
+i.e. when the child is selected, expanded or its code is generated.
+"""
+
+import threading
+
+
+class WrapperStub(object):
+    """
+    Handle only stand-in of a wrapper.
+
+    `row` is the ControlAttributes of the window read with the listing.
+    `make()` returns the full wrapper, any attribute not of the stub is
+    taken from it. `exists(handle)` tells the existence of the window
+    without making the wrapper.
+    """
+
+    __slots__ = ('row', '_make', '_exists', '_wrapper')
+
+    lock = threading.Lock()  # one wrapper per stub
+    materialized = 0  # count of the wrappers made
+
+    def __init__(self, row, make, exists=None):
+        """Init not materialized."""
+        self.row = row
+        self._make = make
+        self._exists = exists
+        self._wrapper = None
+
+    def __getattr__(self, name):
+        if name in WrapperStub.__slots__:
+            raise AttributeError(name)  # not inited yet
+        return getattr(self.materialize(), name)
+
+    def __repr__(self):
+        return '<%s %s 0x%x%s>' % (type(self).__name__, self.class_name,
+                                   self.handle,
+                                   '' if self._wrapper is None else ' *')
+
+    @property
+    def handle(self):
+        return self.row.handle
+
+    @property
+    def class_name(self):
+        return self.row.class_name
+
+    @property
+    def is_materialized(self):
+        return self._wrapper is not None
+
+    def materialize(self):
+        """Return the full wrapper, make it on the first call."""
+        wrapper = self._wrapper
+        if wrapper is not None:
+            return wrapper
+        with WrapperStub.lock:
+            if self._wrapper is None:
+                self._wrapper = self._make()
+                self._make = None
+                WrapperStub.materialized += 1
+            return self._wrapper
+
+    def has_subitems(self):
+        """Not known without the wrapper."""
+        if self._wrapper is not None:
+            return self._wrapper.has_subitems()
+        return None
+
+    def _check_existence(self):
+        """Check the window exists, the wrapper is not made."""
+        if self._wrapper is not None or self._exists is None:
+            return self.materialize()._check_existence()
+        try:
+            return bool(self._exists(self.handle))
+        except Exception:
+            return False
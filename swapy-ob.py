@@ -20,6 +20,7 @@
 
 #Boa:App:BoaApp
 
+import multiprocessing
 import sys
 import traceback
 import wx
@@ -60,4 +61,6 @@ def main():
 
 
 if __name__ == '__main__':
+    # The access names may be computed in a pool of processes
+    multiprocessing.freeze_support()
     main()
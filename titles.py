@@ -0,0 +1,117 @@
+# Deferred titles of the children.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+"""
+Deferred titles of the children.
+
+The children are shown at once with the placeholder titles, the real
+titles are resolved in a pool of threads and the shown children are
+moved to their sorted positions one by one as the titles arrive.
+"""
+
+import bisect
+
+
+def placeholder_title(handle, class_name):
+    """Cheap title of a window until the real one is resolved."""
+    return u'<%s 0x%x>' % (class_name, handle)
+
+
+def resolve_title(resolver):
+    """
+    Resolve one title, return (item, title, error).
+
+    `resolver` is (item, resolve_title), `resolve_title()` returns the
+    title. The error is the exception failed the resolution or None.
+    """
+    item, resolve = resolver
+    try:
+        return item, resolve(), None
+    except Exception as error:
+        return item, None, error
+
+
+def resolve_titles(pool, resolvers, callback):
+    """
+    Resolve the titles in the pool of threads, do not wait.
+
+    `resolvers` is [(item, resolve_title),...]. `callback((item, title,
+    error))` is called in a thread of the pool as each title arrives,
+    a slow title does not hold the others.
+    """
+    for resolver in resolvers:
+        pool.apply_async(resolve_title, (resolver,), callback=callback)
+
+
+class TitleOrder(object):
+    """
+    Sorted positions of the shown children.
+
+    Initialized by the shown [(title, item),...] in the shown order,
+    tells where to move an item when its title is changed. The positions
+    are kept by id(item), a move renumbers the items between the old and
+    the new position only.
+    """
+
+    def __init__(self, subitems, key=lambda title: title.lower()):
+        """Init by the shown children."""
+        self.key = key
+        self.keys = [key(title) for title, item in subitems]
+        self.items = [item for title, item in subitems]
+        self.positions = {}  # id(item) -> index
+        self._renumber(0, len(self.items))
+
+    def __len__(self):
+        return len(self.items)
+
+    def _renumber(self, start, stop):
+        """Record the positions of the items[start:stop]."""
+        positions = self.positions
+        items = self.items
+        for index in range(start, stop):
+            positions[id(items[index])] = index
+
+    def index(self, item):
+        """Return the position of the item."""
+        index = self.positions.get(id(item))
+        if index is None or self.items[index] is not item:
+            raise ValueError('%r is not shown' % (item,))
+        return index
+
+    def update(self, item, title, move=True):
+        """
+        Set the new title of the item, return (old index, new index).
+
+        If not `move` the item keeps its position.
+        """
+        old_index = self.index(item)
+        key = self.key(title)
+        if not move:
+            self.keys[old_index] = key
+            return old_index, old_index
+
+        del self.keys[old_index]
+        del self.items[old_index]
+        new_index = bisect.bisect_right(self.keys, key)
+        self.keys.insert(new_index, key)
+        self.items.insert(new_index, item)
+        self._renumber(min(old_index, new_index),
+                       max(old_index, new_index) + 1)
+        return old_index, new_index
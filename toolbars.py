@@ -0,0 +1,106 @@
+# Toolbar buttons tables.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+"""
+Toolbar buttons tables.
+
+All the buttons of a toolbar are read in one sweep into a table, the
+button wrappers and their properties are served from the table.
+"""
+
+from collections import namedtuple
+import threading
+
+
+TBSTATE_CHECKED = 0x01
+TBSTATE_PRESSED = 0x02
+TBSTATE_ENABLED = 0x04
+TBSTYLE_BUTTON = 0x00
+TBSTYLE_CHECK = 0x02
+
+# The fields are named like TBBUTTONINFOW ones, so a row may be used as
+# pywinauto's _toolbar_button.info
+ToolbarButtonInfo = namedtuple('ToolbarButtonInfo', ['index', 'idCommand',
+                                                     'text', 'fsState',
+                                                     'fsStyle', 'rect'])
+
+
+def _has_style(row, style):
+    """Mirror of _toolbar_button.HasStyle."""
+    return row.fsStyle & style == style
+
+
+def button_properties(row):
+    """Same properties as pywinauto's _toolbar_button methods give."""
+    return {'IsCheckable': _has_style(row, TBSTYLE_CHECK),
+            'IsChecked': row.fsState & TBSTATE_CHECKED == TBSTATE_CHECKED,
+            'IsEnabled': bool(row.idCommand) and
+                         row.fsState & TBSTATE_ENABLED == TBSTATE_ENABLED,
+            'IsPressable': _has_style(row, TBSTYLE_BUTTON),
+            'IsPressed': row.fsState & TBSTATE_PRESSED == TBSTATE_PRESSED,
+            'Rectangle': row.rect,
+            'State': row.fsState,
+            'Style': row.fsStyle,
+            'index': row.index,
+            'text': row.text}
+
+
+class ToolbarTables(object):
+    """
+    Buttons tables of the toolbars.
+
+    `read_buttons(toolbar)` reads all the buttons of the toolbar,
+    returns [ToolbarButtonInfo, ...]. The table is read again on the next
+    expansion of the toolbar or after it is invalidated.
+    """
+
+    def __init__(self, read_buttons):
+        """Init with no tables."""
+        self.read_buttons = read_buttons
+        self.lock = threading.RLock()
+        self.tables = {}  # toolbar handle -> {index: ToolbarButtonInfo}
+        self.sweeps = 0
+
+    def sweep(self, toolbar):
+        """Read all the buttons of the toolbar, return the rows."""
+        rows = self.read_buttons(toolbar)
+        with self.lock:
+            self.tables[toolbar.handle] = dict((row.index, row)
+                                               for row in rows)
+            self.sweeps += 1
+        return rows
+
+    def row(self, toolbar, index):
+        """Return the button row, sweep the toolbar if not read yet."""
+        with self.lock:
+            table = self.tables.get(toolbar.handle)
+        if table is None:
+            self.sweep(toolbar)
+            with self.lock:
+                table = self.tables.get(toolbar.handle, {})
+        return table.get(index)
+
+    def invalidate(self, toolbar_handle=None):
+        """Drop the table of the toolbar or all the tables."""
+        with self.lock:
+            if toolbar_handle is None:
+                self.tables.clear()
+            else:
+                self.tables.pop(toolbar_handle, None)
@@ -0,0 +1,105 @@
+# Levels of the tree views.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+"""
+Levels of the tree views.
+
+A level of a tree view is read only when it is expanded in the object
+browser, as the handles of the items, the wrappers are made only for
+the shown page. The paths of the items are composed by the parent
+pointers of the wrappers.
+"""
+
+import threading
+
+
+class TreeLevels(object):
+    """
+    Expanded levels of the tree views.
+
+    `first_child(tree, item)` returns the handle of the first child of the
+    item or of the first root if the item is None, `next_sibling(tree,
+    item)` the handle of the next item, both return 0 if there is no such
+    item. The levels are kept until they are invalidated.
+    """
+
+    def __init__(self, first_child, next_sibling):
+        """Init with no levels read."""
+        self.first_child = first_child
+        self.next_sibling = next_sibling
+        self.lock = threading.RLock()
+        self.levels = {}  # (tree handle, item handle) -> (handle, ...)
+        self.fetches = 0
+        self.probes = 0
+
+    def _read(self, tree, item):
+        """Walk the items of the level."""
+        handles = []
+        handle = self.first_child(tree, item)
+        while handle:
+            handles.append(handle)
+            handle = self.next_sibling(tree, handle)
+        return tuple(handles)
+
+    def level(self, tree, item=None):
+        """Return the handles of the children of the item, roots if None."""
+        key = (tree.handle, item)
+        with self.lock:
+            handles = self.levels.get(key)
+        if handles is None:
+            handles = self._read(tree, item)
+            with self.lock:
+                self.levels[key] = handles
+                self.fetches += 1
+        return handles
+
+    def count(self, tree, item=None):
+        """Return the number of the children of the item."""
+        return len(self.level(tree, item))
+
+    def page(self, tree, item, start, stop):
+        """Return the handles of the children [start, stop)."""
+        return self.level(tree, item)[start:stop]
+
+    def has_children(self, tree, item):
+        """Return True if the item has a child, the level is not read."""
+        with self.lock:
+            handles = self.levels.get((tree.handle, item))
+        if handles is not None:
+            return bool(handles)
+        with self.lock:
+            self.probes += 1
+        return bool(self.first_child(tree, item))
+
+    def invalidate(self, tree_handle=None, item=None):
+        """
+        Drop the level of the item.
+
+        All the levels of the tree if no item, all the levels if no tree.
+        """
+        with self.lock:
+            if tree_handle is None:
+                self.levels.clear()
+            elif item is not None:
+                self.levels.pop((tree_handle, item), None)
+            else:
+                for key in [key for key in self.levels
+                            if key[0] == tree_handle]:
+                    del self.levels[key]
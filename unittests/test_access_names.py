@@ -0,0 +1,310 @@
+# unit tests for the access names.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+import random
+import unittest
+
+import access_names
+
+try:
+    from pywinauto import findbestmatch
+except ImportError:
+    findbestmatch = None
+
+
+class StubRect(object):
+
+    def __init__(self, left, top, right, bottom):
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+
+
+class StubControl(object):
+
+    """Stub of a pywinauto control."""
+
+    def __init__(self, handle, friendly_class, text, rect, visible=True,
+                 has_title=True, can_be_label=False, texts=()):
+        self.handle = handle
+        self.friendly_class = friendly_class
+        self.text = text
+        self.rect = StubRect(*rect)
+        self.visible = visible
+        self.has_title = has_title
+        self.can_be_label = can_be_label
+        self.texts = [text] + list(texts)
+        self.calls = 0
+
+    def FriendlyClassName(self):
+        self.calls += 1
+        return self.friendly_class
+
+    def WindowText(self):
+        self.calls += 1
+        return self.text
+
+    def Texts(self):
+        self.calls += 1
+        return self.texts
+
+    def Rectangle(self):
+        self.calls += 1
+        return self.rect
+
+    def IsVisible(self):
+        self.calls += 1
+        return self.visible
+
+
+def make_tree(count, seed=0):
+    """Dialog-like controls: labels, edits, buttons and lists."""
+    rnd = random.Random(seed)
+    tree = []
+    for handle in range(1, count + 1):
+        left, top = rnd.randint(0, 500), rnd.randint(0, 500)
+        rect = (left, top, left + rnd.randint(10, 100),
+                top + rnd.randint(10, 30))
+        kind = rnd.choice(['Static', 'Edit', 'Button', 'ListBox', 'UpDown'])
+        if kind == 'Static':
+            control = StubControl(handle, kind, rnd.choice(['Name', 'Age']),
+                                  rect, can_be_label=True,
+                                  visible=rnd.random() > 0.1)
+        elif kind == 'Button':
+            control = StubControl(handle, kind, rnd.choice(['OK', 'Cancel',
+                                                             '']), rect)
+        elif kind == 'ListBox':
+            control = StubControl(handle, kind, '', rect,
+                                  texts=[rnd.choice(['a', 'b'])])
+        else:
+            control = StubControl(handle, kind, rnd.choice(['', '12']), rect,
+                                  has_title=False)
+        tree.append(control)
+    return tree
+
+
+class AccessNamesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = make_tree(60)
+        self.controls = dict((c.handle, c) for c in self.tree)
+        self.inspected = []
+
+    def info_factory(self, handle):
+        self.inspected.append(handle)
+        return access_names.control_info(handle, self.controls[handle])
+
+    def full_names(self, handles):
+        infos = [access_names.control_info(h, self.controls[h])
+                 for h in handles]
+        return access_names.build_unique_names(infos)
+
+    def engine_names(self, engine):
+        names = {}
+        for name, handle in engine.names:
+            names[name] = handle
+        return names
+
+    @unittest.skipIf(findbestmatch is None, "pywinauto is not available")
+    def test_same_as_build_unique_dict(self):
+        unique_dict = findbestmatch.build_unique_dict(self.tree)
+        expected = dict((name, control.handle) for name, control
+                        in unique_dict.items())
+        self.assertEqual(expected, self.full_names(self.controls.keys()))
+
+    def test_names_of(self):
+        engine = access_names.AccessNamesEngine()
+        handles = [c.handle for c in self.tree]
+        engine.update(handles, self.info_factory)
+        for handle in handles:
+            names = engine.names_of(handle)
+            self.assertEqual(sorted(names, key=len), names)
+            self.assertFalse('' in names)
+            for name in names:
+                self.assertEqual(handle, self.engine_names(engine)[name])
+
+    def test_incremental_update(self):
+        engine = access_names.AccessNamesEngine()
+        handles = [c.handle for c in self.tree]
+        self.assertTrue(engine.update(handles, self.info_factory))
+        self.assertEqual(len(handles), len(self.inspected))
+
+        # nothing changed
+        self.assertFalse(engine.update(handles, self.info_factory))
+        self.assertEqual(len(handles), len(self.inspected))
+
+        rnd = random.Random(1)
+        new_controls = make_tree(80, seed=2)[60:]
+        for step in range(20):
+            self.inspected = []
+            if step % 2:
+                del handles[rnd.randrange(len(handles))]
+            else:
+                control = new_controls.pop()
+                self.controls[control.handle] = control
+                handles.insert(rnd.randrange(len(handles)), control.handle)
+                # only the new control is inspected
+                engine.update(handles, self.info_factory)
+                self.assertEqual([control.handle], self.inspected)
+            engine.update(handles, self.info_factory)
+            expected = self.full_names(handles)
+            expected.pop('', None)
+            self.assertEqual(expected, self.engine_names(engine))
+
+    def test_text_changed(self):
+        engine = access_names.AccessNamesEngine()
+        handles = [c.handle for c in self.tree]
+        text_of = lambda handle: self.controls[handle].text
+        engine.update(handles, self.info_factory, text_of)
+        self.inspected = []
+        self.assertFalse(engine.update(handles, self.info_factory, text_of))
+
+        labels = [c for c in self.tree if c.friendly_class == 'Static']
+        for control in (labels[0], self.tree[-1]):
+            control.text = 'Renamed'
+        self.assertTrue(engine.update(handles, self.info_factory, text_of))
+        # only the retitled controls are inspected again
+        self.assertEqual([labels[0].handle, self.tree[-1].handle],
+                         self.inspected)
+        expected = self.full_names(handles)
+        expected.pop('', None)
+        self.assertEqual(expected, self.engine_names(engine))
+
+
+class UniqueNamesTablesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = {
+            1: StubControl(1, 'Button', 'OK', (0, 0, 10, 10)),
+            2: StubControl(2, 'Button', 'Cancel', (20, 0, 30, 10)),
+            3: StubControl(3, 'Button', 'Help', (40, 0, 50, 10)),
+            }
+        self.tables = access_names.UniqueNamesTables()
+        self.inspected = []
+
+    def info_factory(self, handle):
+        self.inspected.append(handle)
+        return access_names.control_info(handle, self.tree[handle])
+
+    def get_table(self, top_handle=100):
+        return self.tables.get(top_handle, sorted(self.tree),
+                               self.info_factory)
+
+    def test_names_of(self):
+        table = self.get_table()
+        self.assertEqual('OK', table.names_of(1)[0])
+        self.assertEqual('OKButton', table.names_of(1)[-1])
+        self.assertEqual('Cancel', table.names_of(2)[0])
+        self.assertTrue('Button2' in table.names_of(2))
+        self.assertEqual([], table.names_of(4))
+        self.assertTrue(all(name for name, handle in table.names))
+
+    def test_shared_table(self):
+        table = self.get_table()
+        self.assertTrue(table is self.get_table())
+        self.assertEqual([1, 2, 3], self.inspected)
+
+        self.get_table(top_handle=200)
+        self.assertEqual([1, 2, 3] * 2, self.inspected)
+
+    def test_handles_changed(self):
+        self.get_table()
+        self.tree[4] = StubControl(4, 'Button', 'Apply', (60, 0, 70, 10))
+        self.assertEqual('ApplyButton', self.get_table().names_of(4)[-1])
+        self.assertEqual([1, 2, 3, 4], self.inspected)
+
+        del self.tree[1]
+        self.assertEqual([], self.get_table().names_of(1))
+        self.assertEqual([1, 2, 3, 4], self.inspected)
+
+    def test_text_changed(self):
+        text_of = lambda handle: self.tree[handle].text
+        self.tables.get(100, sorted(self.tree), self.info_factory, text_of)
+        self.tree[1].text = 'Yes'
+        table = self.tables.get(100, sorted(self.tree), self.info_factory,
+                                text_of)
+        self.assertEqual('Yes', table.names_of(1)[0])
+        self.assertFalse('OK' in table.names_of(1))
+        self.assertEqual([1, 2, 3, 1], self.inspected)
+
+    def test_checked_once_per_generation(self):
+        reads = []
+
+        def read_handles():
+            reads.append(1)
+            return sorted(self.tree)
+
+        text_of = lambda handle: self.tree[handle].text
+        table = self.tables.get_checked(100, 0, read_handles,
+                                        self.info_factory, text_of)
+        self.tree[1].text = 'Yes'
+        for i in range(3):
+            self.assertTrue(table is self.tables.get_checked(
+                100, 0, read_handles, self.info_factory, text_of))
+        self.assertEqual(1, len(reads))
+        self.assertEqual('OK', table.names_of(1)[0])  # not checked yet
+
+        # an action or a refresh
+        self.tables.get_checked(100, 1, read_handles, self.info_factory,
+                                text_of)
+        self.assertEqual(2, len(reads))
+        self.assertEqual('Yes', table.names_of(1)[0])
+        self.assertEqual(2, self.tables.checks)
+
+        self.tables.invalidate(100)
+        self.tables.get_checked(100, 1, read_handles, self.info_factory)
+        self.assertEqual(3, len(reads))
+
+    def test_invalidate(self):
+        self.get_table()
+        self.tables.invalidate(100)
+        self.get_table()
+        self.assertEqual([1, 2, 3] * 2, self.inspected)
+
+    def test_prefetch(self):
+        windows = {}
+        for top_handle in range(100, 104):
+            tree = make_tree(40, seed=top_handle)
+            for control in tree:
+                control.handle += top_handle * 1000
+                self.tree[control.handle] = control
+            windows[top_handle] = [control.handle for control in tree]
+
+        serial = access_names.UniqueNamesTables()
+        serial.prefetch(windows, self.info_factory)
+        self.inspected = []
+        self.tables.prefetch(windows, self.info_factory, processes=2)
+        self.assertEqual(sum(map(len, windows.values())),
+                         len(self.inspected))
+
+        for top_handle, handles in windows.items():
+            engine = self.tables.get(top_handle, handles, self.info_factory)
+            self.assertEqual(serial.tables[top_handle].names, engine.names)
+
+            expected = access_names.AccessNamesEngine()
+            expected.update(handles, self.info_factory)
+            self.assertEqual(expected.names, engine.names)
+
+        # the known windows are skipped
+        self.inspected = []
+        self.tables.prefetch(windows, self.info_factory, processes=2)
+        self.assertEqual([], self.inspected)
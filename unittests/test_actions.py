@@ -0,0 +1,108 @@
+# unit tests for the sequences of the actions.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+
+import unittest
+
+import actions
+
+
+class FakeWrapper(object):
+
+    """Executes the actions by a fake clock."""
+
+    def __init__(self, clock, durations, results=None):
+        self.clock = clock
+        self.durations = durations
+        self.results = results or {}
+        self.executed = []
+
+    def execute_action(self, action, *args, **kwargs):
+        if action not in self.durations:
+            raise ValueError("Unknown action %r" % (action,))
+        self.clock.now += self.durations[action]
+        self.executed.append((action, args, kwargs))
+        return self.results.get(action)
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class RunStepsTestCases(unittest.TestCase):
+
+    edit_result = object()
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.button = FakeWrapper(self.clock, {'Click': 1, 'SetFocus': 2})
+        self.edit = FakeWrapper(self.clock, {'TypeKeys': 3, 'Select': 1},
+                                {'TypeKeys': self.edit_result,
+                                 'Select': 2})
+
+    def test_many_wrappers(self):
+        results = actions.run_steps(
+            [(self.button, 'SetFocus'),
+             (self.edit, 'TypeKeys', ['abc'], {'with_spaces': True}),
+             (self.button, 'Click')], clock=self.clock)
+        self.assertEqual([result.outcome for result in results],
+                         [actions.OK] * 3)
+        self.assertEqual([result.duration for result in results], [2, 3, 1])
+        self.assertEqual(self.edit.executed,
+                         [('TypeKeys', ('abc',), {'with_spaces': True})])
+
+    def test_results(self):
+        results = actions.run_steps(
+            [(self.edit, 'TypeKeys', ['abc']),
+             (self.edit, 'Select', [2]),
+             (self.button, 'Click'),
+             (self.button, 'Close')], clock=self.clock)
+        self.assertTrue(results[0].result is self.edit_result)
+        self.assertEqual([2, None, None],
+                         [result.result for result in results[1:]])
+
+    def test_error_continues(self):
+        results = actions.run_steps([(self.button, 'Close'),
+                                     (self.button, 'Click')],
+                                    clock=self.clock)
+        self.assertEqual(results[0].outcome, actions.ERROR)
+        self.assertTrue(isinstance(results[0].error, ValueError))
+        self.assertEqual(results[1].outcome, actions.OK)
+
+    def test_stop_on_error(self):
+        results = actions.run_steps([(self.button, 'Close'),
+                                     (self.button, 'Click')],
+                                    stop_on_error=True, clock=self.clock)
+        self.assertEqual([result.outcome for result in results],
+                         [actions.ERROR, actions.SKIPPED])
+        self.assertEqual(self.button.executed, [])
+
+    def test_wrong_step(self):
+        self.assertRaises(ValueError, actions.run_steps, [(self.button,)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+# unit tests for the bulk reading of the control attributes.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+
+import unittest
+
+from attributes import AttributesBackend, ModuleBackend, SubitemsStates, \
+    read_attributes
+from filters import ChildrenFilter
+
+
+class FakeBackend(AttributesBackend):
+
+    """Fake of the attributes backend, counts the calls."""
+
+    def __init__(self):
+        # handle: (text, class name, control id, rect, visible, enabled, pid)
+        self.windows = {1: (u'Untitled', 'Notepad', 0, (0, 0, 10, 10),
+                            True, True, 100),
+                        2: (u'', 'tooltips_class32', 0, (0, 0, 0, 0),
+                            False, True, 100),
+                        3: (u'OK', 'Button', 1, (1, 1, 5, 5),
+                            1, 0, 200)}
+        self.calls = 0
+        self.texts = []
+
+    def _get(self, handle, index):
+        self.calls += 1
+        return self.windows[handle][index]  # KeyError if closed
+
+    def text(self, handle):
+        self.texts.append(handle)
+        return self._get(handle, 0)
+
+    def classname(self, handle):
+        return self._get(handle, 1)
+
+    def controlid(self, handle):
+        return self._get(handle, 2)
+
+    def rectangle(self, handle):
+        return self._get(handle, 3)
+
+    def isvisible(self, handle):
+        return self._get(handle, 4)
+
+    def isenabled(self, handle):
+        return self._get(handle, 5)
+
+    def processid(self, handle):
+        return self._get(handle, 6)
+
+
+class ReadAttributesTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = FakeBackend()
+
+    def test_rows(self):
+        table = read_attributes([3, 1], self.backend)
+        self.assertEqual([3, 1], table.handles)
+        row = table.row(3)
+        self.assertEqual(('Button', 1, 200),
+                         (row.class_name, row.control_id, row.pid))
+        # the states are booleans
+        self.assertIs(row.visible, True)
+        self.assertIs(row.enabled, False)
+
+    def test_details_on_ask(self):
+        table = read_attributes([1, 3], self.backend)
+        self.assertEqual([], self.backend.texts)
+        self.assertIsNone(table.row(3).text)
+        self.assertEqual(u'OK', table.text(3))
+        self.assertEqual((1, 1, 5, 5), table.rectangle(3))
+        self.assertEqual((u'OK', (1, 1, 5, 5)),
+                         (table.row(3).text, table.row(3).rect))
+        # read once
+        self.assertEqual([3], self.backend.texts)
+
+    def test_closed_skipped(self):
+        table = read_attributes([1, 5, 2], self.backend)
+        self.assertEqual([1, 2], table.handles)
+        self.assertEqual(2, len(table))
+        self.assertIsNone(table.row(5))
+
+    def test_backend_interface(self):
+        table = read_attributes([1, 2, 3], self.backend)
+        for handle in [1, 2, 3]:
+            for name in ['text', 'classname', 'controlid', 'rectangle',
+                         'processid']:
+                self.assertEqual(getattr(self.backend, name)(handle),
+                                 getattr(table, name)(handle))
+
+    def test_select(self):
+        table = read_attributes([1, 2, 3], self.backend)
+        table.text(1)
+        selected = table.select([3, 1, 5])
+        self.assertEqual([3, 1], selected.handles)
+        self.assertEqual([3, 1], [row.handle for row in selected])
+        self.assertEqual(u'Untitled', selected.text(1))
+        self.assertEqual([1], self.backend.texts)
+
+    def test_filter_no_more_calls(self):
+        table = read_attributes([1, 2, 3], self.backend)
+        calls = self.backend.calls
+        children_filter = ChildrenFilter(visible_only=True, process=100)
+        self.assertEqual([1], children_filter.apply(table.handles, table))
+        self.assertEqual(calls, self.backend.calls)
+
+    def test_filter_texts_of_passed(self):
+        table = read_attributes([1, 2, 3], self.backend)
+        children_filter = ChildrenFilter(visible_only=True, title_re='Unt')
+        self.assertEqual([1], children_filter.apply(table.handles, table))
+        # the hidden window text is not read
+        self.assertEqual([1, 3], self.backend.texts)
+
+    def test_module_backend(self):
+        backend = ModuleBackend(self.backend)
+        self.assertEqual([1, 3], read_attributes([1, 3], backend).handles)
+
+
+
+class FakeChild(object):
+
+    """Fake of a listed child, a stub with its row or a window."""
+
+    def __init__(self, row=None, handle=None):
+        self.row = row
+        self.handle = handle
+        self.checks = 0
+
+    def has_subitems(self):
+        return None
+
+
+class SubitemsStatesTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = FakeBackend()
+        self.parent_checks = 0
+        listed = read_attributes([1, 2], self.backend)
+        self.subitems = [(u'a', FakeChild(row=listed.row(1))),
+                         (u'b', FakeChild(row=listed.row(2))),
+                         (u'c', FakeChild(handle=3)),
+                         (u'd', FakeChild())]
+        self.states = SubitemsStates()
+
+    def window_of(self, child):
+        return child.row, child.handle
+
+    def read_table(self, handles):
+        return read_attributes(handles, self.backend)
+
+    def parent_actionable(self):
+        self.parent_checks += 1
+        return True
+
+    def grayed_of(self, child):
+        child.checks += 1
+        return True
+
+    def get(self):
+        return self.states.get(self.subitems, self.window_of,
+                               self.read_table, self.parent_actionable,
+                               self.grayed_of)
+
+    def test_states(self):
+        # visible and enabled, hidden, disabled, own checks
+        self.assertEqual([(False, None), (True, None), (True, None),
+                          (True, None)], self.get())
+        self.assertEqual(1, self.states.sweeps)
+        self.assertEqual(1, self.parent_checks)
+
+    def test_reselection_reads_nothing(self):
+        self.get()
+        calls = self.backend.calls
+        self.assertEqual(self.get(), self.get())
+        self.assertEqual(calls, self.backend.calls)
+        self.assertEqual(1, self.states.sweeps)
+        self.assertEqual(1, self.parent_checks)
+        self.assertEqual(1, self.subitems[3][1].checks)
+
+
+if __name__ == '__main__':
+    unittest.main()
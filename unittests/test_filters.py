@@ -0,0 +1,100 @@
+# unit tests for the children filters.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+
+import unittest
+
+from filters import ChildrenFilter
+
+
+class FakeProps(object):
+
+    """Fake of pywinauto's handleprops, counts the text lookups."""
+
+    def __init__(self):
+        # handle: (visible, enabled, pid, class name, text)
+        self.windows = {1: (True, True, 100, 'Notepad', u'Untitled'),
+                        2: (False, True, 100, 'tooltips_class32', u''),
+                        3: (True, False, 200, 'Button', u'OK'),
+                        4: (True, True, 200, 'Edit', u'Untitled 2')}
+        self.texts = []
+
+    def isvisible(self, handle):
+        return self.windows[handle][0]
+
+    def isenabled(self, handle):
+        return self.windows[handle][1]
+
+    def processid(self, handle):
+        return self.windows[handle][2]
+
+    def classname(self, handle):
+        return self.windows[handle][3]
+
+    def text(self, handle):
+        self.texts.append(handle)
+        return self.windows[handle][4]
+
+
+class ChildrenFilterTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.props = FakeProps()
+        self.handles = [1, 2, 3, 4]
+
+    def test_default_passes_all(self):
+        children_filter = ChildrenFilter()
+        self.assertFalse(children_filter.active)
+        self.assertEqual(children_filter.apply(self.handles, self.props),
+                         self.handles)
+
+    def test_visible_enabled(self):
+        children_filter = ChildrenFilter(visible_only=True, enabled_only=True)
+        self.assertEqual(children_filter.apply(self.handles, self.props),
+                         [1, 4])
+        self.assertEqual(children_filter.rejected, 2)
+
+    def test_process_class(self):
+        children_filter = ChildrenFilter(process=200, class_name_re='Ed')
+        self.assertEqual(children_filter.apply(self.handles, self.props),
+                         [4])
+
+    def test_title_checked_last(self):
+        children_filter = ChildrenFilter(visible_only=True,
+                                         title_re='Untitled')
+        self.assertEqual(children_filter.apply(self.handles, self.props),
+                         [1, 4])
+        # no text fetched for the hidden window
+        self.assertEqual(self.props.texts, [1, 3, 4])
+
+    def test_closed_window(self):
+        children_filter = ChildrenFilter(visible_only=True)
+        self.assertEqual(children_filter.apply([1, 5], self.props), [1])
+
+    def test_options(self):
+        children_filter = ChildrenFilter(visible_only=True, process=100)
+        self.assertEqual(children_filter.options(),
+                         {'visible_only': True, 'process': 100})
+        self.assertTrue(children_filter.active)
+
+
+if __name__ == '__main__':
+    unittest.main()
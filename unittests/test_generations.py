@@ -0,0 +1,94 @@
+# unit tests for the generation based caches.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+
+import unittest
+
+from generations import GenerationCache
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class GenerationCacheTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = GenerationCache(ttl=5, clock=self.clock)
+
+    def test_hit(self):
+        entry = self.cache.entry({'Text': u'OK'})
+        self.assertTrue(self.cache.lookup(entry))
+        self.assertEqual(entry.value, {'Text': u'OK'})
+        self.assertEqual(self.cache.stats(),
+                         {'generation': 0, 'hits': 1, 'misses': 0})
+
+    def test_miss(self):
+        self.assertFalse(self.cache.lookup(None))
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_bump(self):
+        entry = self.cache.entry({})
+        self.cache.bump()
+        self.assertFalse(self.cache.lookup(entry))
+        self.assertTrue(self.cache.lookup(self.cache.entry({})))
+
+    def test_ttl(self):
+        entry = self.cache.entry({})
+        self.clock.now = 4.9
+        self.assertTrue(self.cache.valid(entry))
+        self.clock.now = 5
+        self.assertFalse(self.cache.valid(entry))
+
+    def test_no_ttl(self):
+        cache = GenerationCache(clock=self.clock)
+        entry = cache.entry({})
+        self.clock.now = 10 ** 6
+        self.assertTrue(cache.valid(entry))
+
+    def test_touch(self):
+        entry = self.cache.entry([])
+        self.cache.touch('sibling')
+        self.assertTrue(self.cache.valid(entry, ['node', 'parent']))
+        self.cache.touch('parent')
+        self.assertFalse(self.cache.valid(entry, ['node', 'parent']))
+        self.assertTrue(self.cache.valid(self.cache.entry([]),
+                                         ['node', 'parent']))
+
+    def test_touched_limit(self):
+        cache = GenerationCache(clock=self.clock, touched_limit=2)
+        entry = cache.entry([])
+        cache.touch(1)
+        cache.touch(2)
+        self.assertEqual(cache.generation, 0)
+        cache.touch(3)
+        self.assertEqual(cache.generation, 1)
+        self.assertFalse(cache.valid(entry))
+
+
+if __name__ == '__main__':
+    unittest.main()
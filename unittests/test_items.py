@@ -0,0 +1,217 @@
+# unit tests for the item texts of the combobox and listbox controls.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+
+import ctypes
+import locale
+import unittest
+
+import items
+
+
+LEN_MSG = 1
+GET_MSG = 2
+COUNT_MSG = 3
+
+
+class FakeWrapper(object):
+
+    """Item control answering the item messages, counts the item reads."""
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.reads = 0
+
+    def SendMessage(self, msg, wparam=0, lparam=0):
+        if msg == COUNT_MSG:
+            return len(self.texts)
+        if msg == LEN_MSG:
+            return len(self.texts[wparam])
+        if msg == GET_MSG:
+            self.reads += 1
+            lparam._obj.value = self.texts[wparam]
+            return len(self.texts[wparam])
+
+    def ItemCount(self):
+        return len(self.texts)
+
+
+def reference_texts(wrapper, count_msg, item_len_msg, item_get_msg):
+
+    """pywinauto 0.5.4 _get_multiple_text_items, the python 2 branch."""
+
+    texts = []
+    num_items = wrapper.SendMessage(count_msg)
+    for i in range(0, num_items):
+        text_len = wrapper.SendMessage(item_len_msg, i, 0)
+        text = ctypes.create_string_buffer(text_len + 1)
+        wrapper.SendMessage(item_get_msg, i, ctypes.byref(text))
+        texts.append(text.value.decode(locale.getpreferredencoding(),
+                                       'ignore').replace('?', ''))
+    return texts
+
+
+def snapshot_of(wrapper):
+    return items.ItemsSnapshot(
+        lambda start, stop: items.get_item_texts(wrapper, start, stop,
+                                                 LEN_MSG, GET_MSG),
+        wrapper.ItemCount)
+
+
+class ItemTextsTestCases(unittest.TestCase):
+
+    def test_same_as_pywinauto(self):
+        wrapper = FakeWrapper([b'one', b'', b'what?', b'one', b'four'])
+        expected = reference_texts(wrapper, COUNT_MSG, LEN_MSG, GET_MSG)
+        self.assertEqual(expected,
+                         items.get_item_texts(wrapper, 0, 5,
+                                              LEN_MSG, GET_MSG))
+        self.assertEqual(expected[1:3],
+                         items.get_item_texts(wrapper, 1, 3,
+                                              LEN_MSG, GET_MSG))
+
+    def test_extend_in_order(self):
+        item_texts = items.ItemTexts(0)
+        item_texts.extend(0, ['a', 'b'])
+        item_texts.extend(3, ['d'])  # a gap, not kept
+        item_texts.extend(2, ['c', 'a'])
+        self.assertEqual(['a', 'b', 'c', 'a'], item_texts.texts)
+        self.assertEqual({'a': 0, 'b': 1, 'c': 2}, item_texts.indexes)
+
+
+class ItemsSnapshotTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.wrapper = FakeWrapper([b'one', b'two', b'three', b'two'])
+        self.snapshot = snapshot_of(self.wrapper)
+
+    def test_pages(self):
+        self.assertEqual([u'one', u'two'], self.snapshot.read(0, 2))
+        self.assertEqual([u'three', u'two'], self.snapshot.read(2, 4))
+        self.assertEqual(4, self.wrapper.reads)
+
+        self.assertEqual(u'three', self.snapshot.text(2))
+        self.assertEqual(1, self.snapshot.index(u'two'))
+        self.assertEqual(4, self.wrapper.reads)
+
+    def test_index_reads_remaining_once(self):
+        self.snapshot.read(0, 1)
+        self.assertEqual(2, self.snapshot.index(u'three'))
+        self.assertEqual(4, self.wrapper.reads)
+
+        self.assertEqual(None, self.snapshot.index(u'four'))
+        self.assertEqual(1, self.snapshot.index(u'two'))
+        self.assertEqual(4, self.wrapper.reads)
+
+    def test_text_not_loaded(self):
+        self.assertEqual(u'three', self.snapshot.text(2))
+        self.assertEqual(1, self.wrapper.reads)
+        self.assertEqual([], self.snapshot.item_texts.texts)
+
+    def test_refresh(self):
+        self.snapshot.read(0, 4)
+        self.wrapper.texts = [b'two', b'one']
+        self.assertEqual(2, self.snapshot.index(u'three'))  # stale snapshot
+
+        self.snapshot.refresh()
+        self.assertEqual(0, self.snapshot.index(u'two'))
+        self.assertEqual(u'one', self.snapshot.text(1))
+        self.assertEqual(None, self.snapshot.index(u'three'))
+        self.assertEqual(6, self.wrapper.reads)
+
+
+class FakeListView(object):
+
+    """List view of rows of the cells texts."""
+
+    def __init__(self, rows, column_count):
+        self.rows = rows
+        self.column_count = column_count
+
+    def ColumnCount(self):
+        return self.column_count
+
+    def ItemCount(self):
+        return len(self.rows)
+
+    def GetItem(self, item_index, subitem_index=0):
+        return self.rows[item_index][subitem_index]
+
+
+def reference_items(listview):
+
+    """pywinauto 0.5.4 ListViewWrapper.Items()."""
+
+    colcount = listview.ColumnCount()
+    if not colcount:
+        colcount = 1
+    cells = []
+    for item_index in range(0, listview.ItemCount()):
+        for subitem_index in range(0, colcount):
+            cells.append(listview.GetItem(item_index, subitem_index))
+    return cells
+
+
+class PagesTestCases(unittest.TestCase):
+
+    def pages(self, count, page_size):
+        return [(start, min(start + page_size, count))
+                for start in range(0, count, page_size)]
+
+    def test_split_page(self):
+        main = ['m0', 'm1', 'm2']
+        additional = ['a0', 'a1', 'a2', 'a3']
+        for page_size in (1, 2, 3, 5, 10):
+            subitems = []
+            for start, stop in self.pages(7, page_size):
+                (main_start, main_stop), (add_start, add_stop) = \
+                    items.split_page(start, stop, len(main), len(additional))
+                subitems += main[main_start:main_stop]
+                subitems += additional[add_start:add_stop]
+            self.assertEqual(main + additional, subitems)
+
+    def test_split_page_empty(self):
+        self.assertEqual(((0, 0), (0, 0)), items.split_page(0, 5, 0, 0))
+        main, additional = items.split_page(4, 8, 2, 3)
+        self.assertEqual((2, 2), main)
+        self.assertEqual((2, 3), additional)
+
+    def test_cells_same_as_items(self):
+        rows = [['r0c0', 'r0c1', 'r0c2'],
+                ['r1c0', 'r1c1', 'r1c2']]
+        for listview in (FakeListView(rows, 3),
+                         FakeListView([row[:1] for row in rows], 0)):
+            expected = reference_items(listview)
+            count = items.cells_count(listview.ItemCount(),
+                                      listview.ColumnCount())
+            self.assertEqual(len(expected), count)
+
+            for page_size in (1, 2, 4):
+                cells = []
+                for start, stop in self.pages(count, page_size):
+                    cells += [listview.GetItem(row, column)
+                              for row, column in items.cells(
+                                  start, stop, listview.ColumnCount())]
+                self.assertEqual(expected, cells)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# unit tests for the liveness oracle.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+
+import unittest
+
+from liveness import LivenessOracle
+
+
+class FakeDesktop(object):
+
+    """Live handles of a fake desktop."""
+
+    def __init__(self, handles):
+        self.handles = set(handles)
+        self.enumerations = 0
+        self.probes = []
+        self.now = 0.0
+
+    def enumerate_handles(self):
+        self.enumerations += 1
+        return list(self.handles)
+
+    def probe(self, handle):
+        self.probes.append(handle)
+        return handle in self.handles
+
+    def clock(self):
+        return self.now
+
+
+class LivenessOracleTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.desktop = FakeDesktop(range(1, 101))
+        self.oracle = LivenessOracle(self.desktop.enumerate_handles,
+                                     self.desktop.probe, interval=0.5,
+                                     clock=self.desktop.clock)
+
+    def test_one_enumeration(self):
+        for handle in range(1, 101):
+            self.assertTrue(self.oracle.exists(handle))
+        self.assertEqual(1, self.desktop.enumerations)
+        self.assertEqual([], self.desktop.probes)
+        self.assertEqual({'checks': 100, 'probes': 0, 'probes_saved': 100,
+                          'enumerations': 1}, self.oracle.stats())
+
+    def test_unknown_handle_probed(self):
+        self.assertTrue(self.oracle.exists(1))
+        self.desktop.handles.add(200)  # created after the enumeration
+        self.assertTrue(self.oracle.exists(200))
+        self.assertTrue(self.oracle.exists(200))
+        self.assertFalse(self.oracle.exists(300))
+        self.assertEqual([200, 300], self.desktop.probes)
+        self.assertEqual(1, self.desktop.enumerations)
+        self.assertEqual(2, self.oracle.probes_saved)
+
+    def test_interval(self):
+        self.assertTrue(self.oracle.exists(1))
+        self.desktop.handles.remove(1)
+        self.desktop.now += 0.4
+        self.assertTrue(self.oracle.exists(1))  # the snapshot is fresh
+        self.desktop.now += 0.2
+        self.assertFalse(self.oracle.exists(1))
+        self.assertEqual(2, self.desktop.enumerations)
+
+    def test_expire(self):
+        self.assertTrue(self.oracle.exists(1))
+        self.desktop.handles.remove(1)
+        self.oracle.expire()
+        self.assertFalse(self.oracle.exists(1))
+        self.assertEqual(2, self.desktop.enumerations)
+
+    def test_enumeration_fails(self):
+        def enumerate_handles():
+            raise RuntimeError()
+        oracle = LivenessOracle(enumerate_handles, self.desktop.probe,
+                                clock=self.desktop.clock)
+        self.assertTrue(oracle.exists(1))
+        self.assertFalse(oracle.exists(300))
+        self.assertEqual([1, 300], self.desktop.probes)
@@ -0,0 +1,215 @@
+# unit tests for the menu structures.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+
+import unittest
+
+import menus
+
+
+class FakeInfo(object):
+
+    def __init__(self, text, fType=0, fState=0, wID=0, hSubMenu=0):
+        self.text = text
+        self.fType = fType
+        self.fState = fState
+        self.wID = wID
+        self.hSubMenu = hSubMenu
+
+
+class FakeMenu(object):
+
+    """Fake of pywinauto's Menu, items are (text, state, submenu)."""
+
+    handles = 100
+
+    def __init__(self, items, accessible=True):
+        FakeMenu.handles += 1
+        self.handle = FakeMenu.handles
+        self.accessible = accessible
+        self.items = [FakeMenuItem(self, index, *item)
+                      for index, item in enumerate(items)]
+        self.reads = []
+
+    def Items(self):
+        return list(self.items)
+
+    def ItemCount(self):
+        return len(self.items)
+
+
+class FakeMenuItem(object):
+
+    def __init__(self, menu, index, text, state=0, submenu=None):
+        self.menu = menu
+        self.index = index
+        self.text = text
+        self.state = state
+        self.submenu = submenu
+        self.popups = 0  # WM_INITMENUPOPUP sent to the app
+
+    def Index(self):
+        return self.index
+
+    def _read_item(self):
+        self.menu.reads.append(self.index)
+        fType = menus.MF_SEPARATOR if self.text is None else 0
+        return FakeInfo(self.text or u'', fType, self.state, self.index,
+                        self.submenu.handle if self.submenu else 0)
+
+    def State(self):
+        return self._read_item().fState
+
+    def SubMenu(self):
+        if self._read_item().hSubMenu:
+            self.popups += 1
+            return self.submenu
+        return None
+
+
+def read_item(item):
+    """One read per item, as proxy.read_menu_item."""
+    info = item._read_item()
+    return menus.MenuItemInfo(info.text, info.fType, info.wID, info.hSubMenu)
+
+
+class MenuStructuresTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.recent = FakeMenu([(u'1.txt',), (u'2.txt',)])
+        self.file_menu = FakeMenu([(u'Open',), (u'Recent', 0, self.recent),
+                                   (None,), (u'', 3)])
+        self.help_menu = FakeMenu([], False)
+        self.main_menu = FakeMenu([(u'File', 0, self.file_menu),
+                                   (u'Help', 0, self.help_menu)])
+        self.signatures = {1: 'v1'}
+        self.structures = menus.MenuStructures(self.signatures.get,
+                                               self.get_menu, read_item)
+
+    def get_menu(self, window_handle):
+        return self.main_menu
+
+    def open(self, structure, menu, index):
+        return structure.open(structure.entry(menu.handle, index))
+
+    def test_capture(self):
+        structure = self.structures.get(1)
+        self.assertEqual([u'File', u'Help'],
+                         [e.label for e in
+                          structure.items(self.main_menu.handle)])
+        # the submenus are not opened nor read
+        self.assertEqual(None, structure.items(self.file_menu.handle))
+        self.assertEqual(0, self.main_menu.items[0].popups)
+        self.assertEqual([], self.file_menu.reads)
+        # one read per item
+        self.assertEqual([0, 1], self.main_menu.reads)
+        self.assertTrue(structure.entry(self.main_menu.handle, 0).has_submenu)
+
+    def test_open(self):
+        structure = self.structures.get(1)
+        self.assertTrue(self.file_menu is
+                        self.open(structure, self.main_menu, 0))
+        self.assertEqual([u'Open', u'Recent', '-----Separator-----',
+                          'Index: 3'],
+                         [e.label for e in
+                          structure.items(self.file_menu.handle)])
+        self.assertEqual([0, 1, 2, 3], self.file_menu.reads)
+        self.assertEqual(None, structure.items(self.recent.handle))
+
+        # opened once
+        self.open(structure, self.main_menu, 0)
+        self.assertEqual(1, self.main_menu.items[0].popups)
+        self.assertEqual([0, 1, 2, 3], self.file_menu.reads)
+
+        open_entry = structure.entry(self.file_menu.handle, 0)
+        self.assertFalse(open_entry.has_submenu)
+        self.assertEqual(None, structure.open(open_entry))
+
+        self.open(structure, self.file_menu, 1)
+        entry = structure.entry(self.recent.handle, 1)
+        self.assertEqual(u'File->Recent->2.txt', entry.path)
+        self.assertEqual(u'File->#3',
+                         structure.entry(self.file_menu.handle, 3).path)
+        self.assertEqual(3, structure.entry(self.file_menu.handle, 3).state)
+
+    def test_not_accessible(self):
+        structure = self.structures.get(1)
+        self.assertTrue(self.help_menu is
+                        self.open(structure, self.main_menu, 1))
+        help_entry = structure.entry(self.main_menu.handle, 1)
+        self.assertEqual(None, help_entry.submenu_entries)
+
+    def test_state_live(self):
+        structure = self.structures.get(1)
+        self.open(structure, self.main_menu, 0)
+        entry = structure.entry(self.file_menu.handle, 0)
+        self.file_menu.items[0].state = 3  # grayed by the app
+        self.assertEqual(3, entry.state)
+        self.assertEqual(3, entry.properties()['State'])
+
+    def test_submenu_filled_later(self):
+        structure = self.structures.get(1)
+        self.open(structure, self.main_menu, 0)
+        self.open(structure, self.file_menu, 1)
+        self.recent.items.append(FakeMenuItem(self.recent, 2, u'3.txt'))
+        self.assertEqual([u'1.txt', u'2.txt', u'3.txt'],
+                         [e.label for e in
+                          structure.items(self.recent.handle)])
+        self.assertEqual(u'File->Recent->3.txt',
+                         structure.entry(self.recent.handle, 2).path)
+        recent_entry = structure.entry(self.file_menu.handle, 1)
+        self.assertEqual(3, len(recent_entry.submenu_entries))
+        self.assertEqual(1, self.structures.captures)
+
+    def test_properties(self):
+        structure = self.structures.get(1)
+        entry = structure.entry(self.main_menu.handle, 0)
+        props = entry.properties()
+        self.assertEqual(u'File', props['Text'])
+        self.assertFalse('MenuItems' in props)  # not opened
+
+        self.open(structure, self.main_menu, 0)
+        self.open(structure, self.file_menu, 1)
+        props = entry.properties()
+        self.assertEqual([u'Open', u'Recent', u'', u''],
+                         [item['Text'] for item in props['MenuItems']])
+        self.assertEqual([u'1.txt', u'2.txt'],
+                         [item['Text'] for item in
+                          props['MenuItems'][1]['MenuItems']])
+
+    def test_cached(self):
+        structure = self.structures.get(1)
+        self.assertTrue(structure is self.structures.get(1))
+        self.assertEqual(1, self.structures.captures)
+
+    def test_menu_changed(self):
+        structure = self.structures.get(1)
+        self.signatures[1] = 'v2'
+        self.assertFalse(structure is self.structures.get(1))
+        self.assertEqual(2, self.structures.captures)
+
+        del self.signatures[1]  # no menu
+        self.assertEqual(None, self.structures.get(1))
+
+    def test_invalidate(self):
+        structure = self.structures.get(1)
+        self.structures.invalidate(1)
+        self.assertFalse(structure is self.structures.get(1))
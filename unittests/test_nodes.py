@@ -0,0 +1,119 @@
+# unit tests for the memory of the SWAPY wrappers.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+import unittest
+
+import sys
+import unittest
+
+import proxy
+
+
+# bytes per node of the wrappers and the values they own, the stubs
+# and the shared texts are not counted, 64-bit Python 2.7
+NODE_BYTES_LIMIT = 256
+
+
+class StubControl(object):
+
+    """Stub of a pywinauto control, a new string per a call."""
+
+    def __init__(self, class_name, text):
+        self.class_name = class_name
+        self.text = text
+
+    def Class(self):
+        return ''.join(list(self.class_name))
+
+    def Text(self):
+        return u''.join(list(self.text))
+
+
+def owned_size(obj, seen):
+    """
+    Bytes of the object and the strings and containers it owns.
+
+    The wrappers, the stubs and the shared objects are not counted.
+    """
+    if id(obj) in seen or obj is None or \
+            isinstance(obj, (proxy.SWAPYWrapper, StubControl)):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple)):
+        for item in obj:
+            size += owned_size(item, seen)
+    return size
+
+
+def node_size(node, seen):
+    """Bytes of the wrapper and the slot values it owns."""
+    seen.add(id(node))
+    size = sys.getsizeof(node)
+    for cls in type(node).__mro__:
+        for slot in cls.__dict__.get('__slots__', ()):
+            if slot.startswith('__'):
+                slot = '_%s%s' % (cls.__name__, slot)
+            size += owned_size(getattr(node, slot, None), seen)
+    return size
+
+
+class NodesMemoryTestCase(unittest.TestCase):
+
+    def test_no_dict(self):
+        control = proxy.NativeObject(StubControl('Button', u''))
+        item = proxy.Pwa_tree_item(StubControl('', u'Item'), None)
+        for node in (control, item):
+            self.assertFalse(hasattr(node, '__dict__'))
+
+    def test_shared_texts(self):
+        controls = [proxy.NativeObject(StubControl('Button', u''))
+                    for i in range(3)]
+        items = [proxy.Pwa_tree_item(StubControl('', u'Item'), None)
+                 for i in range(3)]
+        self.assertTrue(controls[0].control_class is
+                        controls[2].control_class)
+        self.assertTrue(items[0].text is items[2].text)
+
+    def test_tree_item_path(self):
+        root = proxy.Pwa_tree_item(StubControl('', u'Root'), None)
+        item = proxy.Pwa_tree_item(StubControl('', u'Item'), root)
+        self.assertEqual(item.path, [u'Root', u'Item'])
+
+    def test_bytes_per_node(self):
+        nodes = []
+        parent = None
+        for i in range(100):
+            control = proxy.NativeObject(StubControl('Button', u''))
+            control.control_class
+            parent = proxy.Pwa_tree_item(StubControl('', u'Item %s' % i),
+                                         parent)
+            parent.text
+            nodes += [control, parent]
+
+        seen = set()
+        for node in nodes:
+            self.assertTrue(node_size(node, seen) <= NODE_BYTES_LIMIT,
+                            (node, node_size(node, set())))
+
+
+if __name__ == '__main__':
+    unittest.main()
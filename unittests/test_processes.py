@@ -0,0 +1,139 @@
+# unit tests for the command lines of the processes.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+
+import os
+import unittest
+
+import processes
+from registry import WrapperRegistry
+
+
+class Wrapper(object):
+    pass
+
+
+class FakeProvider(processes.ProcessInfoProvider):
+
+    """Fake process table, {pid: (start_time, command line)}."""
+
+    def __init__(self, table):
+        self.table = table
+        self.queries = []
+
+    def start_time(self, pid):
+        if pid in self.table:
+            return self.table[pid][0]
+        return None
+
+    def command_line(self, pid):
+        self.queries.append(pid)
+        return self.table[pid][1]
+
+
+class CommandLineResolverTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.provider = FakeProvider({
+            10: (1, 'notepad.exe'),
+            20: (2, None),  # access denied
+            })
+        self.resolver = processes.CommandLineResolver(self.provider)
+
+    def test_cached(self):
+        for i in range(3):
+            self.assertEqual('notepad.exe', self.resolver.command_line(10))
+        self.assertEqual([10], self.provider.queries)
+        self.assertEqual(2, self.resolver.hits)
+        self.assertEqual(1, self.resolver.misses)
+
+    def test_negative_cached(self):
+        self.assertEqual(None, self.resolver.command_line(20))
+        self.assertEqual(None, self.resolver.command_line(20))
+        self.assertEqual([20], self.provider.queries)
+
+    def test_pid_recycled(self):
+        self.assertEqual('notepad.exe', self.resolver.command_line(10))
+        self.provider.table[10] = (5, 'calc.exe')
+        self.assertEqual('calc.exe', self.resolver.command_line(10))
+        self.assertEqual([10, 10], self.provider.queries)
+
+    def test_no_process(self):
+        self.assertEqual(None, self.resolver.command_line(30))
+        self.assertEqual('notepad.exe', self.resolver.command_line(10))
+        del self.provider.table[10]
+        self.assertEqual(None, self.resolver.command_line(10))
+
+    def test_invalidate(self):
+        self.resolver.command_line(10)
+        self.resolver.invalidate(10)
+        self.resolver.command_line(10)
+        self.assertEqual([10, 10], self.provider.queries)
+
+
+@unittest.skipUnless(os.path.isdir('/proc/self'), "/proc is not available")
+class ProcessKeyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.provider = FakeProvider({10: (1, 'notepad.exe')})
+
+    def test_alive(self):
+        key = self.provider.process_key(10)
+        self.assertEqual((10, 1), key)
+        self.assertTrue(self.provider.is_alive(key))
+
+    def test_pid_recycled(self):
+        key = self.provider.process_key(10)
+        self.provider.table[10] = (5, 'calc.exe')
+        self.assertFalse(self.provider.is_alive(key))
+        self.assertNotEqual(key, self.provider.process_key(10))
+
+    def test_no_process(self):
+        key = self.provider.process_key(10)
+        del self.provider.table[10]
+        self.assertFalse(self.provider.is_alive(key))
+        self.assertFalse(self.provider.is_alive(
+            self.provider.process_key(10)))
+
+    def test_registry(self):
+        registry = WrapperRegistry(2, self.provider.is_alive)
+        first = Wrapper()
+        registry[self.provider.process_key(10)] = first
+        self.provider.table[10] = (5, 'calc.exe')
+        # the recycled pid does not get the wrapper of the old process
+        self.assertEqual(None, registry.get(self.provider.process_key(10)))
+        self.assertEqual(1, registry.sweep())
+        self.assertEqual(0, len(registry))
+
+
+class ProcProcessInfoProviderTestCase(unittest.TestCase):
+
+    def test_current_process(self):
+        provider = processes.ProcProcessInfoProvider()
+        pid = os.getpid()
+        self.assertTrue(provider.start_time(pid) is not None)
+        self.assertEqual(provider.start_time(pid), provider.start_time(pid))
+        self.assertTrue(provider.command_line(pid))
+
+    def test_no_process(self):
+        provider = processes.ProcProcessInfoProvider()
+        self.assertEqual(None, provider.start_time(-1))
+        self.assertEqual(None, provider.command_line(-1))
@@ -0,0 +1,131 @@
+# unit tests for the properties groups of the properties viewer.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+
+import unittest
+
+import properties
+
+
+def reversed_imap(func, iterable):
+    """The expensive groups arrive in the reversed order."""
+    for item in reversed(list(iterable)):
+        yield func(item)
+
+
+class FakeControl(object):
+
+    """Properties groups of a control, counts the getter calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def getter(self, name, group):
+        def get():
+            self.calls.append(name)
+            return dict(group)
+        return get
+
+    def groups(self):
+        return [(True, self.getter('cheap', {'Class': 'Button',
+                                             'Text': 'cheap'})),
+                (False, self.getter('pwa', {'Text': 'pwa', 'Font': 'f'})),
+                (False, self.getter('additional', {'Text': 'additional',
+                                                   'Access names': []}))]
+
+    def get_properties(self):
+        """Merged in the order, as SWAPYWrapper.get_properties."""
+        merged = {}
+        for cheap, getter in self.groups():
+            merged.update(getter())
+        return merged
+
+
+class MergeGroupsTestCases(unittest.TestCase):
+
+    def test_order(self):
+        groups = [(2, {'a': 2}), (0, {'a': 0, 'b': 0}), (1, {'b': 1})]
+        self.assertEqual({'a': 2, 'b': 1},
+                         properties.merge_groups(groups, False))
+
+    def test_expected_while_updating(self):
+        groups = [(properties.EXPECTED_INDEX, {'a': '', 'b': ''}),
+                  (0, {'a': 0})]
+        self.assertEqual({'a': 0, 'b': ''},
+                         properties.merge_groups(groups, True))
+        self.assertEqual({'a': 0}, properties.merge_groups(groups, False))
+
+
+class StreamPropertiesTestCases(unittest.TestCase):
+
+    def test_stream(self):
+        control = FakeControl()
+        stream = properties.stream_properties(
+            control.groups(), ['Class', 'Font'], reversed_imap)
+
+        props, updating, errors = next(stream)
+        self.assertEqual(['cheap'], control.calls)  # the cheap group at once
+        self.assertEqual({'Class': 'Button', 'Text': 'cheap', 'Font': ''},
+                         props)
+        self.assertTrue(updating)
+        self.assertEqual([], errors)
+
+        props, updating, errors = next(stream)
+        self.assertEqual(['cheap', 'additional'], control.calls)
+        self.assertEqual('additional', props['Text'])
+        self.assertEqual('', props['Font'])
+        self.assertTrue(updating)
+
+        props, updating, errors = next(stream)
+        self.assertFalse(updating)
+        # the later group wins whatever order the groups arrive in
+        self.assertEqual(control.get_properties(), props)
+        self.assertRaises(StopIteration, next, stream)
+
+    def test_no_expensive_groups(self):
+        stream = list(properties.stream_properties(
+            [(True, lambda: {'a': 1})], ['a', 'b'], reversed_imap))
+        self.assertEqual([({'a': 1}, False, [])], stream)
+
+    def test_stop(self):
+        control = FakeControl()
+        for props, updating, errors in properties.stream_properties(
+                control.groups(), [], reversed_imap):
+            break  # a newer control is selected
+        self.assertEqual(['cheap'], control.calls)
+
+    def test_errors(self):
+        def fail():
+            raise ValueError('no properties')
+
+        stream = list(properties.stream_properties(
+            [(True, fail), (False, fail), (False, lambda: {'a': 1})],
+            [], reversed_imap))
+        self.assertEqual(3, len(stream))
+        self.assertEqual(1, len(stream[0][2]))
+        self.assertTrue('no properties' in stream[0][2][0])
+        self.assertEqual([], stream[1][2])
+        self.assertEqual(1, len(stream[2][2]))
+        self.assertEqual({'a': 1}, stream[2][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# unit tests for the wrappers registries.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+
+import gc
+import unittest
+
+from registry import WrapperRegistry
+
+
+class Wrapper(object):
+
+    def __init__(self, handle):
+        self.handle = handle
+
+
+class WrapperRegistryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.alive = set(range(10))
+        self.now = 0
+        self.registry = WrapperRegistry(3, self.alive.__contains__,
+                                        sweep_interval=30,
+                                        clock=lambda: self.now)
+
+    def fill(self, handles):
+        for handle in handles:
+            self.registry[handle] = Wrapper(handle)
+
+    def test_bounded(self):
+        self.fill(range(10))
+        gc.collect()
+        self.assertEqual(3, len(self.registry))
+        self.assertEqual(7, self.registry.evictions)
+        self.assertTrue(9 in self.registry)
+        self.assertFalse(0 in self.registry)
+
+    def test_weak_references(self):
+        held = Wrapper(0)
+        self.registry[0] = held
+        self.fill(range(1, 10))
+        gc.collect()
+        self.assertEqual(4, len(self.registry))
+        self.assertTrue(self.registry[0] is held)
+
+    def test_recently_used(self):
+        self.fill(range(3))
+        self.registry.get(0)
+        self.fill([3])
+        gc.collect()
+        self.assertTrue(0 in self.registry)
+        self.assertFalse(1 in self.registry)
+
+    def test_sweep(self):
+        self.fill(range(3))
+        self.alive.remove(1)
+        self.now = 10
+        self.fill([3])
+        self.assertTrue(1 in self.registry)  # not swept yet
+
+        self.now = 31
+        self.fill([4])
+        self.assertFalse(1 in self.registry)
+        self.assertEqual(1, self.registry.stats()['swept'])
+
+    def test_pop(self):
+        self.fill(range(2))
+        self.assertEqual(0, self.registry.pop(0).handle)
+        self.assertEqual(None, self.registry.pop(0))
+        self.assertRaises(KeyError, lambda: self.registry[0])
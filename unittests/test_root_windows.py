@@ -0,0 +1,176 @@
+# unit tests for the top level windows enumeration.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+
+import unittest
+
+from root_windows import RootWindowsEngine
+
+
+class FakeDesktop(object):
+
+    """Top level windows of a fake desktop."""
+
+    def __init__(self):
+        self.texts = {1: [u'Calculator'], 2: [u''], 3: [u'', u'a', u'b'],
+                      4: [u'']}
+        self.taskbar = 4
+        self.failures = 0
+        self.taskbar_lookups = 0
+        self.texts_lookups = []
+        self.delays = []
+        self.now = 0
+
+    def find_windows(self):
+        if self.failures:
+            self.failures -= 1
+            raise OverflowError("array too large")
+        return sorted(self.texts)
+
+    def get_taskbar_handle(self):
+        self.taskbar_lookups += 1
+        return self.taskbar
+
+    def get_text(self, handle):
+        return self.texts[handle][0]
+
+    def get_texts(self, handle):
+        self.texts_lookups.append(handle)
+        return self.texts[handle]
+
+    def sleep(self, delay):
+        self.delays.append(delay)
+        self.now += delay
+
+    def clock(self):
+        return self.now
+
+
+class FakeTable(object):
+
+    """Attributes table of the fake desktop, the texts read on ask."""
+
+    def __init__(self, handles, desktop):
+        self.handles = handles
+        self.desktop = desktop
+        self.texts_read = []
+
+    def row(self, handle):
+        return handle if handle in self.handles else None
+
+    def text(self, handle):
+        self.texts_read.append(handle)
+        return self.desktop.texts[handle][0]
+
+
+class RootWindowsEngineTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.desktop = FakeDesktop()
+        self.engine = RootWindowsEngine(
+            self.desktop.find_windows, self.desktop.get_taskbar_handle,
+            self.desktop.get_text, self.desktop.get_texts,
+            attempts=5, first_delay=0.05, max_delay=0.15,
+            sleep=self.desktop.sleep, clock=self.desktop.clock)
+
+    def test_titles(self):
+        handles, titles = self.engine.refresh()
+        self.assertEqual([1, 2, 3, 4], handles)
+        self.assertEqual({1: u'Calculator', 2: 'Window#2', 3: u'a, b',
+                          4: 'TaskBar'}, titles)
+        # all the texts only for the windows without a text
+        self.assertEqual([2, 3], self.desktop.texts_lookups)
+
+    def test_taskbar_cached(self):
+        self.engine.refresh()
+        self.engine.refresh()
+        self.assertEqual(1, self.desktop.taskbar_lookups)
+
+        # explorer restarted
+        del self.desktop.texts[4]
+        self.desktop.texts[5] = [u'']
+        self.desktop.taskbar = 5
+        handles, titles = self.engine.refresh()
+        self.assertEqual('TaskBar', titles[5])
+        self.assertEqual(2, self.desktop.taskbar_lookups)
+
+    def test_backoff(self):
+        self.desktop.failures = 3
+        handles, titles = self.engine.refresh()
+        self.assertEqual([1, 2, 3, 4], handles)
+        self.assertEqual([0.05, 0.1, 0.15], self.desktop.delays)
+        self.assertAlmostEqual(0.3, self.engine.timings['enumerate'])
+
+    def test_backoff_bounded(self):
+        self.desktop.failures = 100
+        handles, titles = self.engine.refresh()
+        self.assertEqual([], handles)
+        self.assertEqual(4, len(self.desktop.delays))
+
+    def test_select_before_titles(self):
+        handles, titles = self.engine.refresh(
+            lambda handles: [handle for handle in handles if handle != 3])
+        self.assertEqual([1, 2, 4], handles)
+        self.assertNotIn(3, titles)
+        self.assertEqual([2], self.desktop.texts_lookups)
+        self.assertIn('filter', self.engine.timings)
+
+    def test_enumerate_without_titles(self):
+        handles, taskbar_handle = self.engine.enumerate()
+        self.assertEqual([1, 2, 3, 4], handles)
+        self.assertEqual(4, taskbar_handle)
+        self.assertEqual([], self.desktop.texts_lookups)
+        self.assertEqual('TaskBar', self.engine.resolve_title(4, 4))
+        self.assertEqual(u'a, b', self.engine.resolve_title(3, 4))
+
+    def test_attributes_table(self):
+        read = []
+
+        def read_attributes(handles):
+            read.append(list(handles))
+            return FakeTable([handle for handle in handles if handle != 2],
+                             self.desktop)
+
+        self.engine.read_attributes = read_attributes
+        handles, titles = self.engine.refresh()
+        self.assertEqual([[1, 2, 3, 4]], read)
+        # the closed window is skipped, the texts are from the table
+        self.assertEqual([1, 3, 4], handles)
+        self.assertEqual({1: u'Calculator', 3: u'a, b', 4: 'TaskBar'},
+                         titles)
+        self.assertEqual([3], self.desktop.texts_lookups)
+        self.assertIn('attributes', self.engine.timings)
+
+    def test_texts_after_select(self):
+        self.engine.read_attributes = lambda handles: FakeTable(handles,
+                                                                self.desktop)
+        handles, titles = self.engine.refresh(
+            lambda handles: [handle for handle in handles if handle != 1])
+        # no text is read for the filtered out window
+        self.assertEqual([2, 3], sorted(self.engine.attributes.texts_read))
+
+    def test_timings(self):
+        self.engine.refresh()
+        self.assertEqual(set(['enumerate', 'taskbar', 'titles']),
+                         set(self.engine.timings))
+        with self.engine.phase('wrap'):
+            self.desktop.now += 1
+        self.assertEqual(1, self.engine.timings['wrap'])
@@ -0,0 +1,159 @@
+# unit tests for the control classes schemas.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from schemas import SchemaCache, schema_version
+
+
+BUTTON = ('NativeObject', 'Button')
+VERSION = schema_version('0.5.4', ['Click', 'SetFocus'])
+
+
+class SchemaCacheTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.schemas = SchemaCache(version=VERSION)
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'swapy', 'schemas.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_properties(self):
+        self.schemas.record_properties(BUTTON, 0,
+                                       {'Text': u'OK', 'Class': ''}, 0.5)
+        self.schemas.record_properties(BUTTON, 1, {'Font': None}, 2)
+        self.assertEqual(self.schemas.expected_keys(BUTTON),
+                         ['Class', 'Font', 'Text'])
+        self.assertEqual(self.schemas.get(BUTTON).costs, {'0': 0.5, '1': 2})
+        self.assertEqual(self.schemas.expected_keys(('NativeObject', 'Edit')),
+                         [])
+
+    def test_cheap(self):
+        self.assertFalse(self.schemas.is_cheap(BUTTON, 1))
+        self.schemas.record_properties(BUTTON, 1, {'Font': None}, 0.01)
+        self.assertTrue(self.schemas.is_cheap(BUTTON, 1))
+        self.assertFalse(self.schemas.is_cheap(BUTTON, 2))
+
+        # the last fetch counts
+        self.schemas.record_properties(BUTTON, 1, {'Font': None}, 2)
+        self.assertFalse(self.schemas.is_cheap(BUTTON, 1))
+
+        # the costs are saved
+        self.schemas.record_properties(BUTTON, 2, {'Text': u'OK'}, 0.01)
+        self.assertTrue(self.schemas.save(self.path))
+        schemas = SchemaCache(version=VERSION)
+        schemas.load(self.path)
+        self.assertTrue(schemas.is_cheap(BUTTON, 2))
+
+    def fail(self, key, name, times=3):
+        return [self.schemas.record_failure(key, name)
+                for i in range(times)]
+
+    def test_inapplicable(self):
+        self.assertTrue(self.schemas.is_applicable(BUTTON, 'Rectangle'))
+        self.assertEqual([False, False, True], self.fail(BUTTON, 'Rectangle'))
+        self.assertFalse(self.schemas.is_applicable(BUTTON, 'Rectangle'))
+        self.assertTrue(self.schemas.is_applicable(BUTTON, 'handle'))
+
+    def test_transient_failure(self):
+        self.fail(BUTTON, 'Rectangle', 2)
+        self.assertTrue(self.schemas.is_applicable(BUTTON, 'Rectangle'))
+        self.assertFalse(self.schemas.changed)
+
+        # a success resets the failures
+        self.schemas.record_properties(BUTTON, 0,
+                                       {'Rectangle': (0, 0, 1, 1)}, 0.1)
+        self.fail(BUTTON, 'Rectangle', 2)
+        self.assertTrue(self.schemas.is_applicable(BUTTON, 'Rectangle'))
+
+        # the failures are not saved
+        self.assertTrue(self.schemas.save(self.path))
+        schemas = SchemaCache(version=VERSION)
+        schemas.load(self.path)
+        schemas.record_failure(BUTTON, 'Rectangle')
+        self.assertTrue(schemas.is_applicable(BUTTON, 'Rectangle'))
+
+    def test_group_failure(self):
+        self.fail(BUTTON, 'GetProperties', 2)
+        self.schemas.record_success(BUTTON, 'GetProperties')
+        self.fail(BUTTON, 'GetProperties', 2)
+        self.assertTrue(self.schemas.is_applicable(BUTTON, 'GetProperties'))
+        self.fail(BUTTON, 'GetProperties', 1)
+        self.assertFalse(self.schemas.is_applicable(BUTTON, 'GetProperties'))
+
+    def test_actions(self):
+        self.assertEqual(self.schemas.actions(BUTTON, 'ButtonWrapper'), None)
+        self.schemas.set_actions(BUTTON, 'ButtonWrapper',
+                                 ['Click', 'SetFocus'])
+        actions = self.schemas.actions(BUTTON, 'ButtonWrapper')
+        actions.append('Close')
+        self.assertEqual(self.schemas.actions(BUTTON, 'ButtonWrapper'),
+                         ['Click', 'SetFocus'])
+        # the same window class wrapped by another pywinauto class
+        self.assertEqual(self.schemas.actions(BUTTON, 'DialogWrapper'), None)
+
+    def test_version(self):
+        self.assertNotEqual(VERSION, schema_version('0.5.3',
+                                                    ['Click', 'SetFocus']))
+        self.assertNotEqual(VERSION, schema_version('0.5.4', ['Click']))
+        self.assertEqual(VERSION, schema_version('0.5.4',
+                                                 ['SetFocus', 'Click']))
+
+        self.schemas.set_actions(BUTTON, 'ButtonWrapper', ['Click'])
+        self.assertTrue(self.schemas.save(self.path))
+        schemas = SchemaCache(version=schema_version('0.5.4', ['Click']))
+        self.assertFalse(schemas.load(self.path))
+        self.assertEqual(schemas.actions(BUTTON, 'ButtonWrapper'), None)
+
+        # a file of the unversioned format
+        with open(self.path, 'w') as f:
+            f.write('{"NativeObject|Button": {"actions": ["Click"]}}')
+        self.assertFalse(self.schemas.load(self.path))
+
+    def test_save_load(self):
+        self.schemas.record_properties(BUTTON, 1, {'Text': u'OK'}, 0.5)
+        self.fail(BUTTON, 'Rectangle')
+        self.schemas.set_actions(BUTTON, 'ButtonWrapper', ['Click'])
+        self.assertTrue(self.schemas.save(self.path))
+        self.assertFalse(self.schemas.save(self.path))  # not changed
+
+        schemas = SchemaCache(version=VERSION)
+        self.assertTrue(schemas.load(self.path))
+        self.assertEqual(schemas.expected_keys(BUTTON), ['Text'])
+        self.assertFalse(schemas.is_applicable(BUTTON, 'Rectangle'))
+        self.assertEqual(schemas.actions(BUTTON, 'ButtonWrapper'), ['Click'])
+
+    def test_load_missed(self):
+        self.assertFalse(self.schemas.load(self.path))
+        with open(os.path.join(self.directory, 'broken.json'), 'w') as f:
+            f.write('{')
+        self.assertFalse(self.schemas.load(
+            os.path.join(self.directory, 'broken.json')))
+
+
+if __name__ == '__main__':
+    unittest.main()
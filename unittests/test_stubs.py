@@ -0,0 +1,106 @@
+# unit tests for the lazy wrappers of the children windows.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+
+import threading
+import unittest
+
+from attributes import ControlAttributes
+from stubs import WrapperStub
+
+
+class FakeWrapper(object):
+
+    """Fake of a full wrapper."""
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.parent = 'window'
+
+    def get_subitems(self):
+        return [(u'child', FakeWrapper(self.handle + 1))]
+
+    def has_subitems(self):
+        return True
+
+    def _check_existence(self):
+        return True
+
+
+class WrapperStubTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.made = []
+        self.alive = set([1])
+
+    def make(self, handle):
+        self.made.append(handle)
+        return FakeWrapper(handle)
+
+    def stub(self, handle=1):
+        row = ControlAttributes(handle, None, 'Button', 1, None, True, True,
+                                100)
+        return WrapperStub(row, lambda: self.make(handle),
+                           self.alive.__contains__)
+
+    def test_not_materialized(self):
+        stub = self.stub()
+        self.assertEqual((1, 'Button'), (stub.handle, stub.class_name))
+        self.assertIsNone(stub.has_subitems())
+        self.assertTrue(stub._check_existence())
+        self.assertFalse(self.stub(2)._check_existence())
+        self.assertFalse(stub.is_materialized)
+        self.assertEqual([], self.made)
+
+    def test_materialized_on_use(self):
+        stub = self.stub()
+        self.assertEqual('window', stub.parent)
+        self.assertEqual(u'child', stub.get_subitems()[0][0])
+        self.assertTrue(stub.is_materialized)
+        self.assertTrue(stub.has_subitems())
+        # made once
+        self.assertIs(stub.materialize(), stub.materialize())
+        self.assertEqual([1], self.made)
+
+    def test_make_error(self):
+        def make():
+            raise RuntimeError('closed')
+        stub = WrapperStub(self.stub().row, make)
+        self.assertRaises(RuntimeError, getattr, stub, 'parent')
+        self.assertFalse(stub.is_materialized)
+
+    def test_unknown_attribute(self):
+        stub = self.stub()
+        self.assertRaises(AttributeError, getattr, stub, 'no_such')
+
+    def test_materialized_once_by_threads(self):
+        stub = self.stub()
+        threads = [threading.Thread(target=stub.materialize)
+                   for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([1], self.made)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+# unit tests for the deferred titles.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+
+from multiprocessing.pool import ThreadPool
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+import threading
+import unittest
+
+import titles
+
+
+class PlaceholderTitleTestCases(unittest.TestCase):
+
+    def test_handle_and_class(self):
+        self.assertEqual(titles.placeholder_title(0x1a2b, 'Button'),
+                         u'<Button 0x1a2b>')
+
+
+class ResolveTitlesTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ThreadPool(2)
+
+    def tearDown(self):
+        self.pool.terminate()
+
+    def test_hung_window_does_not_block(self):
+        hung = threading.Event()
+
+        def hung_title():
+            hung.wait(5)
+            return u'Hung'
+
+        resolvers = [('hung', hung_title)] + \
+            [(i, lambda i=i: u'Title %s' % i) for i in range(5)]
+        results = queue.Queue()
+        titles.resolve_titles(self.pool, resolvers, results.put)
+        resolved = [results.get(timeout=5) for i in range(5)]
+        self.assertEqual(sorted(item for item, title, error in resolved),
+                         list(range(5)))
+        hung.set()
+        self.assertEqual(results.get(timeout=5), ('hung', u'Hung', None))
+
+    def test_error(self):
+        def broken_title():
+            raise RuntimeError('GetButtonInfo failed')
+
+        item, title, error = titles.resolve_title(('broken', broken_title))
+        self.assertEqual(item, 'broken')
+        self.assertEqual(title, None)
+        self.assertTrue(isinstance(error, RuntimeError))
+
+
+class TitleOrderTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.order = titles.TitleOrder([(u'<Button 0x1>', 'a'),
+                                        (u'<Edit 0x2>', 'b'),
+                                        (u'OK', 'c')])
+
+    def test_move(self):
+        self.assertEqual(self.order.update('a', u'Zoom'), (0, 2))
+        self.assertEqual(self.order.items, ['b', 'c', 'a'])
+        self.assertEqual(self.order.update('b', u'cancel'), (0, 0))
+        self.assertEqual(self.order.items, ['b', 'c', 'a'])
+
+    def test_keep_position(self):
+        self.assertEqual(self.order.update('a', u'Zoom', move=False), (0, 0))
+        self.assertEqual(self.order.items, ['a', 'b', 'c'])
+
+    def test_not_shown(self):
+        self.assertRaises(ValueError, self.order.update, 'd', u'Title')
+
+    def test_positions(self):
+        items = [object() for i in range(50)]
+        order = titles.TitleOrder([(u'<Button 0x%x>' % i, item)
+                                   for i, item in enumerate(items)])
+        for i, item in enumerate(items):
+            order.update(item, u'%02d' % ((i * 7) % 50))
+            for index, shown_item in enumerate(order.items):
+                self.assertEqual(order.index(shown_item), index)
+        self.assertEqual(order.keys, sorted(order.keys))
+        self.assertRaises(ValueError, order.index, object())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+# unit tests for the toolbar buttons tables.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+
+import unittest
+
+import toolbars
+
+
+class FakeToolbar(object):
+
+    def __init__(self, handle):
+        self.handle = handle
+
+
+class FakeReader(object):
+
+    """Counts the sweeps, buttons are (idCommand, text, state, style)."""
+
+    def __init__(self, buttons):
+        self.buttons = buttons
+        self.calls = 0
+
+    def __call__(self, toolbar):
+        self.calls += 1
+        return [toolbars.ToolbarButtonInfo(index, id_command, text, state,
+                                           style, (0, 0, 10, 10))
+                for index, (id_command, text, state, style)
+                in enumerate(self.buttons)]
+
+
+class ButtonPropertiesTestCases(unittest.TestCase):
+
+    def test_enabled_checked(self):
+        row = toolbars.ToolbarButtonInfo(
+            0, 100, u'Bold',
+            toolbars.TBSTATE_ENABLED | toolbars.TBSTATE_CHECKED,
+            toolbars.TBSTYLE_CHECK, (0, 0, 10, 10))
+        props = toolbars.button_properties(row)
+        self.assertTrue(props['IsEnabled'])
+        self.assertTrue(props['IsChecked'])
+        self.assertTrue(props['IsCheckable'])
+        self.assertFalse(props['IsPressed'])
+        self.assertEqual(props['text'], u'Bold')
+        self.assertEqual(props['index'], 0)
+
+    def test_separator_disabled(self):
+        row = toolbars.ToolbarButtonInfo(1, 0, u'', toolbars.TBSTATE_ENABLED,
+                                         0, (0, 0, 0, 0))
+        props = toolbars.button_properties(row)
+        self.assertFalse(props['IsEnabled'])
+        self.assertTrue(props['IsPressable'])
+
+
+class ToolbarTablesTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.reader = FakeReader([(100, u'New', toolbars.TBSTATE_ENABLED, 0),
+                                  (101, u'Open', 0, 0)])
+        self.tables = toolbars.ToolbarTables(self.reader)
+        self.toolbar = FakeToolbar(1)
+
+    def test_one_sweep(self):
+        rows = self.tables.sweep(self.toolbar)
+        self.assertEqual([row.text for row in rows], [u'New', u'Open'])
+        self.assertEqual(self.tables.row(self.toolbar, 1).text, u'Open')
+        self.assertEqual(self.tables.row(self.toolbar, 0).idCommand, 100)
+        self.assertEqual(self.reader.calls, 1)
+
+    def test_row_sweeps_once(self):
+        self.assertEqual(self.tables.row(self.toolbar, 0).text, u'New')
+        self.assertEqual(self.tables.row(self.toolbar, 5), None)
+        self.assertEqual(self.reader.calls, 1)
+
+    def test_invalidate(self):
+        self.tables.sweep(self.toolbar)
+        self.tables.sweep(FakeToolbar(2))
+        self.tables.invalidate(1)
+        self.tables.row(FakeToolbar(2), 0)
+        self.assertEqual(self.reader.calls, 2)
+        self.tables.row(self.toolbar, 0)
+        self.assertEqual(self.reader.calls, 3)
+        self.tables.invalidate()
+        self.tables.row(FakeToolbar(2), 0)
+        self.assertEqual(self.reader.calls, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
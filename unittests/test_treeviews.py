@@ -0,0 +1,96 @@
+# unit tests for the tree view levels.
+# Copyright (C) 2016 Matiychuk D.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+#    Free Software Foundation, Inc.,
+#    59 Temple Place,
+#    Suite 330,
+#    Boston, MA 02111-1307 USA
+
+
+
+import unittest
+
+import treeviews
+
+
+class FakeTree(object):
+
+    """Fake tree view, children are {item handle or None: [handles]}."""
+
+    def __init__(self, handle, children):
+        self.handle = handle
+        self.children = children
+        self.messages = 0
+
+    def first_child(self, tree, item):
+        self.messages += 1
+        items = self.children.get(item)
+        return items[0] if items else 0
+
+    def next_sibling(self, tree, item):
+        self.messages += 1
+        for items in self.children.values():
+            if item in items:
+                index = items.index(item) + 1
+                return items[index] if index < len(items) else 0
+        return 0
+
+
+class TreeLevelsTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = FakeTree(1, {None: [10, 11, 12],
+                                 10: [20, 21],
+                                 20: [30]})
+        self.levels = treeviews.TreeLevels(self.tree.first_child,
+                                           self.tree.next_sibling)
+
+    def test_roots(self):
+        self.assertEqual(self.levels.level(self.tree), (10, 11, 12))
+        self.assertEqual(self.levels.count(self.tree), 3)
+        self.assertEqual(self.levels.page(self.tree, None, 1, 5), (11, 12))
+        self.assertEqual(self.levels.fetches, 1)
+
+    def test_only_requested_level(self):
+        self.assertEqual(self.levels.level(self.tree, 10), (20, 21))
+        self.assertEqual(list(self.levels.levels.keys()), [(1, 10)])
+
+    def test_has_children_probe(self):
+        self.assertTrue(self.levels.has_children(self.tree, 20))
+        self.assertFalse(self.levels.has_children(self.tree, 11))
+        self.assertEqual(self.tree.messages, 2)
+        self.assertEqual(self.levels.fetches, 0)
+        self.assertEqual(self.levels.probes, 2)
+
+    def test_has_children_read_level(self):
+        self.levels.level(self.tree, 10)
+        messages = self.tree.messages
+        self.assertTrue(self.levels.has_children(self.tree, 10))
+        self.assertEqual(self.tree.messages, messages)
+
+    def test_invalidate(self):
+        self.levels.level(self.tree)
+        self.levels.level(self.tree, 10)
+        self.levels.invalidate(1, 10)
+        self.assertEqual(list(self.levels.levels.keys()), [(1, None)])
+        self.levels.level(self.tree, 10)
+        self.levels.invalidate(1)
+        self.assertEqual(self.levels.levels, {})
+        self.tree.children[None].append(13)
+        self.assertEqual(self.levels.count(self.tree), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
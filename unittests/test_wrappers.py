@@ -138,6 +138,16 @@ class WrappersTestCase(unittest.TestCase):
                 wrapper.pwa_obj,
                 pywinauto.controls.common_controls._treeview_element))
 
+    def test_tree_item_compact(self):
+        with test_app("CmnCtrl1.exe") as (app, app_path):
+            obj = app.Dialog.TreeView.GetItem([u'Birds'])
+            wrapper = proxy.SWAPYWrapper(obj, None)
+            sub_items = wrapper.get_subitems()
+            self.assertEqual([u'Birds'], wrapper.path)
+            for text, sub_item in sub_items:
+                self.assertEqual([u'Birds', text], sub_item.path)
+        self.assertFalse(hasattr(wrapper, '__dict__'))
+
     def test_unknown(self):
         with test_app("CmnCtrl1.exe") as (app, app_path):
             obj = app.Dialog[u'#32770'].Click()
@@ -147,3 +157,69 @@ class WrappersTestCase(unittest.TestCase):
         self.assertTrue(isinstance(
                 wrapper.pwa_obj,
                 pywinauto.controls.HwndWrapper.HwndWrapper))
+
+    def test_subclass(self):
+        class ListViewSubclass(
+                pywinauto.controls.common_controls.ListViewWrapper):
+            pass
+
+        wrapper_class = proxy.MetaWrapper.wrapper_for(ListViewSubclass)
+        self.assertTrue(wrapper_class is proxy.Pwa_listview)
+        self.assertTrue(
+            proxy.MetaWrapper.dispatch_cache[ListViewSubclass] is
+            proxy.Pwa_listview)
+
+        class Unknown(object):
+            pass
+
+        self.assertTrue(proxy.MetaWrapper.wrapper_for(Unknown) is
+                        proxy.NativeObject)
+
+    def test_actions_table(self):
+        resolved = []
+
+        class ActionsStub(object):
+            def Click(self):
+                pass
+
+            def SetFocus(self):
+                pass
+
+            def WrapperObject(self):
+                resolved.append(self)
+                return self
+
+        wrapper = proxy.NativeObject(ActionsStub())
+        actions = wrapper.get_actions()
+        self.assertEqual(actions, [(102, 'Click'), (120, 'SetFocus')])
+        self.assertEqual(len(resolved), 1)
+        self.assertEqual(
+            proxy.NativeObject.actions_tables[
+                (proxy.NativeObject, ActionsStub)], actions)
+
+        # the table is per class, not resolved for another control
+        actions.append((101, 'Close'))
+        self.assertEqual(proxy.NativeObject(ActionsStub()).get_actions(),
+                         [(102, 'Click'), (120, 'SetFocus')])
+        self.assertEqual(len(resolved), 1)
+
+    def test_menu_actions(self):
+        checks = []
+
+        class ActionableStub(object):
+            def Click(self):
+                pass
+
+            def Close(self):
+                pass
+
+            def VerifyActionable(self):
+                checks.append(self)
+                raise RuntimeError('not actionable')
+
+        wrapper = proxy.NativeObject(ActionableStub())
+        extended_actions, actions = wrapper.get_menu_actions()
+        self.assertEqual(extended_actions, [])
+        self.assertEqual(actions, [(102, 'Click', False),
+                                   (101, 'Close', False)])
+        self.assertEqual(len(checks), 1)  # once for all the entries